@@ -7,6 +7,37 @@ DB_CONFIG = {
     'port': 3306
 }
 
+# Connection pool settings (shared by every model in the process)
+DB_POOL_CONFIG = {
+    'pool_size': 5,           # Maximum number of open MySQL sessions
+    'acquire_timeout': 10,    # Seconds to wait for a free connection
+    'idle_timeout': 300       # Seconds before an unused connection is closed
+}
+
+# Rows sent per executemany() chunk by bulk model methods (one commit per batch)
+DB_BATCH_SIZE = 500
+
+# Rows fetched per page by scrollable lists (ticket history, audit log, feedback)
+LIST_PAGE_SIZE = 100
+
+# Seat holds taken while a clerk is selling (see SeatHolds in database/data.sql)
+SEAT_HOLD_SECONDS = 120        # How long a selected seat stays held
+SEAT_MAP_REFRESH_MS = 5000     # How often the booking screen re-reads seats and holds
+
+# Bookings and cancellations retried by the model after a transient error
+# (lost connection, deadlock); each carries a request ID so a retry never
+# applies twice
+BOOKING_RETRY_ATTEMPTS = 3
+BOOKING_RETRY_BACKOFF = 0.2    # Seconds before the first retry, doubled each time
+
+# Change feed: how often BookingAudit is polled for new bookings/cancellations
+CHANGE_FEED_INTERVAL_MS = 2000
+CHANGE_FEED_BATCH_SIZE = 500
+# AuditIDs are taken at insert but visible at commit, so an id skipped over by
+# the high-water mark is re-read for this long in case its transaction commits late
+CHANGE_FEED_GAP_SECONDS = 60
+CHANGE_FEED_MAX_GAPS = 1000    # Skipped ids tracked at most (bigger jumps are not tracked)
+
 # Application settings
 APP_TITLE = "Cinema Management System"
 APP_WIDTH = 1024
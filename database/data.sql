@@ -35,6 +35,18 @@ CREATE TABLE CinemaRooms (
 );
 
 
+-- Creating RoomLayouts table: seat geometry per room. Aisles lists the seat
+-- numbers an aisle follows in every row, e.g. '3,7'. Rooms without a row
+-- here are laid out from Capacity in rows of 10.
+CREATE TABLE RoomLayouts (
+    RoomID INT PRIMARY KEY,
+    SeatRows INT NOT NULL CHECK (SeatRows > 0),
+    SeatsPerRow INT NOT NULL CHECK (SeatsPerRow > 0),
+    Aisles VARCHAR(100) NOT NULL DEFAULT '',
+    FOREIGN KEY (RoomID) REFERENCES CinemaRooms(RoomID) ON UPDATE CASCADE ON DELETE CASCADE
+);
+
+
 -- Creating Screenings table
 CREATE TABLE Screenings (
     ScreeningID INT PRIMARY KEY AUTO_INCREMENT,
@@ -42,6 +54,7 @@ CREATE TABLE Screenings (
     RoomID INT,
     ScreeningDate DATE,
     ScreeningTime TIME,
+    SoldSeats INT NOT NULL DEFAULT 0,  -- Maintained by sp_book_ticket / sp_cancel_ticket
     FOREIGN KEY (MovieID) REFERENCES Movies(MovieID) ON UPDATE CASCADE ON DELETE CASCADE,
     FOREIGN KEY (RoomID) REFERENCES CinemaRooms(RoomID) ON UPDATE CASCADE ON DELETE CASCADE
 );
@@ -112,6 +125,24 @@ CREATE TABLE Feedback (
 );
 
 
+-- Creating reporting rollup tables, maintained incrementally on every
+-- booking and cancellation (sold seats per screening live in Screenings.SoldSeats)
+CREATE TABLE DailyRevenue (
+    RevenueDate DATE PRIMARY KEY,
+    TicketsSold INT NOT NULL DEFAULT 0,
+    Revenue DECIMAL(12,2) NOT NULL DEFAULT 0.00
+);
+
+CREATE TABLE MovieDailyTickets (
+    MovieID INT,
+    SalesDate DATE,
+    TicketsSold INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (MovieID, SalesDate),
+    INDEX idx_movie_daily_date (SalesDate),
+    FOREIGN KEY (MovieID) REFERENCES Movies(MovieID) ON UPDATE CASCADE ON DELETE CASCADE
+);
+
+
 -- Inserting sample data into Genres
 INSERT INTO Genres (GenreName) VALUES ('Sci-Fi'), ('Thriller'), ('Action');
 
@@ -131,6 +162,13 @@ VALUES
     ('Room B', 80);
 
 
+-- Inserting sample data into RoomLayouts (SeatRows * SeatsPerRow = Capacity)
+INSERT INTO RoomLayouts (RoomID, SeatRows, SeatsPerRow, Aisles)
+VALUES
+    (1, 10, 10, '3,7'),
+    (2, 8, 10, '5');
+
+
 -- Inserting sample data into Screenings
 INSERT INTO Screenings (MovieID, RoomID, ScreeningDate, ScreeningTime)
 VALUES
@@ -197,12 +235,90 @@ SELECT
     s.ScreeningDate,
     s.ScreeningTime,
     r.Capacity,
-    (r.Capacity - COUNT(t.TicketID)) AS AvailableSeats
+    (r.Capacity - s.SoldSeats) AS AvailableSeats
 FROM Screenings s
 JOIN CinemaRooms r ON s.RoomID = r.RoomID
-JOIN Movies m ON s.MovieID = m.MovieID
-LEFT JOIN Tickets t ON s.ScreeningID = t.ScreeningID
-GROUP BY s.ScreeningID, m.MovieTitle, r.RoomName, s.ScreeningDate, s.ScreeningTime, r.Capacity;
+JOIN Movies m ON s.MovieID = m.MovieID;
+
+
+-- Creating stored procedure that applies a +1/-1 ticket change to the
+-- occupancy counter and the reporting rollups in one place
+DROP PROCEDURE IF EXISTS sp_apply_ticket_delta;
+DELIMITER //
+CREATE PROCEDURE sp_apply_ticket_delta(
+    IN p_screening_id INT,
+    IN p_delta INT
+)
+BEGIN
+    DECLARE v_movie_id INT;
+    DECLARE v_screening_date DATE;
+    
+    SELECT MovieID, ScreeningDate INTO v_movie_id, v_screening_date
+    FROM Screenings
+    WHERE ScreeningID = p_screening_id;
+    
+    UPDATE Screenings
+    SET SoldSeats = GREATEST(SoldSeats + p_delta, 0)
+    WHERE ScreeningID = p_screening_id;
+    
+    INSERT INTO DailyRevenue (RevenueDate, TicketsSold, Revenue)
+    VALUES (v_screening_date, GREATEST(p_delta, 0), GREATEST(p_delta, 0) * 10.00)
+    ON DUPLICATE KEY UPDATE
+        TicketsSold = GREATEST(TicketsSold + p_delta, 0),
+        Revenue = GREATEST(Revenue + p_delta * 10.00, 0);
+    
+    INSERT INTO MovieDailyTickets (MovieID, SalesDate, TicketsSold)
+    VALUES (v_movie_id, v_screening_date, GREATEST(p_delta, 0))
+    ON DUPLICATE KEY UPDATE
+        TicketsSold = GREATEST(TicketsSold + p_delta, 0);
+END //
+DELIMITER ;
+
+
+-- Creating UDF telling whether a seat id ("C7") exists in a room's layout,
+-- worked out like models/room_layout.py: rooms without a RoomLayouts row get
+-- rows of 10 seats with a shorter last row holding the rest of Capacity
+DROP FUNCTION IF EXISTS fn_seat_in_room;
+DELIMITER //
+CREATE FUNCTION fn_seat_in_room(p_room_id INT, p_seat_number VARCHAR(10)) RETURNS BOOLEAN
+READS SQL DATA
+BEGIN
+    DECLARE v_capacity INT;
+    DECLARE v_rows INT;
+    DECLARE v_per_row INT;
+    DECLARE v_last_row INT;
+    DECLARE v_row INT DEFAULT 0;
+    DECLARE i INT DEFAULT 1;
+    
+    IF p_seat_number IS NULL OR p_seat_number NOT REGEXP '^[A-Za-z]+[0-9]+$' THEN
+        RETURN FALSE;
+    END IF;
+    
+    -- Row letters A..Z, AA, AB, ... numbered from 1
+    WHILE SUBSTRING(p_seat_number, i, 1) REGEXP '[A-Za-z]' DO
+        SET v_row = v_row * 26 + ORD(UPPER(SUBSTRING(p_seat_number, i, 1))) - 64;
+        SET i = i + 1;
+    END WHILE;
+    
+    SELECT r.Capacity, l.SeatRows, l.SeatsPerRow INTO v_capacity, v_rows, v_per_row
+    FROM CinemaRooms r
+    LEFT JOIN RoomLayouts l ON l.RoomID = r.RoomID
+    WHERE r.RoomID = p_room_id;
+    
+    IF v_rows IS NULL THEN
+        SET v_capacity = GREATEST(COALESCE(v_capacity, 1), 1);
+        SET v_per_row = LEAST(10, v_capacity);
+        SET v_rows = CEIL(v_capacity / v_per_row);
+        SET v_last_row = v_capacity - (v_rows - 1) * v_per_row;
+    ELSE
+        SET v_last_row = v_per_row;
+    END IF;
+    
+    RETURN v_row BETWEEN 1 AND v_rows
+        AND CAST(SUBSTRING(p_seat_number, i) AS UNSIGNED)
+            BETWEEN 1 AND IF(v_row = v_rows, v_last_row, v_per_row);
+END //
+DELIMITER ;
 
 
 -- Creating stored procedure for booking tickets
@@ -214,29 +330,34 @@ CREATE PROCEDURE sp_book_ticket(
 )
 BEGIN
     DECLARE seat_taken INT;
+    DECLARE room_id INT;
     DECLARE room_capacity INT;
     DECLARE booked_seats INT;
    
-    SELECT COUNT(*) INTO seat_taken
-    FROM Tickets
-    WHERE ScreeningID = p_screening_id AND SeatNumber = p_seat_number;
-   
-    SELECT r.Capacity INTO room_capacity
+    -- Read the sold-seat counter and lock the screening row so concurrent
+    -- bookings for the same screening update the counter one at a time
+    SELECT r.RoomID, r.Capacity, s.SoldSeats INTO room_id, room_capacity, booked_seats
     FROM Screenings s
     JOIN CinemaRooms r ON s.RoomID = r.RoomID
-    WHERE s.ScreeningID = p_screening_id;
+    WHERE s.ScreeningID = p_screening_id
+    FOR UPDATE;
    
-    SELECT COUNT(*) INTO booked_seats
+    SELECT COUNT(*) INTO seat_taken
     FROM Tickets
-    WHERE ScreeningID = p_screening_id;
+    WHERE ScreeningID = p_screening_id AND SeatNumber = p_seat_number;
    
-    IF seat_taken > 0 THEN
+    IF NOT fn_seat_in_room(room_id, p_seat_number) THEN
+        SIGNAL SQLSTATE '45000' SET MESSAGE_TEXT = 'Seat does not exist in this room';
+    ELSEIF seat_taken > 0 THEN
         SIGNAL SQLSTATE '45000' SET MESSAGE_TEXT = 'Seat already taken';
     ELSEIF booked_seats >= room_capacity THEN
         SIGNAL SQLSTATE '45000' SET MESSAGE_TEXT = 'Screening fully booked';
     ELSE
         INSERT INTO Tickets (CustomerID, ScreeningID, SeatNumber)
         VALUES (p_customer_id, p_screening_id, p_seat_number);
+        
+        -- Keep the occupancy counter and reporting rollups in step with Tickets
+        CALL sp_apply_ticket_delta(p_screening_id, 1);
     END IF;
 END //
 DELIMITER ;
@@ -279,11 +400,165 @@ BEGIN
         
         -- Delete from Tickets - this won't trigger an additional audit due to our modified trigger
         DELETE FROM Tickets WHERE TicketID = p_ticket_id;
+        
+        -- Keep the occupancy counter and reporting rollups in step with Tickets
+        CALL sp_apply_ticket_delta(v_screening_id, -1);
     END IF;
 END //
 DELIMITER ;
 
 
+-- Creating BookingRequests table: one row per client request ID, inserted in
+-- the same transaction as the booking or cancellation it belongs to, so a
+-- retried request is recognised instead of being applied twice
+CREATE TABLE BookingRequests (
+    RequestID CHAR(32) PRIMARY KEY,
+    Operation VARCHAR(20) NOT NULL,
+    RequestedBy VARCHAR(50),
+    CreatedAt DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    INDEX idx_booking_requests_created (CreatedAt)
+);
+
+
+-- Creating SeatHolds table: short-lived seat reservations taken while a clerk
+-- is selling, so other stations see the seat as held instead of racing for it
+CREATE TABLE SeatHolds (
+    ScreeningID INT,
+    SeatNumber VARCHAR(10),
+    HeldBy VARCHAR(64) NOT NULL,   -- Holder token of one running application
+    ExpiresAt DATETIME NOT NULL,
+    PRIMARY KEY (ScreeningID, SeatNumber),
+    INDEX idx_seat_holds_expiry (ExpiresAt),
+    FOREIGN KEY (ScreeningID) REFERENCES Screenings(ScreeningID) ON UPDATE CASCADE ON DELETE CASCADE
+);
+
+
+-- Creating stored procedure to take (or extend) a hold on a seat
+DROP PROCEDURE IF EXISTS sp_hold_seat;
+DELIMITER //
+CREATE PROCEDURE sp_hold_seat(
+    IN p_screening_id INT,
+    IN p_seat_number VARCHAR(10),
+    IN p_held_by VARCHAR(64),
+    IN p_seconds INT
+)
+BEGIN
+    DECLARE v_held_by VARCHAR(64);
+    
+    IF EXISTS (SELECT 1 FROM Tickets
+               WHERE ScreeningID = p_screening_id AND SeatNumber = p_seat_number) THEN
+        SIGNAL SQLSTATE '45000' SET MESSAGE_TEXT = 'Seat already taken';
+    END IF;
+    
+    -- An expired hold no longer counts, whoever took it
+    DELETE FROM SeatHolds
+    WHERE ScreeningID = p_screening_id AND SeatNumber = p_seat_number AND ExpiresAt <= NOW();
+    
+    INSERT INTO SeatHolds (ScreeningID, SeatNumber, HeldBy, ExpiresAt)
+    VALUES (p_screening_id, p_seat_number, p_held_by, NOW() + INTERVAL p_seconds SECOND)
+    ON DUPLICATE KEY UPDATE
+        ExpiresAt = IF(HeldBy = VALUES(HeldBy), VALUES(ExpiresAt), ExpiresAt);
+    
+    SELECT HeldBy INTO v_held_by
+    FROM SeatHolds
+    WHERE ScreeningID = p_screening_id AND SeatNumber = p_seat_number;
+    
+    IF v_held_by <> p_held_by THEN
+        SIGNAL SQLSTATE '45000' SET MESSAGE_TEXT = 'Seat is held by another station';
+    END IF;
+END //
+DELIMITER ;
+
+
+-- Creating stored procedure that books a seat the caller holds (or that nobody
+-- holds) and turns the hold into the ticket
+DROP PROCEDURE IF EXISTS sp_book_held_seat;
+DELIMITER //
+CREATE PROCEDURE sp_book_held_seat(
+    IN p_customer_id INT,
+    IN p_screening_id INT,
+    IN p_seat_number VARCHAR(10),
+    IN p_held_by VARCHAR(64)
+)
+BEGIN
+    IF EXISTS (SELECT 1 FROM SeatHolds
+               WHERE ScreeningID = p_screening_id AND SeatNumber = p_seat_number
+                 AND HeldBy <> p_held_by AND ExpiresAt > NOW()) THEN
+        SIGNAL SQLSTATE '45000' SET MESSAGE_TEXT = 'Seat is held by another station';
+    END IF;
+    
+    CALL sp_book_ticket(p_customer_id, p_screening_id, p_seat_number);
+    
+    DELETE FROM SeatHolds
+    WHERE ScreeningID = p_screening_id AND SeatNumber = p_seat_number;
+END //
+DELIMITER ;
+
+
+-- Creating event that sweeps expired seat holds (needs event_scheduler=ON;
+-- the application also sweeps them periodically)
+DROP EVENT IF EXISTS ev_sweep_seat_holds;
+CREATE EVENT ev_sweep_seat_holds
+ON SCHEDULE EVERY 1 MINUTE
+DO
+    DELETE FROM SeatHolds WHERE ExpiresAt <= NOW();
+
+
+-- Creating event that forgets request IDs once no client can still retry them
+DROP EVENT IF EXISTS ev_purge_booking_requests;
+CREATE EVENT ev_purge_booking_requests
+ON SCHEDULE EVERY 1 DAY
+DO
+    DELETE FROM BookingRequests WHERE CreatedAt < NOW() - INTERVAL 7 DAY;
+
+
+-- Creating stored procedure to rebuild the occupancy counters from Tickets
+-- (run after bulk loads or deletes that bypass sp_book_ticket / sp_cancel_ticket)
+DROP PROCEDURE IF EXISTS sp_rebuild_occupancy;
+DELIMITER //
+CREATE PROCEDURE sp_rebuild_occupancy()
+BEGIN
+    UPDATE Screenings s
+    LEFT JOIN (
+        SELECT ScreeningID, COUNT(*) AS TicketCount
+        FROM Tickets
+        GROUP BY ScreeningID
+    ) t ON s.ScreeningID = t.ScreeningID
+    SET s.SoldSeats = COALESCE(t.TicketCount, 0);
+END //
+DELIMITER ;
+
+
+-- Creating stored procedure to rebuild the occupancy counters and the
+-- reporting rollups in bulk from ticket history
+DROP PROCEDURE IF EXISTS sp_rebuild_rollups;
+DELIMITER //
+CREATE PROCEDURE sp_rebuild_rollups()
+BEGIN
+    CALL sp_rebuild_occupancy();
+    
+    DELETE FROM DailyRevenue;
+    INSERT INTO DailyRevenue (RevenueDate, TicketsSold, Revenue)
+    SELECT ScreeningDate, SUM(SoldSeats), SUM(SoldSeats) * 10.00
+    FROM Screenings
+    GROUP BY ScreeningDate
+    HAVING SUM(SoldSeats) > 0;
+    
+    DELETE FROM MovieDailyTickets;
+    INSERT INTO MovieDailyTickets (MovieID, SalesDate, TicketsSold)
+    SELECT MovieID, ScreeningDate, SUM(SoldSeats)
+    FROM Screenings
+    WHERE MovieID IS NOT NULL
+    GROUP BY MovieID, ScreeningDate
+    HAVING SUM(SoldSeats) > 0;
+END //
+DELIMITER ;
+
+
+-- Initialise the counters and rollups for the sample tickets inserted above
+CALL sp_rebuild_rollups();
+
+
 -- Creating BookingAudit table for audit logging
 CREATE TABLE BookingAudit (
     AuditID INT PRIMARY KEY AUTO_INCREMENT,
@@ -352,6 +627,112 @@ END //
 DELIMITER ;
 
 
+-- Creating trigger to move rollup totals when a screening is rescheduled
+-- or switched to another movie
+DROP TRIGGER IF EXISTS tr_screening_rollup_move;
+DELIMITER //
+CREATE TRIGGER tr_screening_rollup_move
+AFTER UPDATE ON Screenings
+FOR EACH ROW
+BEGIN
+    IF NOT (OLD.ScreeningDate <=> NEW.ScreeningDate) OR NOT (OLD.MovieID <=> NEW.MovieID) THEN
+        UPDATE DailyRevenue
+        SET TicketsSold = GREATEST(TicketsSold - OLD.SoldSeats, 0),
+            Revenue = GREATEST(Revenue - OLD.SoldSeats * 10.00, 0)
+        WHERE RevenueDate = OLD.ScreeningDate;
+        
+        UPDATE MovieDailyTickets
+        SET TicketsSold = GREATEST(TicketsSold - OLD.SoldSeats, 0)
+        WHERE MovieID = OLD.MovieID AND SalesDate = OLD.ScreeningDate;
+        
+        INSERT INTO DailyRevenue (RevenueDate, TicketsSold, Revenue)
+        VALUES (NEW.ScreeningDate, NEW.SoldSeats, NEW.SoldSeats * 10.00)
+        ON DUPLICATE KEY UPDATE
+            TicketsSold = TicketsSold + NEW.SoldSeats,
+            Revenue = Revenue + NEW.SoldSeats * 10.00;
+        
+        IF NEW.MovieID IS NOT NULL THEN
+            INSERT INTO MovieDailyTickets (MovieID, SalesDate, TicketsSold)
+            VALUES (NEW.MovieID, NEW.ScreeningDate, NEW.SoldSeats)
+            ON DUPLICATE KEY UPDATE
+                TicketsSold = TicketsSold + NEW.SoldSeats;
+        END IF;
+    END IF;
+END //
+DELIMITER ;
+
+
+-- Creating trigger to remove a deleted screening's tickets from the rollups
+-- (tickets removed by ON DELETE CASCADE do not fire ticket triggers)
+DROP TRIGGER IF EXISTS tr_screening_rollup_delete;
+DELIMITER //
+CREATE TRIGGER tr_screening_rollup_delete
+BEFORE DELETE ON Screenings
+FOR EACH ROW
+BEGIN
+    IF OLD.SoldSeats > 0 THEN
+        UPDATE DailyRevenue
+        SET TicketsSold = GREATEST(TicketsSold - OLD.SoldSeats, 0),
+            Revenue = GREATEST(Revenue - OLD.SoldSeats * 10.00, 0)
+        WHERE RevenueDate = OLD.ScreeningDate;
+        
+        UPDATE MovieDailyTickets
+        SET TicketsSold = GREATEST(TicketsSold - OLD.SoldSeats, 0)
+        WHERE MovieID = OLD.MovieID AND SalesDate = OLD.ScreeningDate;
+    END IF;
+END //
+DELIMITER ;
+
+
+-- Creating triggers to remove the tickets of screenings deleted along with
+-- their movie or room: cascaded deletes do not fire tr_screening_rollup_delete.
+-- A movie's MovieDailyTickets rows go with it through their own cascade.
+DROP TRIGGER IF EXISTS tr_movie_rollup_delete;
+DELIMITER //
+CREATE TRIGGER tr_movie_rollup_delete
+BEFORE DELETE ON Movies
+FOR EACH ROW
+BEGIN
+    UPDATE DailyRevenue d
+    JOIN (
+        SELECT ScreeningDate, SUM(SoldSeats) AS Seats
+        FROM Screenings
+        WHERE MovieID = OLD.MovieID
+        GROUP BY ScreeningDate
+    ) s ON d.RevenueDate = s.ScreeningDate
+    SET d.TicketsSold = GREATEST(d.TicketsSold - s.Seats, 0),
+        d.Revenue = GREATEST(d.Revenue - s.Seats * 10.00, 0);
+END //
+DELIMITER ;
+
+DROP TRIGGER IF EXISTS tr_room_rollup_delete;
+DELIMITER //
+CREATE TRIGGER tr_room_rollup_delete
+BEFORE DELETE ON CinemaRooms
+FOR EACH ROW
+BEGIN
+    UPDATE DailyRevenue d
+    JOIN (
+        SELECT ScreeningDate, SUM(SoldSeats) AS Seats
+        FROM Screenings
+        WHERE RoomID = OLD.RoomID
+        GROUP BY ScreeningDate
+    ) s ON d.RevenueDate = s.ScreeningDate
+    SET d.TicketsSold = GREATEST(d.TicketsSold - s.Seats, 0),
+        d.Revenue = GREATEST(d.Revenue - s.Seats * 10.00, 0);
+    
+    UPDATE MovieDailyTickets m
+    JOIN (
+        SELECT MovieID, ScreeningDate, SUM(SoldSeats) AS Seats
+        FROM Screenings
+        WHERE RoomID = OLD.RoomID AND MovieID IS NOT NULL
+        GROUP BY MovieID, ScreeningDate
+    ) s ON m.MovieID = s.MovieID AND m.SalesDate = s.ScreeningDate
+    SET m.TicketsSold = GREATEST(m.TicketsSold - s.Seats, 0);
+END //
+DELIMITER ;
+
+
 -- Creating UDF for occupancy rate
 DROP FUNCTION IF EXISTS fn_occupancy_rate;
 DELIMITER //
@@ -362,12 +743,8 @@ BEGIN
     DECLARE total_seats INT;
     DECLARE occupancy DECIMAL(5,2);
    
-    -- Count only active tickets (not cancelled)
-    SELECT COUNT(*) INTO booked_seats
-    FROM Tickets
-    WHERE ScreeningID = p_screening_id;
-   
-    SELECT r.Capacity INTO total_seats
+    -- Active tickets come from the maintained SoldSeats counter
+    SELECT s.SoldSeats, r.Capacity INTO booked_seats, total_seats
     FROM Screenings s
     JOIN CinemaRooms r ON s.RoomID = r.RoomID
     WHERE s.ScreeningID = p_screening_id;
@@ -388,25 +765,14 @@ DELIMITER //
 CREATE FUNCTION fn_total_revenue_by_date(p_date DATE) RETURNS DECIMAL(10,2)
 DETERMINISTIC
 BEGIN
-    DECLARE total_tickets INT;
-    DECLARE cancelled_tickets INT;
-    DECLARE ticket_price DECIMAL(5,2) DEFAULT 10.00;
+    DECLARE daily_revenue DECIMAL(10,2) DEFAULT 0.00;
    
-    -- Count active tickets
-    SELECT COUNT(*) INTO total_tickets
-    FROM Tickets t
-    JOIN Screenings s ON t.ScreeningID = s.ScreeningID
-    WHERE s.ScreeningDate = p_date;
-    
-    -- Count cancelled tickets for the date
-    SELECT COUNT(*) INTO cancelled_tickets
-    FROM CancelledTickets c
-    JOIN Screenings s ON c.ScreeningID = s.ScreeningID
-    WHERE s.ScreeningDate = p_date
-    AND DATE(c.CancellationDate) = p_date;  -- Only count tickets cancelled on the same day
+    -- Revenue is based on active tickets only, read from the daily rollup
+    SELECT Revenue INTO daily_revenue
+    FROM DailyRevenue
+    WHERE RevenueDate = p_date;
    
-    -- Revenue is based on active tickets only
-    RETURN total_tickets * ticket_price;
+    RETURN IFNULL(daily_revenue, 0.00);
 END //
 DELIMITER ;
 
@@ -457,6 +823,9 @@ GRANT SELECT, INSERT, UPDATE ON CinemaDBcc.Tickets TO 'clerk_user'@'localhost';
 GRANT SELECT, INSERT, UPDATE ON CinemaDBcc.Customers TO 'clerk_user'@'localhost';
 GRANT SELECT ON CinemaDBcc.Screenings TO 'clerk_user'@'localhost';
 GRANT SELECT ON CinemaDBcc.Movies TO 'clerk_user'@'localhost';
+GRANT SELECT ON CinemaDBcc.RoomLayouts TO 'clerk_user'@'localhost';
+GRANT SELECT, INSERT, UPDATE, DELETE ON CinemaDBcc.SeatHolds TO 'clerk_user'@'localhost';
+GRANT SELECT, INSERT ON CinemaDBcc.BookingRequests TO 'clerk_user'@'localhost';
 
 
 -- Granting permissions for Guest
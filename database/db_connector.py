@@ -1,104 +1,638 @@
 import mysql.connector
-from mysql.connector import Error
+from mysql.connector import Error, errorcode
+from mysql.connector.errors import OperationalError, PoolError
+from collections import deque
+from contextlib import contextmanager
+import inspect
+import re
+import threading
+import time
 import sys
 import os
 
 # Add parent directory to path so we can import config
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from config import DB_CONFIG
+from config import DB_CONFIG, DB_POOL_CONFIG, DB_BATCH_SIZE
+
+# Client errors meaning the session is gone and the connection must be replaced
+CONNECTION_LOST_ERRORS = (
+    errorcode.CR_SERVER_GONE_ERROR,
+    errorcode.CR_SERVER_LOST,
+    errorcode.CR_SERVER_LOST_EXTENDED,
+    errorcode.CR_CONN_HOST_ERROR,
+    errorcode.CR_CONNECTION_ERROR
+)
+
+# Server errors after which the whole transaction can simply be tried again
+TRANSIENT_ERRORS = (
+    errorcode.ER_LOCK_DEADLOCK,
+    errorcode.ER_LOCK_WAIT_TIMEOUT
+)
+
+# Statements that are safe to run a second time after a reconnect
+IDEMPOTENT_STATEMENTS = ('SELECT', 'SHOW', 'DESCRIBE', 'DESC', 'EXPLAIN')
+
+# INSERT ... VALUES (...) that executemany sends as one multi-row INSERT whose
+# rows get one run of IDs (no IGNORE, no ON DUPLICATE KEY, no SELECT)
+PLAIN_INSERT = re.compile(r"^\s*INSERT\s+INTO\s+[`\w.]+\s*(\([^)]*\))?\s*VALUES\s*\([^)]*\)\s*;?\s*$",
+                          re.I | re.S)
+
+
+def is_connection_lost(error):
+    """Return True if a MySQL error means the connection itself is dead"""
+    if error.errno in CONNECTION_LOST_ERRORS:
+        return True
+    # "MySQL Connection not available" carries no error number
+    return isinstance(error, OperationalError) and error.errno is None
+
+
+def is_transient_error(error):
+    """Return True if a failed unit of work may succeed when run again
+    
+    Covers lost connections (the commit may or may not have happened),
+    deadlocks, lock wait timeouts and an exhausted connection pool.
+    """
+    if isinstance(error, PoolError):
+        return True
+    if not isinstance(error, Error):
+        return False
+    return is_connection_lost(error) or error.errno in TRANSIENT_ERRORS
+
+
+def is_duplicate_key(error):
+    return isinstance(error, Error) and error.errno == errorcode.ER_DUP_ENTRY
+
+
+class ConnectionPool:
+    """Bounded, thread-safe pool of MySQL connections shared by the whole process"""
+
+    def __init__(self, pool_size=5, acquire_timeout=10, idle_timeout=300, **db_config):
+        self.pool_size = pool_size
+        self.acquire_timeout = acquire_timeout
+        self.idle_timeout = idle_timeout
+        self.db_config = db_config
+        # User variables every pooled session carries (the logged-in user)
+        self.session_vars = {}
+        # Whether cursor.execute() takes multi=True; found on the first connection
+        self.multi_statements = None
+
+        self._lock = threading.Condition()
+        self._idle = deque()  # (connection, returned_at) pairs, most recent on the right
+        self._open = 0        # Connections currently open (idle + checked out)
+
+        # Counters used to size the pool
+        self._stats = {
+            "hits": 0,          # Checkouts served by an idle connection
+            "misses": 0,        # Checkouts that had to open a new connection
+            "waits": 0,         # Checkouts that blocked because the pool was full
+            "timeouts": 0,      # Checkouts that gave up waiting
+            "evictions": 0,     # Idle connections closed by idle_timeout
+            "reconnects": 0,    # Dead connections discarded and replaced
+            "abandoned": 0,     # Connections closed with an unread streamed result
+            "wait_time": 0.0,   # Total seconds spent blocked in acquire()
+            "max_wait_time": 0.0
+        }
+
+    def _new_connection(self):
+        # Reads must never see a stale snapshot left behind by a previous
+        # borrower, so pooled sessions run in autocommit mode and callers
+        # open explicit transactions when they need several statements to
+        # succeed or fail together.
+        connection = mysql.connector.connect(autocommit=True, **self.db_config)
+        if self.multi_statements is None:
+            cursor = connection.cursor()
+            self.multi_statements = "multi" in inspect.signature(cursor.execute).parameters
+            cursor.close()
+        try:
+            self._apply_session_vars(connection)
+        except Exception:
+            self._close_quietly(connection)
+            raise
+        return connection
+
+    def _apply_session_vars(self, connection):
+        if not self.session_vars:
+            return
+        cursor = connection.cursor()
+        try:
+            assignments = ", ".join(f"@{name} = %s" for name in self.session_vars)
+            cursor.execute(f"SET {assignments}", list(self.session_vars.values()))
+        finally:
+            cursor.close()
+
+    def set_identity(self, username):
+        """Tag every pooled session with the logged-in user (@current_user)
+
+        Call it right after login, while no connection is checked out: idle
+        sessions are updated now and new ones as they are opened, so the
+        audit triggers know the user without a SET before every write.
+        """
+        with self._lock:
+            self.session_vars = {"current_user": username}
+            idle = list(self._idle)
+            self._idle.clear()
+        for connection, returned_at in idle:
+            try:
+                self._apply_session_vars(connection)
+            except Error:
+                self.release(connection, discard=True)
+                continue
+            with self._lock:
+                self._idle.append((connection, returned_at))
+                self._lock.notify()
+
+    def _close_quietly(self, connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    def _evict_idle(self):
+        """Remove idle connections unused for idle_timeout seconds; caller closes them"""
+        evicted = []
+        now = time.monotonic()
+        while self._idle and now - self._idle[0][1] > self.idle_timeout:
+            connection, _ = self._idle.popleft()
+            self._open -= 1
+            self._stats["evictions"] += 1
+            evicted.append(connection)
+        return evicted
+
+    def acquire(self, timeout=None):
+        """Check out a connection, waiting up to timeout seconds for one to be returned"""
+        timeout = self.acquire_timeout if timeout is None else timeout
+        started = time.monotonic()
+        waited = False
+        evicted = []
+
+        with self._lock:
+            while True:
+                evicted.extend(self._evict_idle())
+                if self._idle:
+                    connection, _ = self._idle.pop()
+                    self._stats["hits"] += 1
+                    break
+                if self._open < self.pool_size:
+                    # Reserve the slot before connecting outside the lock
+                    self._open += 1
+                    self._stats["misses"] += 1
+                    connection = None
+                    break
+
+                remaining = timeout - (time.monotonic() - started)
+                if remaining <= 0:
+                    self._stats["timeouts"] += 1
+                    for stale in evicted:
+                        self._close_quietly(stale)
+                    raise PoolError("Timed out waiting for a free database connection")
+                waited = True
+                self._lock.wait(remaining)
+
+            if waited:
+                wait_time = time.monotonic() - started
+                self._stats["waits"] += 1
+                self._stats["wait_time"] += wait_time
+                self._stats["max_wait_time"] = max(self._stats["max_wait_time"], wait_time)
+
+        # Close evicted sessions without holding up other threads
+        for stale in evicted:
+            self._close_quietly(stale)
+
+        if connection is None:
+            try:
+                connection = self._new_connection()
+            except Exception:
+                with self._lock:
+                    self._open -= 1
+                    self._lock.notify()
+                raise
+        return connection
+
+    def release(self, connection, discard=False, abandoned=False):
+        """Return a checked-out connection; discard it if it is no longer usable
+
+        abandoned marks a healthy connection closed only because it still
+        had unread rows, so it is not counted as a reconnect.
+        """
+        with self._lock:
+            if discard:
+                self._open -= 1
+                self._stats["abandoned" if abandoned else "reconnects"] += 1
+            else:
+                self._idle.append((connection, time.monotonic()))
+            self._lock.notify()
+        if discard:
+            self._close_quietly(connection)
+
+    def stats(self):
+        """Return a snapshot of pool usage counters"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["pool_size"] = self.pool_size
+            stats["open"] = self._open
+            stats["idle"] = len(self._idle)
+            stats["in_use"] = self._open - len(self._idle)
+            checkouts = stats["hits"] + stats["misses"]
+            stats["hit_rate"] = stats["hits"] / checkouts if checkouts else 0.0
+            stats["avg_wait_time"] = stats["wait_time"] / stats["waits"] if stats["waits"] else 0.0
+        return stats
+
+    def close_all(self):
+        """Close every idle connection (checked-out connections close on release)"""
+        with self._lock:
+            idle = [connection for connection, _ in self._idle]
+            self._idle.clear()
+            self._open -= len(idle)
+        for connection in idle:
+            self._close_quietly(connection)
+
+
+class Transaction:
+    """Statements queued inside DatabaseConnector.transaction(), sent together on exit"""
+
+    def __init__(self, session_vars=None, defaults=None):
+        # Values the pooled session already carries (see set_identity) need no SET
+        self.defaults = dict(defaults or {})
+        self.session_vars = {name: value for name, value in (session_vars or {}).items()
+                             if name not in self.defaults or self.defaults[name] != value}
+        for name in self.session_vars:
+            if not name.isidentifier():
+                raise ValueError(f"Invalid session variable name: {name}")
+        self.statements = []
+        self.results = []   # Rows of every result set, in the order they were returned
+
+    def execute(self, query, params=None):
+        """Queue a statement to run when the transaction commits"""
+        self.statements.append((query.strip().rstrip(';'), list(params or [])))
+
+    def steps(self):
+        """Return every (statement, params) pair sent for this unit of work"""
+        steps = [("START TRANSACTION", [])]
+        steps += [(f"SET @{name} = %s", [value]) for name, value in self.session_vars.items()]
+        steps += self.statements
+        steps.append(("COMMIT", []))
+        steps += self.reset_steps()
+        return steps
+
+    def reset_steps(self):
+        # Session variables must not leak to the next borrower of the connection
+        return [(f"SET @{name} = %s", [self.defaults.get(name)]) for name in self.session_vars]
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """Return the process-wide connection pool, creating it on first use"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(**DB_POOL_CONFIG, **DB_CONFIG)
+    return _pool
+
 
 class DatabaseConnector:
     def __init__(self):
-        self.connection = None
-        self.connect()
+        # Connections come from the shared pool; nothing is opened until the first query
+        self.pool = get_pool()
+        self._local = threading.local()
+
+    @property
+    def connection(self):
+        """Connection pinned to the current thread by session(), if any"""
+        return getattr(self._local, "connection", None)
+
+    @contextmanager
+    def session(self):
+        """Pin one pooled connection so consecutive statements share session state"""
+        if self.connection is not None:
+            # Already inside a session on this thread
+            yield self.connection
+            return
+
+        connection = self.pool.acquire()
+        self._local.connection = connection
+        self._local.broken = False
+        try:
+            yield connection
+        finally:
+            broken = self._local.broken
+            self._local.connection = None
+            # Never hand an open transaction to the next borrower
+            if not broken and connection.in_transaction:
+                try:
+                    connection.rollback()
+                except Error:
+                    broken = True
+            self.pool.release(connection, discard=broken)
+
+    @contextmanager
+    def transaction(self, session_vars=None):
+        """Unit of work: queue statements and commit them in one round trip
         
-    def connect(self):
+        Statements passed to the yielded Transaction's execute() are not run
+        straight away. When the block exits they are sent as a single
+        multi-statement script wrapped in START TRANSACTION ... COMMIT, with
+        session_vars (e.g. {"current_user": name}) set first and put back to
+        the pool's session values after (NULL when the pool has none);
+        variables the session already holds with the same value are not
+        sent. If any statement fails the transaction is rolled back, the
+        session variables are put back the same way and the error is raised.
+        """
+        transaction = Transaction(session_vars, self.pool.session_vars)
+        yield transaction
+        if transaction.statements:
+            self._run_transaction(transaction)
+    
+    def _run_transaction(self, transaction):
+        with self.session() as connection:
+            cursor = connection.cursor(dictionary=True)
+            try:
+                steps = transaction.steps()
+                if self.pool.multi_statements:
+                    script = "; ".join(statement for statement, _ in steps)
+                    params = [value for _, step_params in steps for value in step_params]
+                    results = cursor.execute(script, params, multi=True)
+                else:
+                    # Connector without multi-statement support: same steps, one trip each
+                    results = None
+                
+                if results is None:
+                    for statement, step_params in steps:
+                        cursor.execute(statement, step_params or None)
+                        if cursor.with_rows:
+                            transaction.results.append(cursor.fetchall())
+                else:
+                    # Reading every result surfaces errors from any statement
+                    for result in results:
+                        if result.with_rows:
+                            transaction.results.append(result.fetchall())
+            except Error as e:
+                if not self._mark_if_lost(e):
+                    self._abort_transaction(connection, cursor, transaction)
+                raise
+            finally:
+                try:
+                    cursor.close()
+                except Error:
+                    pass
+    
+    def _abort_transaction(self, connection, cursor, transaction):
+        """Roll back a failed unit of work and clear its session variables"""
         try:
-            self.connection = mysql.connector.connect(**DB_CONFIG)
-            if self.connection.is_connected():
-                return self.connection
-        except Error as e:
-            print(f"Error connecting to MySQL database: {e}")
-            return None
+            connection.rollback()
+            for statement, params in transaction.reset_steps():
+                cursor.execute(statement, params)
+        except Error:
+            # Leave nothing half-reset behind for the next borrower
+            self._local.broken = True
     
+    def _mark_if_lost(self, error):
+        """Flag the pinned connection for replacement when the server dropped it"""
+        if is_connection_lost(error):
+            self._local.broken = True
+            return True
+        return False
+
     def execute_query(self, query, params=None):
-        cursor = None
+        statement = query.strip().upper()
+        # Liveness is checked lazily: no ping up front, and a read that hits a
+        # dead connection is retried once on a fresh one. Inside a pinned
+        # session the session state is gone, so the caller sees the error.
+        can_retry = self.connection is None and statement.startswith(IDEMPOTENT_STATEMENTS)
+
+        while True:
+            try:
+                with self.session() as connection:
+                    try:
+                        return self._execute(connection, statement, query, params)
+                    except Error as e:
+                        self._mark_if_lost(e)
+                        raise
+            except Error as e:
+                if can_retry and is_connection_lost(e):
+                    can_retry = False
+                    print(f"Lost connection to MySQL, reconnecting: {e}")
+                    continue
+                print(f"Error executing query: {e}")
+                return None
+
+    def _execute(self, connection, statement, query, params):
+        cursor = connection.cursor(dictionary=True)
         try:
-            # Ensure connection is active
-            if not self.connection or not self.connection.is_connected():
-                self.connect()
-                
-            cursor = self.connection.cursor(dictionary=True)
+            # Stored procedures may run several statements, keep them atomic
+            if statement.startswith('CALL'):
+                connection.start_transaction()
+
             if params:
                 cursor.execute(query, params)
             else:
                 cursor.execute(query)
-                
-            # Force immediate commit for any command that modifies data
-            if query.strip().upper().startswith(('INSERT', 'UPDATE', 'DELETE', 'CALL', 'SET')):
-                self.connection.commit()
-                if query.strip().upper().startswith(('INSERT', 'UPDATE', 'DELETE')):
-                    return cursor.lastrowid
-                elif query.strip().upper().startswith('CALL'):
-                    try:
-                        return cursor.fetchall()  # Try to fetch results if any
-                    except:
-                        return cursor.rowcount   # If no results, return affected rows
+
+            if statement.startswith(('INSERT', 'UPDATE', 'DELETE')):
+                return cursor.lastrowid
+            elif statement.startswith('CALL'):
+                try:
+                    results = cursor.fetchall()  # Try to fetch results if any
+                except Error:
+                    results = cursor.rowcount    # If no results, return affected rows
+                connection.commit()
+                return results
+            elif statement.startswith('SET'):
+                return None
             else:
                 return cursor.fetchall()
-        except Error as e:
-            print(f"Error executing query: {e}")
-            if self.connection:
-                try:
-                    self.connection.rollback()
-                except:
-                    pass
-            return None
         finally:
-            if cursor:
+            try:
+                cursor.close()
+            except Error:
+                pass
+
+    def execute_many(self, query, seq_params, chunk_size=None):
+        """Run one write statement for many parameter rows with a single commit
+        
+        Rows are sent chunk_size at a time with executemany (plain INSERT ...
+        VALUES statements go out as one multi-row INSERT per chunk). If a
+        chunk fails it is undone back to its savepoint and replayed row by
+        row so only the bad rows are skipped.
+        
+        Returns a dict with inserted_ids (one entry per input row for INSERTs,
+        None where the row failed), failures as (row index, message) pairs and
+        the total rowcount, or None if the batch as a whole failed. IDs of a
+        multi-row INSERT are worked out from the first one, stepping by the
+        session's auto_increment_increment; InnoDB hands a simple INSERT of
+        known row count one run of such IDs. Any other INSERT (IGNORE, ON
+        DUPLICATE KEY, INSERT ... SELECT) is sent one row at a time so every
+        row's own ID is known.
+        """
+        rows = [tuple(params) for params in seq_params]
+        chunk_size = chunk_size or DB_BATCH_SIZE
+        is_insert = query.strip().upper().startswith('INSERT')
+        # Only a plain multi-row INSERT reports IDs that the rest can be worked out from
+        per_row = is_insert and not PLAIN_INSERT.match(query)
+        result = {
+            "inserted_ids": [None] * len(rows) if is_insert else [],
+            "failures": [],
+            "rowcount": 0
+        }
+        if not rows:
+            return result
+        
+        try:
+            with self.session() as connection:
+                cursor = connection.cursor()
                 try:
-                    cursor.close()
-                except:
-                    pass
+                    connection.start_transaction()
+                    step = 1
+                    if is_insert and not per_row:
+                        # Multi-primary setups (Galera, group replication) space IDs out
+                        cursor.execute("SELECT @@SESSION.auto_increment_increment")
+                        step = int(cursor.fetchone()[0])
+                    for start in range(0, len(rows), chunk_size):
+                        chunk = rows[start:start + chunk_size]
+                        if per_row:
+                            self._execute_rows(cursor, query, chunk, start, is_insert, result)
+                            continue
+                        cursor.execute("SAVEPOINT batch_chunk")
+                        try:
+                            cursor.executemany(query, chunk)
+                        except Error as e:
+                            # A deadlock has already rolled back the whole transaction
+                            if is_connection_lost(e) or e.errno == errorcode.ER_LOCK_DEADLOCK:
+                                raise
+                            cursor.execute("ROLLBACK TO SAVEPOINT batch_chunk")
+                            self._execute_rows(cursor, query, chunk, start, is_insert, result)
+                            continue
+                        
+                        result["rowcount"] += cursor.rowcount
+                        if is_insert:
+                            # A multi-row INSERT reports the first ID and the
+                            # rest of the chunk follows it, step apart
+                            for offset in range(len(chunk)):
+                                result["inserted_ids"][start + offset] = cursor.lastrowid + offset * step
+                    connection.commit()
+                except Error as e:
+                    self._mark_if_lost(e)
+                    raise
+                finally:
+                    try:
+                        cursor.close()
+                    except Error:
+                        pass
+            return result
+        except Error as e:
+            print(f"Error executing batch: {e}")
+            return None
     
-    def call_procedure(self, proc_name, params=None):
+    def _execute_rows(self, cursor, query, chunk, start, is_insert, result):
+        """Replay a failed chunk one row at a time, recording the rows that fail"""
+        for offset, params in enumerate(chunk):
+            try:
+                cursor.execute(query, params)
+            except Error as e:
+                if is_connection_lost(e) or e.errno == errorcode.ER_LOCK_DEADLOCK:
+                    raise
+                result["failures"].append((start + offset, str(e)))
+                continue
+            
+            result["rowcount"] += cursor.rowcount
+            if is_insert:
+                result["inserted_ids"][start + offset] = cursor.lastrowid
+    
+    def stream_query(self, query, params=None, batch_size=500, as_batches=False):
+        """Yield the rows of a read query without loading the whole result
+        
+        Rows are pulled from an unbuffered cursor batch_size at a time and
+        yielded one by one, or as lists when as_batches is True. The stream
+        holds its own pooled connection until it is exhausted or closed, so
+        other queries can run while it is being consumed. Errors are raised
+        to the consumer since a partial result cannot be told apart from a
+        short one.
+        """
+        connection = self.pool.acquire()
         cursor = None
+        finished = False
+        broken = False
         try:
-            if not self.connection or not self.connection.is_connected():
-                self.connect()
-                
-            cursor = self.connection.cursor(dictionary=True)
+            cursor = connection.cursor(dictionary=True, buffered=False)
             if params:
-                cursor.callproc(proc_name, params)
+                cursor.execute(query, params)
             else:
-                cursor.callproc(proc_name)
-                
-            # Get results from stored procedure
-            results = []
-            for result in cursor.stored_results():
-                results.extend(result.fetchall())
+                cursor.execute(query)
             
-            self.connection.commit()
-            return results
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                if as_batches:
+                    yield rows
+                else:
+                    yield from rows
+            finished = True
         except Error as e:
-            print(f"Error calling procedure: {e}")
-            return None
+            broken = is_connection_lost(e)
+            raise
         finally:
-            if cursor:
-                cursor.close()
+            if finished and not broken:
+                try:
+                    cursor.close()
+                except Error:
+                    broken = True
+                self.pool.release(connection, discard=broken)
+            else:
+                # Reading the rest of a large result just to reuse the session
+                # costs more than a new connection, so close it instead
+                self.pool.release(connection, discard=True, abandoned=not broken)
     
+    def call_procedure(self, proc_name, params=None):
+        try:
+            with self.session() as connection:
+                cursor = connection.cursor(dictionary=True)
+                try:
+                    connection.start_transaction()
+                    if params:
+                        cursor.callproc(proc_name, params)
+                    else:
+                        cursor.callproc(proc_name)
+
+                    # Get results from stored procedure
+                    results = []
+                    for result in cursor.stored_results():
+                        results.extend(result.fetchall())
+
+                    connection.commit()
+                    return results
+                except Error as e:
+                    self._mark_if_lost(e)
+                    raise
+                finally:
+                    try:
+                        cursor.close()
+                    except Error:
+                        pass
+        except Error as e:
+            print(f"Error calling procedure: {e}")
+            return None
+
+    def reconnect_count(self):
+        """Number of dead connections that have been replaced so far"""
+        return self.pool.stats()["reconnects"]
+
+    def pool_stats(self):
+        """Return hit/miss and wait-time statistics for the shared pool"""
+        return self.pool.stats()
+
     def refresh_connection(self):
-        """Force reconnection to the database"""
+        """Drop idle pooled connections so the next query opens a fresh one"""
         try:
-            if self.connection:
-                if self.connection.is_connected():
-                    self.connection.close()
-            self.connection = mysql.connector.connect(**DB_CONFIG)
+            self.pool.close_all()
             return True
         except Error as e:
             print(f"Error refreshing connection: {e}")
             return False
-    
+
     def close(self):
-        if self.connection and self.connection.is_connected():
-            self.connection.close()
+        # Connections belong to the pool; nothing to close per connector
+        pass
@@ -0,0 +1,136 @@
+from concurrent.futures import ThreadPoolExecutor
+import queue
+import threading
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import DB_POOL_CONFIG
+from models.events import event_bus
+
+class BackgroundTasks:
+    """Run model calls on worker threads and hand the results back to the Tk thread
+
+    Every task has a key (for example "tickets" or "screenings"). Submitting
+    a new task under a key supersedes the previous one: if it has not started
+    it is cancelled, and if it has its result is dropped when it arrives.
+    Callbacks always run on the Tk thread, from an after() poll, so they are
+    free to touch widgets. Events models published on worker threads (see
+    models.events) are delivered from the same poll.
+    """
+
+    # Milliseconds between checks for finished tasks while any are pending
+    POLL_INTERVAL = 30
+
+    def __init__(self, root, max_workers=None):
+        self.root = root
+        # Leave one pooled connection free for work done on the Tk thread
+        max_workers = max_workers or max(1, DB_POOL_CONFIG['pool_size'] - 1)
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="db-worker")
+        self._done = queue.Queue()
+        self._lock = threading.Lock()
+        self._generations = {}  # key -> generation of the newest task
+        self._futures = {}      # key -> future of the newest task
+        self._pending = 0
+        self._poll_job = None
+
+    def submit(self, key, fetch, on_done=None, on_error=None):
+        """Run fetch() on a worker thread, then on_done(result) on the Tk thread
+
+        on_error(exception) is called instead if fetch raises; without it the
+        error is printed. Results of superseded tasks are never delivered.
+        """
+        with self._lock:
+            generation = self._generations.get(key, 0) + 1
+            self._generations[key] = generation
+            previous = self._futures.get(key)
+            if previous is not None:
+                previous.cancel()
+
+            future = self.executor.submit(fetch)
+            self._futures[key] = future
+            self._pending += 1
+
+        future.add_done_callback(
+            lambda f: self._done.put((key, generation, f, on_done, on_error)))
+        self._schedule_poll()
+        return future
+
+    def cancel(self, key):
+        """Drop the result of the task running under key, if any"""
+        with self._lock:
+            self._generations[key] = self._generations.get(key, 0) + 1
+            future = self._futures.pop(key, None)
+        if future is not None:
+            future.cancel()
+
+    def is_busy(self, key):
+        """Return True while a task under key has not delivered its result"""
+        with self._lock:
+            future = self._futures.get(key)
+        return future is not None
+
+    def _schedule_poll(self):
+        # after() is only safe from the Tk thread, submit() is always called there
+        if self._poll_job is None:
+            self._poll_job = self.root.after(self.POLL_INTERVAL, self._poll)
+
+    def _poll(self):
+        self._poll_job = None
+        while True:
+            try:
+                key, generation, future, on_done, on_error = self._done.get_nowait()
+            except queue.Empty:
+                break
+
+            with self._lock:
+                self._pending -= 1
+                current = self._generations.get(key) == generation
+                if current:
+                    self._futures.pop(key, None)
+
+            # A newer request for the same key has replaced this one
+            if not current or future.cancelled():
+                continue
+
+            error = future.exception()
+            try:
+                if error is not None:
+                    if on_error:
+                        on_error(error)
+                    else:
+                        print(f"Error in background task {key}: {error}")
+                elif on_done:
+                    on_done(future.result())
+            except Exception as e:
+                print(f"Error applying background result {key}: {e}")
+
+        # Models publish their events before the task finishes, so anything
+        # a task published is delivered by the poll that picks up its result
+        event_bus.drain()
+
+        with self._lock:
+            pending = self._pending
+        if pending:
+            self._schedule_poll()
+
+    def shutdown(self):
+        """Stop accepting work and drop anything still queued"""
+        if self._poll_job is not None:
+            try:
+                self.root.after_cancel(self._poll_job)
+            except Exception:
+                pass
+            self._poll_job = None
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+def get_tasks(widget):
+    """Return the BackgroundTasks shared by every widget in the window"""
+    root = widget._root()
+    tasks = getattr(root, "background_tasks", None)
+    if tasks is None:
+        tasks = BackgroundTasks(root)
+        root.background_tasks = tasks
+    return tasks
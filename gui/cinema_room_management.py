@@ -6,6 +6,7 @@ import os
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from models.cinema_room_model import CinemaRoomModel
+from gui.background import get_tasks
 
 class CinemaRoomManagementFrame(tk.Frame):
     def __init__(self, parent, controller):
@@ -76,13 +77,16 @@ class CinemaRoomManagementFrame(tk.Frame):
         self.room_tree.bind("<<TreeviewSelect>>", self.on_room_select)
         
     def refresh_data(self):
+        # Query on a worker thread; the list is filled when the rows arrive
+        get_tasks(self).submit("rooms.list", self.room_model.get_all_rooms, self.show_rooms)
+        
+    def show_rooms(self, rooms):
         # Clear existing data
         for i in self.room_tree.get_children():
             self.room_tree.delete(i)
             
         # Load rooms
-        rooms = self.room_model.get_all_rooms()
-        for room in rooms:
+        for room in rooms or []:
             self.room_tree.insert("", "end", values=(
                 room["RoomID"],
                 room["RoomName"],
@@ -101,7 +105,9 @@ class CinemaRoomManagementFrame(tk.Frame):
         room_id = self.room_tree.item(selected_items[0])["values"][0]
         
         # Get room details
-        room = self.room_model.get_room(room_id)
+        get_tasks(self).submit("rooms.detail", lambda: self.room_model.get_room(room_id), self.show_room)
+        
+    def show_room(self, room):
         if room:
             self.name_var.set(room["RoomName"])
             self.capacity_var.set(room["Capacity"])
@@ -128,14 +134,23 @@ class CinemaRoomManagementFrame(tk.Frame):
             messagebox.showerror("Validation Error", "Room name is required")
             return
             
-        # Save or update room
-        if self.current_id:
-            self.room_model.update_room(self.current_id, name, capacity)
-            messagebox.showinfo("Success", "Room updated successfully")
+        # Save or update room on a worker thread
+        room_id = self.current_id
+        if room_id:
+            save = lambda: self.room_model.update_room(room_id, name, capacity)
+            message = "Room updated successfully"
         else:
-            self.room_model.add_room(name, capacity)
-            messagebox.showinfo("Success", "Room added successfully")
-            
+            save = lambda: self.room_model.add_room(name, capacity) is not None
+            message = "Room added successfully"
+        get_tasks(self).submit("rooms.save", save, lambda success: self.on_room_saved(success, message),
+                               lambda e: messagebox.showerror("Error", f"Failed to save room: {e}"))
+    
+    def on_room_saved(self, success, message):
+        if not success:
+            messagebox.showerror("Error", "Failed to save room")
+            return
+        messagebox.showinfo("Success", message)
+        
         # Refresh the data
         self.refresh_data()
         
@@ -156,6 +171,11 @@ class CinemaRoomManagementFrame(tk.Frame):
             return
             
         if messagebox.askyesno("Confirm Delete", "Are you sure you want to delete this room?"):
-            self.room_model.delete_room(self.current_id)
-            messagebox.showinfo("Success", "Room deleted successfully")
-            self.refresh_data()
+            room_id = self.current_id
+            get_tasks(self).submit("rooms.delete", lambda: self.room_model.delete_room(room_id),
+                                   self.on_room_deleted,
+                                   lambda e: messagebox.showerror("Error", f"Failed to delete room: {e}"))
+    
+    def on_room_deleted(self, result):
+        messagebox.showinfo("Success", "Room deleted successfully")
+        self.refresh_data()
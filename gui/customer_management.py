@@ -6,6 +6,7 @@ import os
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from models.customer_model import CustomerModel
+from gui.background import get_tasks
 
 class CustomerManagementFrame(tk.Frame):
     def __init__(self, parent, controller):
@@ -76,13 +77,17 @@ class CustomerManagementFrame(tk.Frame):
         self.customer_tree.bind("<<TreeviewSelect>>", self.on_customer_select)
         
     def refresh_data(self):
+        # Query on a worker thread; the list is filled when the rows arrive
+        get_tasks(self).submit("customers.list", self.customer_model.get_all_customers,
+                               self.show_customers)
+        
+    def show_customers(self, customers):
         # Clear existing data
         for i in self.customer_tree.get_children():
             self.customer_tree.delete(i)
             
         # Load customers
-        customers = self.customer_model.get_all_customers()
-        for customer in customers:
+        for customer in customers or []:
             self.customer_tree.insert("", "end", values=(
                 customer["CustomerID"],
                 customer["CustomerName"],
@@ -101,7 +106,10 @@ class CustomerManagementFrame(tk.Frame):
         customer_id = self.customer_tree.item(selected_items[0])["values"][0]
         
         # Get customer details
-        customer = self.customer_model.get_customer(customer_id)
+        get_tasks(self).submit("customers.detail", lambda: self.customer_model.get_customer(customer_id),
+                               self.show_customer)
+        
+    def show_customer(self, customer):
         if customer:
             self.name_var.set(customer["CustomerName"])
             self.phone_var.set(customer["PhoneNumber"])
@@ -125,14 +133,20 @@ class CustomerManagementFrame(tk.Frame):
             messagebox.showerror("Validation Error", "Phone number is required")
             return
         
-        # Save or update customer
-        if self.current_id:
-            self.customer_model.update_customer(self.current_id, name, phone)
-            messagebox.showinfo("Success", "Customer updated successfully")
+        # Save or update customer on a worker thread
+        customer_id = self.current_id
+        if customer_id:
+            save = lambda: self.customer_model.update_customer(customer_id, name, phone)
+            message = "Customer updated successfully"
         else:
-            self.customer_model.add_customer(name, phone)
-            messagebox.showinfo("Success", "Customer added successfully")
-            
+            save = lambda: self.customer_model.add_customer(name, phone)
+            message = "Customer added successfully"
+        get_tasks(self).submit("customers.save", save, lambda result: self.on_customer_saved(message),
+                               lambda e: messagebox.showerror("Error", f"Failed to save customer: {e}"))
+    
+    def on_customer_saved(self, message):
+        messagebox.showinfo("Success", message)
+        
         # Refresh the data
         self.refresh_data()
         
@@ -152,6 +166,11 @@ class CustomerManagementFrame(tk.Frame):
             return
             
         if messagebox.askyesno("Confirm Delete", "Are you sure you want to delete this customer?"):
-            self.customer_model.delete_customer(self.current_id)
-            messagebox.showinfo("Success", "Customer deleted successfully")
-            self.refresh_data()
+            customer_id = self.current_id
+            get_tasks(self).submit("customers.delete", lambda: self.customer_model.delete_customer(customer_id),
+                                   self.on_customer_deleted,
+                                   lambda e: messagebox.showerror("Error", f"Failed to delete customer: {e}"))
+    
+    def on_customer_deleted(self, result):
+        messagebox.showinfo("Success", "Customer deleted successfully")
+        self.refresh_data()
@@ -6,9 +6,12 @@ import os
 
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from models.feedback_model import FeedbackModel
+from models.feedback_model import FeedbackModel, FEEDBACK_SORT_KEYS, FEEDBACK_DEFAULT_SORT
 from models.movie_model import MovieModel
 from models.customer_model import CustomerModel
+from models.row_source import RowSource
+from gui.virtual_tree import VirtualTreeview
+from gui.background import get_tasks
 
 class FeedbackManagementFrame(tk.Frame):
     def __init__(self, parent, controller):
@@ -18,6 +21,10 @@ class FeedbackManagementFrame(tk.Frame):
         self.movie_model = MovieModel()
         self.customer_model = CustomerModel()
         
+        # Dropdown lookups, filled when the first refresh arrives
+        self.movies_data = {}
+        self.customers_data = {}
+        
         # Create UI elements
         self.create_widgets()
         
@@ -55,30 +62,20 @@ class FeedbackManagementFrame(tk.Frame):
         clear_button = tk.Button(filter_frame, text="Clear Filters", command=self.clear_filters)
         clear_button.grid(row=0, column=2, rowspan=2, padx=5, pady=5)
         
-        # Feedback list
-        self.feedback_tree = ttk.Treeview(feedback_frame, 
-                                          columns=("ID", "Customer", "Movie", "Rating", "Date"), 
-                                          show="headings", height=15)
-        self.feedback_tree.heading("ID", text="ID")
-        self.feedback_tree.heading("Customer", text="Customer")
-        self.feedback_tree.heading("Movie", text="Movie")
-        self.feedback_tree.heading("Rating", text="Rating")
-        self.feedback_tree.heading("Date", text="Date")
-        
-        self.feedback_tree.column("ID", width=50, anchor="center")
-        self.feedback_tree.column("Customer", width=150)
-        self.feedback_tree.column("Movie", width=200)
-        self.feedback_tree.column("Rating", width=70, anchor="center")
-        self.feedback_tree.column("Date", width=100, anchor="center")
-        
-        self.feedback_tree.pack(fill="both", expand=True, padx=5, pady=5)
-        
-        # Add scrollbar to treeview
-        tree_scroll = ttk.Scrollbar(feedback_frame, orient="vertical", command=self.feedback_tree.yview)
-        tree_scroll.pack(side="right", fill="y")
-        self.feedback_tree.configure(yscrollcommand=tree_scroll.set)
-        
-        self.feedback_tree.bind("<<TreeviewSelect>>", self.on_feedback_select)
+        # Feedback list: only the visible rows exist in the tree, the rest
+        # are read from the database as the list is scrolled
+        self.feedback_filter = (None, None)
+        self.feedback_list = VirtualTreeview(
+            feedback_frame, self.feedback_source(),
+            [("ID", "ID", 50, "center"), ("Customer", "Customer", 150, "w"),
+             ("Movie", "Movie", 200, "w"), ("Rating", "Rating", 70, "center"),
+             ("Date", "Date", 100, "center")],
+            lambda feedback: feedback["FeedbackID"], self.feedback_values,
+            sortable={"ID": "FeedbackID", "Customer": "CustomerName", "Movie": "MovieTitle",
+                      "Rating": "Rating", "Date": "FeedbackDate"})
+        self.feedback_list.pack(fill="both", expand=True, padx=5, pady=5)
+        
+        self.feedback_list.bind("<<SelectionChanged>>", self.on_feedback_select)
         
         # Right panel - Feedback details
         details_frame = tk.LabelFrame(self, text="Feedback Details")
@@ -129,66 +126,73 @@ class FeedbackManagementFrame(tk.Frame):
         self.grid_rowconfigure(1, weight=1)
         
     def refresh_data(self):
-        # Clear existing data
-        for i in self.feedback_tree.get_children():
-            self.feedback_tree.delete(i)
-            
-        # Load feedback
-        all_feedback = self.feedback_model.get_all_feedback()
-        for feedback in all_feedback:
-            self.feedback_tree.insert("", "end", values=(
-                feedback["FeedbackID"],
-                feedback["CustomerName"],
-                feedback["MovieTitle"],
-                "★" * feedback["Rating"],
-                feedback["FeedbackDate"]
-            ))
+        # Re-read the feedback in view for the active filter; only changed
+        # rows are touched
+        self.filter_feedback()
+        
+        # Dropdown data is fetched on a worker thread
+        get_tasks(self).submit("feedback.lookups", self.fetch_lookups, self.show_lookups)
+        
+        # Clear form
+        self.clear_form()
+        
+    def fetch_lookups(self):
+        """Load the movie and customer dropdown data (runs off the Tk thread)"""
+        return self.movie_model.get_all_movies() or [], self.customer_model.get_all_customers() or []
+        
+    def show_lookups(self, data):
+        movies, customers = data
         
         # Load movies for dropdown
-        movies = self.movie_model.get_all_movies()
         self.movie_combo["values"] = ["All"] + [movie["MovieTitle"] for movie in movies]
         self.movie_entry["values"] = [movie["MovieTitle"] for movie in movies]
         self.movies_data = {movie["MovieTitle"]: movie["MovieID"] for movie in movies}
         
         # Load customers for dropdown
-        customers = self.customer_model.get_all_customers()
         self.customer_combo["values"] = ["All"] + [customer["CustomerName"] for customer in customers]
         self.customer_entry["values"] = [customer["CustomerName"] for customer in customers]
         self.customers_data = {customer["CustomerName"]: customer["CustomerID"] for customer in customers}
         
-        # Clear form
-        self.clear_form()
-        
     def filter_feedback(self, event=None):
-        # Clear existing data
-        for i in self.feedback_tree.get_children():
-            self.feedback_tree.delete(i)
-            
         movie_filter = self.movie_var.get()
         customer_filter = self.customer_var.get()
         
-        # Get filtered feedback
+        # Pick the feedback source for the active filter
+        movie_id, customer_id = None, None
         if movie_filter != "All" and movie_filter in self.movies_data:
             movie_id = self.movies_data[movie_filter]
-            feedback_list = self.feedback_model.get_feedback_by_movie(movie_id)
         elif customer_filter != "All" and customer_filter in self.customers_data:
             customer_id = self.customers_data[customer_filter]
-            feedback_list = self.feedback_model.get_feedback_by_customer(customer_id)
-        else:
-            feedback_list = self.feedback_model.get_all_feedback()
-            
-        # Populate tree
-        for feedback in feedback_list:
-            customer_name = feedback.get("CustomerName", "")
-            movie_title = feedback.get("MovieTitle", "")
             
-            self.feedback_tree.insert("", "end", values=(
-                feedback["FeedbackID"],
-                customer_name,
-                movie_title,
-                "★" * feedback["Rating"],
-                feedback["FeedbackDate"]
-            ))
+        self.set_feedback_filter(movie_id, customer_id)
+        
+    def set_feedback_filter(self, movie_id, customer_id):
+        """Show the feedback for a movie or customer (or all), refreshing if unchanged"""
+        if (movie_id, customer_id) == self.feedback_filter:
+            self.feedback_list.refresh()
+        else:
+            self.feedback_filter = (movie_id, customer_id)
+            self.feedback_list.set_source(self.feedback_source(movie_id, customer_id))
+        
+    def feedback_source(self, movie_id=None, customer_id=None):
+        """Row source for one filter (rows load off the Tk thread)"""
+        if movie_id is not None:
+            fetch_rows = lambda limit, **page: self.feedback_model.get_feedback_by_movie(movie_id, limit, **page)
+        elif customer_id is not None:
+            fetch_rows = lambda limit, **page: self.feedback_model.get_feedback_by_customer(customer_id, limit, **page)
+        else:
+            fetch_rows = self.feedback_model.get_all_feedback
+        return RowSource(fetch_rows, lambda: self.feedback_model.count_feedback(movie_id, customer_id),
+                         FEEDBACK_SORT_KEYS, FEEDBACK_DEFAULT_SORT)
+        
+    def feedback_values(self, feedback):
+        return (
+            feedback["FeedbackID"],
+            feedback.get("CustomerName", ""),
+            feedback.get("MovieTitle", ""),
+            "★" * feedback["Rating"],
+            feedback["FeedbackDate"]
+        )
             
     def clear_filters(self):
         self.movie_var.set("All")
@@ -196,22 +200,18 @@ class FeedbackManagementFrame(tk.Frame):
         self.refresh_data()
         
     def on_feedback_select(self, event):
-        selected_items = self.feedback_tree.selection()
-        if not selected_items:
+        selected_rows = self.feedback_list.selected_rows()
+        if not selected_rows:
             return
             
         # Get the selected feedback ID
-        feedback_id = self.feedback_tree.item(selected_items[0])["values"][0]
+        feedback_id = selected_rows[0]["FeedbackID"]
         
-        # Get all feedback details
-        all_feedback = self.feedback_model.get_all_feedback()
-        selected_feedback = None
+        # Get the feedback details
+        get_tasks(self).submit("feedback.detail", lambda: self.feedback_model.get_feedback(feedback_id),
+                               self.show_feedback)
         
-        for feedback in all_feedback:
-            if feedback["FeedbackID"] == feedback_id:
-                selected_feedback = feedback
-                break
-                
+    def show_feedback(self, selected_feedback):
         if selected_feedback:
             self.detail_customer_var.set(selected_feedback["CustomerName"])
             self.detail_movie_var.set(selected_feedback["MovieTitle"])
@@ -221,7 +221,7 @@ class FeedbackManagementFrame(tk.Frame):
             self.comment_text.delete(1.0, tk.END)
             self.comment_text.insert(tk.END, selected_feedback["Comment"] if selected_feedback["Comment"] else "")
             
-            self.current_id = feedback_id
+            self.current_id = selected_feedback["FeedbackID"]
         
     def clear_form(self):
         self.detail_customer_var.set("")
@@ -260,14 +260,20 @@ class FeedbackManagementFrame(tk.Frame):
         customer_id = self.customers_data[customer_name]
         movie_id = self.movies_data[movie_title]
         
-        # Save or update feedback
-        if self.current_id:
-            self.feedback_model.update_feedback(self.current_id, rating, comment)
-            messagebox.showinfo("Success", "Feedback updated successfully")
+        # Save or update feedback on a worker thread
+        feedback_id = self.current_id
+        if feedback_id:
+            save = lambda: self.feedback_model.update_feedback(feedback_id, rating, comment)
+            message = "Feedback updated successfully"
         else:
-            self.feedback_model.add_feedback(customer_id, movie_id, rating, comment)
-            messagebox.showinfo("Success", "Feedback added successfully")
-            
+            save = lambda: self.feedback_model.add_feedback(customer_id, movie_id, rating, comment)
+            message = "Feedback added successfully"
+        get_tasks(self).submit("feedback.save", save, lambda result: self.on_feedback_saved(message),
+                               lambda e: messagebox.showerror("Error", f"Failed to save feedback: {e}"))
+    
+    def on_feedback_saved(self, message):
+        messagebox.showinfo("Success", message)
+        
         # Refresh the data
         self.refresh_data()
         
@@ -288,6 +294,11 @@ class FeedbackManagementFrame(tk.Frame):
             return
             
         if messagebox.askyesno("Confirm Delete", "Are you sure you want to delete this feedback?"):
-            self.feedback_model.delete_feedback(self.current_id)
-            messagebox.showinfo("Success", "Feedback deleted successfully")
-            self.refresh_data()
+            feedback_id = self.current_id
+            get_tasks(self).submit("feedback.delete", lambda: self.feedback_model.delete_feedback(feedback_id),
+                                   self.on_feedback_deleted,
+                                   lambda e: messagebox.showerror("Error", f"Failed to delete feedback: {e}"))
+    
+    def on_feedback_deleted(self, result):
+        messagebox.showinfo("Success", "Feedback deleted successfully")
+        self.refresh_data()
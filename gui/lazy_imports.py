@@ -0,0 +1,74 @@
+import importlib
+import threading
+import time
+
+# Slow third-party stacks that only the dashboard, reports and date pickers
+# need. They are imported on first use (or by prewarm() while the login
+# window is open) instead of when the GUI modules load.
+HEAVY_MODULES = (
+    "matplotlib",
+    "matplotlib.figure",
+    "matplotlib.backends.backend_tkagg",
+    "matplotlib.pyplot",
+    "tkcalendar",
+)
+
+_lock = threading.RLock()
+_import_times = {}  # module -> (milliseconds, thread name)
+
+def load(name):
+    """Import a module once, recording how long the first import took"""
+    with _lock:
+        if name.startswith("matplotlib") and "matplotlib" not in _import_times:
+            # The backend has to be chosen before pyplot is imported
+            started = time.perf_counter()
+            matplotlib = importlib.import_module("matplotlib")
+            matplotlib.use("TkAgg")
+            _record("matplotlib", started)
+        if name in _import_times:
+            return importlib.import_module(name)
+        started = time.perf_counter()
+        module = importlib.import_module(name)
+        _record(name, started)
+        return module
+
+def _record(name, started):
+    _import_times[name] = ((time.perf_counter() - started) * 1000, threading.current_thread().name)
+
+def chart_classes():
+    """(Figure, FigureCanvasTkAgg) for embedding charts"""
+    figure = load("matplotlib.figure")
+    backend = load("matplotlib.backends.backend_tkagg")
+    return figure.Figure, backend.FigureCanvasTkAgg
+
+def pyplot():
+    return load("matplotlib.pyplot")
+
+def date_entry_class():
+    return load("tkcalendar").DateEntry
+
+def prewarm():
+    """Import the heavy modules on a background thread; returns the thread
+
+    Only imports happen there (no widgets are created), so it is safe to run
+    while a Tk window is open on the main thread.
+    """
+    def work():
+        for name in HEAVY_MODULES:
+            try:
+                load(name)
+            except Exception as e:
+                print(f"Error pre-loading {name}: {e}")
+
+    thread = threading.Thread(target=work, name="prewarm-imports", daemon=True)
+    thread.start()
+    return thread
+
+def import_report():
+    """Lines describing the heavy imports done so far and where they ran"""
+    with _lock:
+        times = dict(_import_times)
+    lines = [f"  {name}: {ms:.0f} ms ({thread})" for name, (ms, thread) in times.items()]
+    total = sum(ms for ms, thread in times.values())
+    lines.append(f"  total: {total:.0f} ms")
+    return lines
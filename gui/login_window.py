@@ -7,6 +7,7 @@ import os
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config import DB_CONFIG
+from database.db_connector import get_pool, is_connection_lost
 
 class LoginWindow(tk.Tk):
     def __init__(self):
@@ -70,53 +71,59 @@ class LoginWindow(tk.Tk):
             messagebox.showerror("Login Error", "Username and password are required.")
             return
         
+        pool = get_pool()
+        try:
+            # The login session comes from the shared pool and goes back to it,
+            # so the main window starts with an open, authenticated connection
+            con = pool.acquire()
+        except mysql.connector.Error as e:
+            messagebox.showerror("Login Error", f"Failed to login: {str(e)}")
+            return
+        
+        discard = False
         try:
             # First check if user exists in Users table
-            con = mysql.connector.connect(
-                host=DB_CONFIG['host'],
-                user=DB_CONFIG['user'],
-                password=DB_CONFIG['password'],
-                database=DB_CONFIG['database'],
-                port=DB_CONFIG['port']
-            )
-            
             cursor = con.cursor(dictionary=True)
             # Query to check user credentials and get user_id
             query = "SELECT UserID, Username, Role FROM Users WHERE Username = %s AND PasswordHash = SHA2(%s, 256) AND Role = %s"
             cursor.execute(query, (username, password, 'Admin' if role == 'admin_user' else 'TicketClerk'))
             user = cursor.fetchone()
             cursor.close()
-            con.close()
             
-            if user:
-                self.authenticated = True
-                self.selected_role = role
-                self.user_id = user['UserID']
-                self.username = user['Username']  # Store the username
-                messagebox.showinfo("Login Success", f"Logged in as {user['Username']} ({user['Role']})")
-                self.destroy()  # Close login window
-            else:
-                # Try connecting with MySQL user
-                conn = mysql.connector.connect(
-                    host=DB_CONFIG['host'],
-                    user=role,
-                    password=password,
-                    database=DB_CONFIG['database'],
-                    port=DB_CONFIG['port']
-                )
-                
-                if conn.is_connected():
-                    conn.close()
-                    self.authenticated = True
-                    self.selected_role = role
-                    self.username = username  # Store the username for MySQL user
-                    messagebox.showinfo("Login Success", f"Logged in as {role}")
-                    self.destroy()  # Close login window
-                else:
-                    messagebox.showerror("Login Error", "Invalid username or password")
-                    
+            if not user:
+                # Check the password against the MySQL user of the role by
+                # re-authenticating the same connection, then switch it back:
+                # the application itself keeps running as DB_CONFIG['user']
+                try:
+                    con.cmd_change_user(username=role, password=password, database=DB_CONFIG['database'])
+                    con.cmd_change_user(username=DB_CONFIG['user'], password=DB_CONFIG['password'],
+                                        database=DB_CONFIG['database'])
+                except mysql.connector.Error:
+                    # A failed change of user leaves the session unusable
+                    discard = True
+                    raise
         except mysql.connector.Error as e:
+            pool.release(con, discard=discard or is_connection_lost(e))
             messagebox.showerror("Login Error", f"Failed to login: {str(e)}")
+            return
+        
+        pool.release(con)
+        
+        self.authenticated = True
+        self.selected_role = role
+        if user:
+            self.user_id = user['UserID']
+            self.username = user['Username']  # Store the username
+        else:
+            self.username = username  # Store the username for MySQL user
+        # Every pooled session now carries the user for the audit triggers
+        pool.set_identity(self.username)
+        
+        if user:
+            messagebox.showinfo("Login Success", f"Logged in as {user['Username']} ({user['Role']})")
+        else:
+            messagebox.showinfo("Login Success", f"Logged in as {role}")
+        self.destroy()  # Close login window
             
     def get_credentials(self):
         """Return the authentication result, selected role, user_id, and username"""
@@ -1,14 +1,9 @@
 import tkinter as tk
 from tkinter import ttk
-import matplotlib
-matplotlib.use('TkAgg')
-from matplotlib.figure import Figure
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import numpy as np
 import datetime
+import time
 import sys
 import os
-from tkcalendar import DateEntry
 from tkinter import messagebox
 
 # Add the parent directory to path
@@ -22,13 +17,19 @@ from gui.ticket_booking import TicketBookingFrame
 from gui.reports import ReportsFrame
 from gui.feedback_management import FeedbackManagementFrame
 from gui.ticket_history import TicketHistoryFrame
+from gui.background import get_tasks
+from gui.lazy_imports import chart_classes, date_entry_class
+from gui.change_feed import ChangeFeedPoller
+from models.events import event_bus, TICKET_BOOKED, TICKET_CANCELLED
 
 # Import models
-from models.report_model import ReportModel
+from models.report_model import ReportModel, REVENUE_PERIODS
 from models.screening_model import ScreeningModel
 
 class MainWindow(tk.Tk):
     def __init__(self, role='admin_user', user_id=None, username=None):
+        # Start of the time-to-first-paint measurement reported at launch
+        self.started_at = time.perf_counter()
         super().__init__()
         # Override OS DPI scaling (set scaling factor to 1.0)
         self.tk.call('tk', 'scaling', 1.0)
@@ -60,9 +61,14 @@ class MainWindow(tk.Tk):
         # Create the main layout
         self.setup_layout()
         
+        # Publishes other stations' bookings/cancellations on the event bus
+        self.change_feed = ChangeFeedPoller(self)
+        event_bus.subscribe(self.on_ticket_changes, (TICKET_BOOKED, TICKET_CANCELLED))
+        
         # Initialize frames
         self.frames = {}
         self.initialize_frames()
+        self.change_feed.start()
         
         # Process pending geometry events before showing dashboard
         self.update_idletasks()
@@ -80,6 +86,23 @@ class MainWindow(tk.Tk):
         # This triggers whenever window size changes
         if self.role == 'admin_user':
             self.bind("<Configure>", self.check_window_size)
+        
+        # The window's widgets get <Expose> once it is mapped on screen
+        self._first_expose = self.bind("<Expose>", self.on_first_expose, add="+")
+    
+    def on_first_expose(self, event=None):
+        if self._first_expose is None:
+            return
+        self.unbind("<Expose>", self._first_expose)
+        self._first_expose = None
+        # Tk redraws exposed widgets at idle time; report after those redraws
+        self.after_idle(self.report_first_paint)
+    
+    def report_first_paint(self):
+        """Print the time from creating the window to its first full paint"""
+        elapsed = (time.perf_counter() - self.started_at) * 1000
+        print(f"Main window first paint after {elapsed:.0f} ms "
+              f"({len(self.frames)} of {len(self.frame_classes)} frames built)")
 
     def check_window_size(self, event=None):
         """Check if window size has changed and correct it if needed"""
@@ -96,6 +119,21 @@ class MainWindow(tk.Tk):
             self.geometry(f"{self.target_width}x{self.target_height}")
             self.update_idletasks()
 
+    def destroy(self):
+        feed = getattr(self, "change_feed", None)
+        if feed is not None:
+            feed.stop()
+        # The event bus outlives the window; stop it calling into dead widgets
+        event_bus.unsubscribe(self.on_ticket_changes)
+        for frame in getattr(self, "frames", {}).values():
+            if hasattr(frame, "on_ticket_changes"):
+                event_bus.unsubscribe(frame.on_ticket_changes)
+        # Drop queued database work so worker threads do not outlive the window
+        tasks = getattr(self, "background_tasks", None)
+        if tasks is not None:
+            tasks.shutdown()
+        super().destroy()
+
     def get_role_display_name(self):
         """Convert role identifier to display name"""
         role_names = {
@@ -204,19 +242,25 @@ class MainWindow(tk.Tk):
         else:
             frame_classes = [FeedbackManagementFrame]
         
-        # Create the available frames
-        for F in frame_classes:
-            frame = F(self.container, self)
-            self.frames[F] = frame
-            frame.grid(row=0, column=0, sticky="nsew")
-        
-        # Add references so frames can access each other directly
-        for frame_class, frame in self.frames.items():
+        # Frames are built the first time they are shown (see get_frame), so
+        # screens the user never opens cost nothing at startup
+        self.frame_classes = frame_classes
+    
+    def get_frame(self, cont):
+        """Return the frame for a class, building it on first use"""
+        frame = self.frames.get(cont)
+        if frame is None:
+            started = time.perf_counter()
+            frame = cont(self.container, self)
+            self.frames[cont] = frame
+            # Add references so frames can access each other directly
             frame.all_frames = self.frames
+            print(f"Built {cont.__name__} in {(time.perf_counter() - started) * 1000:.0f} ms")
+        return frame
     
     def show_frame(self, cont):
         # Check if user has permission to access this frame
-        if cont not in self.frames:
+        if cont not in self.frame_classes:
             messagebox.showwarning("Access Denied", f"You don't have permission to access this feature.")
             return
             
@@ -228,15 +272,17 @@ class MainWindow(tk.Tk):
         for frame in self.frames.values():
             frame.grid_remove()
         
-        # Bring the selected frame to the top
-        frame = self.frames[cont]
+        # Bring the selected frame to the top; a new frame loads its own data
+        built = cont in self.frames
+        frame = self.get_frame(cont)
         frame.grid(row=0, column=0, sticky="nsew")
         
         # Store current frame reference for refresh operations
         self.current_frame = frame
         
-        # Refresh data in the frame if it has a refresh_data method
-        if hasattr(frame, 'refresh_data'):
+        # Refresh data in the frame if it has a refresh_data method; frames
+        # that track changes themselves only reload when marked stale
+        if built and hasattr(frame, 'refresh_data') and getattr(frame, 'stale', True):
             frame.refresh_data()
     
     def show_dashboard(self):
@@ -329,7 +375,8 @@ class MainWindow(tk.Tk):
         # Load filter options
         self.load_filter_options()
         
-        # Create figure for matplotlib
+        # Create figure for matplotlib (imported on first use)
+        Figure, FigureCanvasTkAgg = chart_classes()
         fig = Figure(figsize=(6, 4), dpi=100)
         self.occupancy_ax = fig.add_subplot(111)
         self.occupancy_ax.set_title('Theater Occupancy by Screening')
@@ -344,16 +391,28 @@ class MainWindow(tk.Tk):
     
     def load_filter_options(self):
         """Load options for room and movie filters"""
+        # Defaults until the options arrive from the worker thread
+        self.room_filter['values'] = ['All Rooms']
+        self.movie_filter['values'] = ['All Movies']
+        self.room_filter.current(0)
+        self.movie_filter.current(0)
+        
+        get_tasks(self).submit("dashboard.filters", self.fetch_filter_options, self.set_filter_options)
+    
+    def fetch_filter_options(self):
+        """Get room and movie data directly from db connector (runs off the Tk thread)"""
+        # Get all rooms
+        room_query = "SELECT RoomName FROM CinemaRooms ORDER BY RoomName"
+        rooms = self.screening_model.db.execute_query(room_query)
+        
+        # Get all active movies
+        movie_query = "SELECT DISTINCT MovieTitle FROM Movies JOIN Screenings ON Movies.MovieID = Screenings.MovieID ORDER BY MovieTitle"
+        movies = self.screening_model.db.execute_query(movie_query)
+        return rooms, movies
+    
+    def set_filter_options(self, data):
+        rooms, movies = data
         try:
-            # Get room and movie data directly from db connector
-            # Get all rooms
-            room_query = "SELECT RoomName FROM CinemaRooms ORDER BY RoomName"
-            rooms = self.screening_model.db.execute_query(room_query)
-            
-            # Get all active movies
-            movie_query = "SELECT DISTINCT MovieTitle FROM Movies JOIN Screenings ON Movies.MovieID = Screenings.MovieID ORDER BY MovieTitle"
-            movies = self.screening_model.db.execute_query(movie_query)
-            
             # Set combobox values
             if rooms:
                 self.room_filter['values'] = ['All Rooms'] + [room["RoomName"] for room in rooms]
@@ -388,24 +447,24 @@ class MainWindow(tk.Tk):
         
         # Date filter
         tk.Label(filter_frame, text="Date:").pack(side=tk.LEFT, padx=5)
-        self.revenue_date_picker = DateEntry(filter_frame, width=12, background='darkblue',
+        self.revenue_date_picker = date_entry_class()(filter_frame, width=12, background='darkblue',
                                         foreground='white', borderwidth=2, date_pattern='yyyy-mm-dd')
         self.revenue_date_picker.pack(side=tk.LEFT, padx=5)
         self.revenue_date_picker.set_date(datetime.date.today())
         
-        # Date range radio buttons
-        self.date_range_var = tk.StringVar(value="week")
-        tk.Radiobutton(filter_frame, text="Last 7 days", variable=self.date_range_var, 
-                      value="week").pack(side=tk.LEFT, padx=5)
-        tk.Radiobutton(filter_frame, text="Single day", variable=self.date_range_var, 
-                      value="day").pack(side=tk.LEFT, padx=5)
+        # Date range selection - every range costs a single grouped query
+        self.date_range_var = tk.StringVar(value="Last 7 days")
+        date_range_combo = ttk.Combobox(filter_frame, textvariable=self.date_range_var, width=13,
+                                        values=list(REVENUE_PERIODS) + ["Single day"], state="readonly")
+        date_range_combo.pack(side=tk.LEFT, padx=5)
         
         # Apply filter button
         apply_button = tk.Button(filter_frame, text="Apply", 
                               command=self.update_revenue_chart)
         apply_button.pack(side=tk.LEFT, padx=10)
         
-        # Create figure for matplotlib
+        # Create figure for matplotlib (imported on first use)
+        Figure, FigureCanvasTkAgg = chart_classes()
         fig = Figure(figsize=(6, 4), dpi=100)
         self.revenue_ax = fig.add_subplot(111)
         self.revenue_ax.set_title('Weekly Revenue')
@@ -423,6 +482,11 @@ class MainWindow(tk.Tk):
         self.update_occupancy_chart()
         self.update_revenue_chart()
     
+    def on_ticket_changes(self, events):
+        """Redraw the dashboard charts when tickets were sold or cancelled"""
+        if hasattr(self, 'dashboard_frame') and self.dashboard_frame.winfo_ismapped():
+            self.update_dashboard()
+    
     def refresh_visible_frames(self):
         """Refresh the currently visible frame"""
         try:
@@ -441,15 +505,8 @@ class MainWindow(tk.Tk):
                             print(f"Refreshing {frame.__class__.__name__}")
                             frame.refresh_data()
             
-            # Force UI update
-            self.update()
-            
         except Exception as e:
             print(f"Error during refresh: {e}")
-        
-        # Schedule next refresh
-        if hasattr(self, 'auto_refresh_interval'):
-            self.after(self.auto_refresh_interval, self.refresh_visible_frames)
     
     def force_global_refresh(self):
         """Force an immediate refresh of all UI elements"""
@@ -460,56 +517,50 @@ class MainWindow(tk.Tk):
         # Perform immediate refresh
         self.refresh_visible_frames()
     
-    def force_refresh_all(self):
-        """Force immediate refresh of all UI components by directly querying the database"""
-        print("Forcing complete refresh of all UI components")
-        
-        # Force refresh dashboard
-        if hasattr(self, 'update_dashboard'):
-            print("Refreshing dashboard")
-            self.update_dashboard()
-        
-        # Force refresh all frames
-        if hasattr(self, 'frames'):
-            for name, frame in self.frames.items():
-                if hasattr(frame, 'refresh_data'):
-                    print(f"Refreshing {name.__name__}")
-                    frame.refresh_data()
-    
     def update_occupancy_chart(self):
         # Get selected values from filters
         selected_room = self.room_filter.get()
         selected_movie = self.movie_filter.get()
         
-        try:
-            # Get real occupancy data from database based on filters
-            # Base query
-            query = """
-                SELECT m.MovieTitle, r.RoomName, s.ScreeningTime, s.ScreeningDate,
-                       fn_occupancy_rate(s.ScreeningID) AS OccupancyRate
-                FROM Screenings s
-                JOIN Movies m ON s.MovieID = m.MovieID
-                JOIN CinemaRooms r ON s.RoomID = r.RoomID
-                WHERE 1=1
-            """
-            
-            params = []
-            
-            # Add filters
-            if selected_room != 'All Rooms':
-                query += " AND r.RoomName = %s"
-                params.append(selected_room)
-                
-            if selected_movie != 'All Movies':
-                query += " AND m.MovieTitle = %s"
-                params.append(selected_movie)
-                
-            # Get recent screenings - limit results for readability
-            query += " ORDER BY s.ScreeningDate DESC, s.ScreeningTime DESC LIMIT 10"
+        # Query on a worker thread, draw when the rows arrive
+        get_tasks(self).submit(
+            "dashboard.occupancy",
+            lambda: self.fetch_occupancy(selected_room, selected_movie),
+            lambda screenings: self.draw_occupancy_chart(selected_room, selected_movie, screenings),
+            lambda e: self.show_chart_error(self.occupancy_ax, self.occupancy_canvas, e)
+        )
+    
+    def fetch_occupancy(self, selected_room, selected_movie):
+        """Get real occupancy data from database based on filters (runs off the Tk thread)"""
+        # Base query
+        query = """
+            SELECT m.MovieTitle, r.RoomName, s.ScreeningTime, s.ScreeningDate,
+                   ROUND(s.SoldSeats * 100 / r.Capacity, 2) AS OccupancyRate
+            FROM Screenings s
+            JOIN Movies m ON s.MovieID = m.MovieID
+            JOIN CinemaRooms r ON s.RoomID = r.RoomID
+            WHERE 1=1
+        """
+        
+        params = []
+        
+        # Add filters
+        if selected_room != 'All Rooms':
+            query += " AND r.RoomName = %s"
+            params.append(selected_room)
             
-            # Execute query using the db connector's execute_query method
-            screenings = self.screening_model.db.execute_query(query, params)
+        if selected_movie != 'All Movies':
+            query += " AND m.MovieTitle = %s"
+            params.append(selected_movie)
             
+        # Get recent screenings - limit results for readability
+        query += " ORDER BY s.ScreeningDate DESC, s.ScreeningTime DESC LIMIT 10"
+        
+        # Execute query using the db connector's execute_query method
+        return self.screening_model.db.execute_query(query, params)
+    
+    def draw_occupancy_chart(self, selected_room, selected_movie, screenings):
+        try:
             # Clear previous data
             self.occupancy_ax.clear()
             
@@ -575,13 +626,8 @@ class MainWindow(tk.Tk):
                 self.occupancy_ax.set_xticks([])
                 self.occupancy_ax.set_yticks([])
         except Exception as e:
-            print(f"Error loading occupancy data: {e}")
-            # Display error message in chart
-            self.occupancy_ax.clear()
-            self.occupancy_ax.text(0.5, 0.5, f'Error loading data:\n{str(e)}',
-                                  ha='center', va='center', fontsize=10, color='red')
-            self.occupancy_ax.set_xticks([])
-            self.occupancy_ax.set_yticks([])
+            self.show_chart_error(self.occupancy_ax, self.occupancy_canvas, e)
+            return
         
         # Adjust layout to prevent label cutoff
         self.occupancy_ax.figure.tight_layout()
@@ -590,18 +636,49 @@ class MainWindow(tk.Tk):
         # Draw the chart
         self.occupancy_canvas.draw()
     
+    def show_chart_error(self, ax, canvas, error):
+        """Replace a chart with an error message"""
+        print(f"Error loading chart data: {error}")
+        # Display error message in chart
+        ax.clear()
+        ax.text(0.5, 0.5, f'Error loading data:\n{str(error)}',
+                ha='center', va='center', fontsize=10, color='red')
+        ax.set_xticks([])
+        ax.set_yticks([])
+        canvas.draw()
+    
     def update_revenue_chart(self):
         # Get date range selection
         date_range = self.date_range_var.get()
         selected_date = self.revenue_date_picker.get_date()
         
+        # Query on a worker thread, draw when the data arrives
+        get_tasks(self).submit(
+            "dashboard.revenue",
+            lambda: self.fetch_revenue(date_range, selected_date),
+            lambda data: self.draw_revenue_chart(date_range, selected_date, data),
+            lambda e: self.show_chart_error(self.revenue_ax, self.revenue_canvas, e)
+        )
+    
+    def fetch_revenue(self, date_range, selected_date):
+        """Load the revenue for a single day or a series (runs off the Tk thread)"""
+        if date_range == "Single day":
+            # Get revenue for a single day
+            return self.report_model.get_daily_revenue(selected_date)
+        
+        # Get the whole range ending today from one grouped query
+        num_days, granularity = REVENUE_PERIODS[date_range]
+        today = datetime.date.today()
+        start = today - datetime.timedelta(days=num_days - 1)
+        return self.report_model.get_revenue_series(start, today, granularity)
+    
+    def draw_revenue_chart(self, date_range, selected_date, data):
         try:
             # Clear previous data
             self.revenue_ax.clear()
             
-            if date_range == "day":
-                # Get revenue for a single day
-                daily_revenue = self.report_model.get_daily_revenue(selected_date)
+            if date_range == "Single day":
+                daily_revenue = data
                 
                 if daily_revenue:
                     days = [selected_date.strftime('%Y-%m-%d')]
@@ -619,46 +696,41 @@ class MainWindow(tk.Tk):
                     self.revenue_ax.set_xticks([])
                     self.revenue_ax.set_yticks([])
             else:
-                # Get revenue for the last 7 days
-                today = datetime.date.today()
-                days = []
-                revenue_data = []
-                has_data = False
+                series = data
+                num_days, granularity = REVENUE_PERIODS[date_range]
                 
-                # Get revenue for the last 7 days
-                for i in range(6, -1, -1):
-                    date = today - datetime.timedelta(days=i)
-                    days.append(date.strftime('%a'))  # Day abbreviation
-                    daily_revenue = self.report_model.get_daily_revenue(date)
-                    amount = float(daily_revenue) if daily_revenue else 0
-                    revenue_data.append(amount)
-                    if amount > 0:
-                        has_data = True
+                if granularity == "month":
+                    label_format = '%b %y'
+                elif num_days <= 7:
+                    label_format = '%a'  # Day abbreviation
+                else:
+                    label_format = '%m-%d'
+                days = [point["PeriodStart"].strftime(label_format) for point in series]
+                revenue_data = [point["Revenue"] for point in series]
+                has_data = any(amount > 0 for amount in revenue_data)
                 
                 if has_data:
-                    # Create line chart for weekly data
+                    # Create line chart for the range
                     self.revenue_ax.plot(range(len(days)), revenue_data, marker='o', 
                                        linestyle='-', linewidth=2, color='green')
-                    self.revenue_ax.set_title('Weekly Revenue ($)')
-                    self.revenue_ax.set_xticks(range(len(days)))
-                    self.revenue_ax.set_xticklabels(days)
+                    self.revenue_ax.set_title(f'{date_range} Revenue ($)')
+                    
+                    # Thin out the tick labels so long ranges stay readable
+                    step = max(1, len(days) // 10)
+                    self.revenue_ax.set_xticks(range(0, len(days), step))
+                    self.revenue_ax.set_xticklabels(days[::step], rotation=45 if step > 1 else 0)
                     self.revenue_ax.set_ylabel('Revenue ($)')
                     self.revenue_ax.yaxis.grid(True, linestyle='--', alpha=0.7)
                 else:
-                    # No revenue data for the week
-                    self.revenue_ax.text(0.5, 0.5, 'No revenue data available for the past week',
+                    # No revenue data for the range
+                    self.revenue_ax.text(0.5, 0.5, f'No revenue data available for the {date_range.lower()}',
                                        ha='center', va='center', fontsize=12)
                     self.revenue_ax.set_xticks([])
                     self.revenue_ax.set_yticks([])
                 
         except Exception as e:
-            print(f"Error loading revenue data: {e}")
-            # Display error message in chart
-            self.revenue_ax.clear()
-            self.revenue_ax.text(0.5, 0.5, f'Error loading data:\n{str(e)}',
-                               ha='center', va='center', fontsize=10, color='red')
-            self.revenue_ax.set_xticks([])
-            self.revenue_ax.set_yticks([])
+            self.show_chart_error(self.revenue_ax, self.revenue_canvas, e)
+            return
         
         # Draw the chart
         self.revenue_canvas.draw()
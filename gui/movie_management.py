@@ -7,6 +7,7 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from models.movie_model import MovieModel
 from models.feedback_model import FeedbackModel
+from gui.background import get_tasks
 
 class MovieManagementFrame(tk.Frame):
     def __init__(self, parent, controller):
@@ -87,16 +88,29 @@ class MovieManagementFrame(tk.Frame):
         self.movie_tree.bind("<<TreeviewSelect>>", self.on_movie_select)
         
     def refresh_data(self):
+        # Query on a worker thread; the list is filled when the rows arrive
+        get_tasks(self).submit("movies.list", self.fetch_movies, self.show_movies)
+        
+    def fetch_movies(self):
+        """Load movies with their ratings and the genre list (runs off the Tk thread)"""
+        movies = self.movie_model.get_all_movies() or []
+        ratings = {}
+        for movie in movies:
+            # Get movie rating
+            rating_info = self.feedback_model.get_average_rating_by_movie(movie["MovieID"])
+            ratings[movie["MovieID"]] = rating_info["AverageRating"] if rating_info else None
+        genres = self.movie_model.get_all_genres() or []
+        return movies, ratings, genres
+        
+    def show_movies(self, data):
+        movies, ratings, genres = data
+        
         # Clear existing data
         for i in self.movie_tree.get_children():
             self.movie_tree.delete(i)
             
-        # Load movies
-        movies = self.movie_model.get_all_movies()
         for movie in movies:
-            # Get movie rating
-            rating_info = self.feedback_model.get_average_rating_by_movie(movie["MovieID"])
-            avg_rating = rating_info["AverageRating"]
+            avg_rating = ratings.get(movie["MovieID"])
             rating_display = f"{avg_rating:.1f} ★" if avg_rating else "No ratings"
             
             self.movie_tree.insert("", "end", values=(
@@ -108,7 +122,6 @@ class MovieManagementFrame(tk.Frame):
             ))
             
         # Load genres
-        genres = self.movie_model.get_all_genres()
         self.genre_combo["values"] = [g["GenreName"] for g in genres]
         
         # Clear form
@@ -123,7 +136,10 @@ class MovieManagementFrame(tk.Frame):
         movie_id = self.movie_tree.item(selected_items[0])["values"][0]
         
         # Get movie details
-        movie = self.movie_model.get_movie(movie_id)
+        get_tasks(self).submit("movies.detail", lambda: self.movie_model.get_movie(movie_id),
+                               self.show_movie)
+        
+    def show_movie(self, movie):
         if movie:
             self.title_var.set(movie["MovieTitle"])
             self.genre_var.set(movie["GenreName"] if movie["GenreName"] else "")
@@ -155,26 +171,35 @@ class MovieManagementFrame(tk.Frame):
             messagebox.showerror("Validation Error", "Title is required")
             return
             
-        # Get genre ID
-        genre_id = None
-        genres = self.movie_model.get_all_genres()
-        for g in genres:
-            if g["GenreName"] == genre_name:
-                genre_id = g["GenreID"]
-                break
+        movie_id = self.current_id
+        
+        def save():
+            # Get genre ID
+            genre_id = None
+            genres = self.movie_model.get_all_genres() or []
+            for g in genres:
+                if g["GenreName"] == genre_name:
+                    genre_id = g["GenreID"]
+                    break
+                    
+            # If genre doesn't exist, create it
+            if genre_name and not genre_id:
+                genre_id = self.movie_model.add_genre(genre_name)
                 
-        # If genre doesn't exist, create it
-        if genre_name and not genre_id:
-            genre_id = self.movie_model.add_genre(genre_name)
-            
-        # Save or update movie
-        if self.current_id:
-            self.movie_model.update_movie(self.current_id, title, genre_id, duration)
-            messagebox.showinfo("Success", "Movie updated successfully")
-        else:
-            self.movie_model.add_movie(title, genre_id, duration)
-            messagebox.showinfo("Success", "Movie added successfully")
-            
+            # Save or update movie
+            if movie_id:
+                self.movie_model.update_movie(movie_id, title, genre_id, duration)
+            else:
+                self.movie_model.add_movie(title, genre_id, duration)
+        
+        # The genre lookup and the write run on a worker thread
+        message = "Movie updated successfully" if movie_id else "Movie added successfully"
+        get_tasks(self).submit("movies.save", save, lambda result: self.on_movie_saved(message),
+                               lambda e: messagebox.showerror("Error", f"Failed to save movie: {e}"))
+    
+    def on_movie_saved(self, message):
+        messagebox.showinfo("Success", message)
+        
         # Refresh the data
         self.refresh_data()
         
@@ -195,6 +220,11 @@ class MovieManagementFrame(tk.Frame):
             return
             
         if messagebox.askyesno("Confirm Delete", "Are you sure you want to delete this movie?"):
-            self.movie_model.delete_movie(self.current_id)
-            messagebox.showinfo("Success", "Movie deleted successfully")
-            self.refresh_data()
+            movie_id = self.current_id
+            get_tasks(self).submit("movies.delete", lambda: self.movie_model.delete_movie(movie_id),
+                                   self.on_movie_deleted,
+                                   lambda e: messagebox.showerror("Error", f"Failed to delete movie: {e}"))
+    
+    def on_movie_deleted(self, result):
+        messagebox.showinfo("Success", "Movie deleted successfully")
+        self.refresh_data()
@@ -1,16 +1,17 @@
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
 import datetime
-from tkcalendar import DateEntry
 import sys
 import os
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from models.report_model import ReportModel
+from models.report_model import ReportModel, REVENUE_PERIODS
 from models.movie_model import MovieModel
+from gui.background import get_tasks
+from gui.lazy_imports import chart_classes, date_entry_class, pyplot
+from models.events import event_bus, TICKET_BOOKED, TICKET_CANCELLED
+from gui.tree_binding import TreeBinding
 
 class ReportsFrame(tk.Frame):
     def __init__(self, parent, controller):
@@ -25,6 +26,9 @@ class ReportsFrame(tk.Frame):
         # Load initial data
         self.refresh_data()
         
+        # Follow bookings and cancellations made here or at any other station
+        event_bus.subscribe(self.on_ticket_changes, (TICKET_BOOKED, TICKET_CANCELLED))
+        
     def create_widgets(self):
         # Create notebook for tabs
         self.notebook = ttk.Notebook(self)
@@ -50,11 +54,19 @@ class ReportsFrame(tk.Frame):
         date_frame.pack(fill="x", padx=10, pady=10)
         
         tk.Label(date_frame, text="Select Date:").pack(side="left", padx=5, pady=5)
-        self.revenue_date_picker = DateEntry(date_frame, width=12, background='darkblue',
+        self.revenue_date_picker = date_entry_class()(date_frame, width=12, background='darkblue',
                                           foreground='white', borderwidth=2, date_pattern='yyyy-mm-dd')
         self.revenue_date_picker.pack(side="left", padx=5, pady=5)
         self.revenue_date_picker.set_date(datetime.date.today())
         
+        # Period ending at the selected date; any length costs one grouped query
+        tk.Label(date_frame, text="Period:").pack(side="left", padx=5, pady=5)
+        self.revenue_period_var = tk.StringVar(value="Selected day")
+        period_combo = ttk.Combobox(date_frame, textvariable=self.revenue_period_var, width=13,
+                                    values=["Selected day"] + list(REVENUE_PERIODS), state="readonly")
+        period_combo.pack(side="left", padx=5, pady=5)
+        period_combo.bind("<<ComboboxSelected>>", lambda e: self.generate_revenue_report())
+        
         generate_button = tk.Button(date_frame, text="Generate Report", command=self.generate_revenue_report)
         generate_button.pack(side="left", padx=5, pady=5)
         
@@ -64,6 +76,10 @@ class ReportsFrame(tk.Frame):
                                      command=self.force_refresh_revenue)
         manual_refresh_btn.pack(side="left", padx=5, pady=5)
         
+        # Recompute all reporting rollups from ticket history
+        self.rebuild_button = tk.Button(date_frame, text="Rebuild Rollups", command=self.rebuild_rollups)
+        self.rebuild_button.pack(side="left", padx=5, pady=5)
+        
         # Revenue display frame
         revenue_display_frame = tk.Frame(self.revenue_tab)
         revenue_display_frame.pack(fill="both", expand=True, padx=10, pady=10)
@@ -92,35 +108,48 @@ class ReportsFrame(tk.Frame):
         
         self.revenue_tree.pack(fill="both", expand=True, padx=5, pady=5)
         
+        # Revenue per day/week/month for the selected period
+        tk.Label(revenue_display_frame, text="Revenue by period:").pack(anchor="w")
+        
+        self.revenue_series_tree = ttk.Treeview(revenue_display_frame, columns=("Period", "Revenue"),
+                                              show="headings", height=6)
+        self.revenue_series_tree.heading("Period", text="Period Starting")
+        self.revenue_series_tree.heading("Revenue", text="Revenue")
+        
+        self.revenue_series_tree.column("Period", width=150, anchor="center")
+        self.revenue_series_tree.column("Revenue", width=100, anchor="center")
+        
+        self.revenue_series_tree.pack(fill="both", expand=True, padx=5, pady=5)
+        
     def force_refresh_revenue(self):
         """Force refresh of revenue data directly from database"""
         print("Manual refresh triggered in Revenue tab")
         
-        # Force database refresh
-        selected_date = self.revenue_date_picker.get_date()
-        
-        # Use direct SQL query for revenue
-        daily_revenue = 0.0
-        try:
-            # Connect directly to database if possible
-            if hasattr(self.report_model, 'db'):
-                result = self.report_model.db.execute_query(
-                    "SELECT fn_total_revenue_by_date(%s) AS Revenue",
-                    [selected_date]
-                )
-                if result and len(result) > 0:
-                    daily_revenue = float(result[0]["Revenue"] or 0)
-        except Exception as e:
-            print(f"Error getting revenue: {e}")
-            # Fallback to model
-            daily_revenue = self.report_model.get_daily_revenue(selected_date)
-        
-        self.revenue_label.config(text=f"Total Revenue for {selected_date}: ${daily_revenue:.2f}")
-        
-        # Generate the full report
+        # Every read uses a fresh pooled autocommit session, so regenerating is enough
         self.generate_revenue_report()
         
+    def rebuild_rollups(self):
+        """Rebuild the reporting rollup tables in bulk and reload every tab"""
+        # The rebuild scans all ticket history, so run it off the Tk thread
+        self.rebuild_button["state"] = "disabled"
+        get_tasks(self).submit("reports.rebuild", self.report_model.rebuild_rollups, self.on_rollups_rebuilt)
+        
+    def on_rollups_rebuilt(self, success):
+        self.rebuild_button["state"] = "normal"
+        if success:
+            messagebox.showinfo("Success", "Report rollups rebuilt from ticket history")
+            self.refresh_data()
+        else:
+            messagebox.showerror("Error", "Failed to rebuild report rollups")
+        
     def setup_occupancy_tab(self):
+        # Export controls
+        occupancy_controls = tk.Frame(self.occupancy_tab)
+        occupancy_controls.pack(fill="x", padx=10, pady=(10, 0))
+        
+        self.export_button = tk.Button(occupancy_controls, text="Export CSV", command=self.export_occupancy)
+        self.export_button.pack(side="left")
+        
         # Frame for occupancy data
         occupancy_frame = tk.Frame(self.occupancy_tab)
         occupancy_frame.pack(fill="both", expand=True, padx=10, pady=10)
@@ -149,6 +178,10 @@ class ReportsFrame(tk.Frame):
         scrollbar.pack(side="right", fill="y")
         self.occupancy_tree.configure(yscrollcommand=scrollbar.set)
         
+        # Rows are keyed by ScreeningID so refreshes only apply changes
+        self.occupancy_rows = TreeBinding(self.occupancy_tree, lambda d: d["ScreeningID"], self.occupancy_values)
+        self.occupancy_chart_data = None
+        
         # Frame for chart
         self.chart_frame = tk.Frame(self.occupancy_tab)
         self.chart_frame.pack(fill="both", expand=True, padx=10, pady=10)
@@ -185,42 +218,51 @@ class ReportsFrame(tk.Frame):
         self.generate_revenue_report()
         self.load_occupancy_data()
         self.load_popular_movies()
-        
-        # Schedule automatic refresh every 60 seconds if needed
-        if hasattr(self, 'auto_refresh') and self.auto_refresh:
-            self.after(60000, self.refresh_data)
+    
+    def on_ticket_changes(self, events):
+        # Sales and cancellations move revenue, occupancy and popularity
+        if self.winfo_ismapped():
+            self.refresh_data()
         
     def generate_revenue_report(self):
-        # First, explicitly clear any database connection caches
-        self.report_model.db.connection.commit()  # Commit any pending transactions
-        
         selected_date = self.revenue_date_picker.get_date()
-        
-        # Get daily revenue - force direct database query
-        query = "SELECT fn_total_revenue_by_date(%s) AS Revenue"
-        result = self.report_model.db.execute_query(query, [selected_date])
-        daily_revenue = float(result[0]["Revenue"]) if result and result[0]["Revenue"] else 0.0
-        
-        self.revenue_label.config(text=f"Total Revenue for {selected_date}: ${daily_revenue:.2f}")
+        period = self.revenue_period_var.get()
+        
+        # Revenue for the whole period comes from a single grouped query
+        if period in REVENUE_PERIODS:
+            num_days, granularity = REVENUE_PERIODS[period]
+        else:
+            num_days, granularity = 1, "day"
+        start = selected_date - datetime.timedelta(days=num_days - 1)
+        
+        def fetch():
+            return (self.report_model.get_revenue_series(start, selected_date, granularity),
+                    self.report_model.get_screening_revenue(selected_date))
+        
+        get_tasks(self).submit("reports.revenue", fetch,
+                               lambda data: self.show_revenue_report(selected_date, start, num_days, *data))
+        
+    def show_revenue_report(self, selected_date, start, num_days, series, screenings):
+        total_revenue = sum(point["Revenue"] for point in series)
+        
+        if num_days == 1:
+            self.revenue_label.config(text=f"Total Revenue for {selected_date}: ${total_revenue:.2f}")
+        else:
+            self.revenue_label.config(text=f"Total Revenue {start} to {selected_date}: ${total_revenue:.2f}")
+        
+        for i in self.revenue_series_tree.get_children():
+            self.revenue_series_tree.delete(i)
+        for point in series:
+            self.revenue_series_tree.insert("", "end", values=(
+                point["PeriodStart"],
+                f"${point['Revenue']:.2f}"
+            ))
         
         # Clear existing data
         for i in self.revenue_tree.get_children():
             self.revenue_tree.delete(i)
             
-        # Use direct query for fresh data
-        screening_query = """
-            SELECT 
-                s.ScreeningID,
-                m.MovieTitle,
-                s.ScreeningTime,
-                (SELECT COUNT(*) FROM Tickets t WHERE t.ScreeningID = s.ScreeningID) AS TicketCount,
-                (SELECT COUNT(*) FROM Tickets t WHERE t.ScreeningID = s.ScreeningID) * 10.00 AS Revenue
-            FROM Screenings s
-            JOIN Movies m ON s.MovieID = m.MovieID
-            WHERE s.ScreeningDate = %s
-        """
-        screenings = self.report_model.db.execute_query(screening_query, [selected_date])
-        
+        # Per-screening totals come from the maintained sold-seat counters
         # Populate treeview with fresh data
         for screening in screenings:
             self.revenue_tree.insert("", "end", values=(
@@ -232,34 +274,54 @@ class ReportsFrame(tk.Frame):
             ))
         
     def load_occupancy_data(self):
-        # Clear existing data
-        for i in self.occupancy_tree.get_children():
-            self.occupancy_tree.delete(i)
-            
-        # Load occupancy rates for screenings
-        occupancy_rates = self.report_model.get_occupancy_rates()
+        # Load occupancy rates for screenings on a worker thread
+        get_tasks(self).submit("reports.occupancy", self.report_model.get_occupancy_rates,
+                               self.show_occupancy_data)
+        
+    def occupancy_values(self, data):
+        return (
+            data["ScreeningID"],
+            data["MovieTitle"],
+            data["RoomName"],
+            data["ScreeningDate"],
+            data["ScreeningTime"],
+            f"{float(data['OccupancyRate']):.2f}%"
+        )
+        
+    def show_occupancy_data(self, occupancy_rates):
+        occupancy_rates = occupancy_rates or []
+        
+        # Apply only the inserts, updates and deletes
+        self.occupancy_rows.sync(occupancy_rates)
+        
+        # Collect data for chart (limit to first 10 for readability)
+        movie_names = [f"{data['MovieTitle']} ({data['ScreeningDate']})" for data in occupancy_rates[:10]]
+        occupancy_values = [float(data['OccupancyRate']) for data in occupancy_rates[:10]]
+        
+        # Only rebuild the chart when the charted screenings changed
+        chart_data = (movie_names, occupancy_values)
+        if chart_data != self.occupancy_chart_data:
+            self.occupancy_chart_data = chart_data
+            self.create_occupancy_chart(movie_names, occupancy_values)
+        
+    def export_occupancy(self):
+        """Stream occupancy for every screening into a CSV file"""
+        path = filedialog.asksaveasfilename(defaultextension=".csv", 
+                                            filetypes=[("CSV files", "*.csv")],
+                                            initialfile="occupancy.csv")
+        if not path:
+            return
         
-        # Data for chart
-        movie_names = []
-        occupancy_values = []
-        
-        for data in occupancy_rates:
-            self.occupancy_tree.insert("", "end", values=(
-                data["ScreeningID"],
-                data["MovieTitle"],
-                data["RoomName"],
-                data["ScreeningDate"],
-                data["ScreeningTime"],
-                f"{float(data['OccupancyRate']):.2f}%"
-            ))
-            
-            # Collect data for chart (limit to first 10 for readability)
-            if len(movie_names) < 10:
-                movie_names.append(f"{data['MovieTitle']} ({data['ScreeningDate']})")
-                occupancy_values.append(float(data['OccupancyRate']))
+        self.export_button["state"] = "disabled"
+        get_tasks(self).submit("reports.export", lambda: self.report_model.export_occupancy_csv(path),
+                               lambda count: self.on_occupancy_exported(path, count))
         
-        # Create chart
-        self.create_occupancy_chart(movie_names, occupancy_values)
+    def on_occupancy_exported(self, path, count):
+        self.export_button["state"] = "normal"
+        if count is None:
+            messagebox.showerror("Error", "Failed to export occupancy data")
+        else:
+            messagebox.showinfo("Export Complete", f"Exported {count} screenings to {path}")
         
     def create_occupancy_chart(self, labels, values):
         # Clear previous chart
@@ -269,7 +331,9 @@ class ReportsFrame(tk.Frame):
         if not labels:
             return
         
-        # Create figure and axes
+        # Create figure and axes (matplotlib is imported on first use)
+        plt = pyplot()
+        FigureCanvasTkAgg = chart_classes()[1]
         fig, ax = plt.subplots(figsize=(10, 6))
         
         # Create bar chart
@@ -301,18 +365,21 @@ class ReportsFrame(tk.Frame):
         canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
         
     def load_popular_movies(self):
+        # Load popular movies on a worker thread
+        get_tasks(self).submit("reports.popular", self.report_model.get_popular_movies,
+                               self.show_popular_movies)
+        
+    def show_popular_movies(self, popular_movies):
         # Clear existing data
         for i in self.movies_tree.get_children():
             self.movies_tree.delete(i)
             
-        # Load popular movies
-        popular_movies = self.report_model.get_popular_movies()
         
         # Data for chart
         movie_names = []
         ticket_counts = []
         
-        for movie in popular_movies:
+        for movie in popular_movies or []:
             self.movies_tree.insert("", "end", values=(
                 movie["MovieID"],
                 movie["MovieTitle"],
@@ -335,7 +402,9 @@ class ReportsFrame(tk.Frame):
         if not labels:
             return
         
-        # Create figure and axes
+        # Create figure and axes (matplotlib is imported on first use)
+        plt = pyplot()
+        FigureCanvasTkAgg = chart_classes()[1]
         fig, ax = plt.subplots(figsize=(10, 6))
         
         # Create pie chart
@@ -1,7 +1,6 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 import datetime
-from tkcalendar import DateEntry
 import sys
 import os
 
@@ -10,6 +9,9 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from models.screening_model import ScreeningModel
 from models.movie_model import MovieModel
 from models.cinema_room_model import CinemaRoomModel
+from gui.background import get_tasks
+from gui.tree_binding import TreeBinding
+from gui.lazy_imports import date_entry_class
 
 class ScreeningManagementFrame(tk.Frame):
     def __init__(self, parent, controller):
@@ -70,7 +72,7 @@ class ScreeningManagementFrame(tk.Frame):
         self.room_combo.grid(row=1, column=1, padx=5, pady=5)
         
         tk.Label(details_frame, text="Date:").grid(row=2, column=0, sticky="w", padx=5, pady=5)
-        self.date_picker = DateEntry(details_frame, width=23, background='darkblue',
+        self.date_picker = date_entry_class()(details_frame, width=23, background='darkblue',
                                    foreground='white', borderwidth=2, date_pattern='yyyy-mm-dd')
         self.date_picker.grid(row=2, column=1, padx=5, pady=5)
         
@@ -96,6 +98,10 @@ class ScreeningManagementFrame(tk.Frame):
         self.refresh_button = tk.Button(button_frame, text="Refresh", command=self.refresh_data)
         self.refresh_button.grid(row=0, column=3, padx=5)
         
+        # Recount the maintained occupancy counters from Tickets
+        self.rebuild_button = tk.Button(button_frame, text="Rebuild Occupancy", command=self.rebuild_occupancy)
+        self.rebuild_button.grid(row=1, column=0, columnspan=4, pady=(5, 0))
+        
         # Configure grid weights
         self.grid_rowconfigure(1, weight=1)
         self.grid_columnconfigure(0, weight=1)
@@ -103,35 +109,45 @@ class ScreeningManagementFrame(tk.Frame):
         # Bind treeview selection
         self.screening_tree.bind("<<TreeviewSelect>>", self.on_screening_select)
         
+        # Rows are keyed by ScreeningID so refreshes only apply changes
+        self.screening_rows = TreeBinding(self.screening_tree, lambda s: s["ScreeningID"], self.screening_values)
+        
     def refresh_data(self):
-        # Clear existing data
-        for i in self.screening_tree.get_children():
-            self.screening_tree.delete(i)
-            
-        # Load screenings
-        screenings = self.screening_model.get_all_screenings()
-        for screening in screenings:
-            self.screening_tree.insert("", "end", values=(
-                screening["ScreeningID"],
-                screening["MovieTitle"],
-                screening["RoomName"],
-                screening["ScreeningDate"],
-                screening["ScreeningTime"],
-                f"{float(screening['OccupancyRate']):.2f}%"
-            ))
+        # Query on a worker thread; the list is filled when the rows arrive
+        get_tasks(self).submit("screenings.list", self.fetch_screenings, self.show_screenings)
+        
+    def fetch_screenings(self):
+        """Load screenings plus the movie and room dropdowns (runs off the Tk thread)"""
+        return (self.screening_model.get_all_screenings() or [],
+                self.movie_model.get_all_movies() or [],
+                self.room_model.get_all_rooms() or [])
+        
+    def show_screenings(self, data):
+        screenings, movies, rooms = data
+        
+        # Apply only the inserts, updates and deletes
+        self.screening_rows.sync(screenings)
             
         # Load movies and rooms for dropdowns
-        movies = self.movie_model.get_all_movies()
         self.movie_combo["values"] = [movie["MovieTitle"] for movie in movies]
         self.movies_data = {movie["MovieTitle"]: movie["MovieID"] for movie in movies}
         
-        rooms = self.room_model.get_all_rooms()
         self.room_combo["values"] = [room["RoomName"] for room in rooms]
         self.rooms_data = {room["RoomName"]: room["RoomID"] for room in rooms}
         
         # Clear form
         self.clear_form()
         
+    def screening_values(self, screening):
+        return (
+            screening["ScreeningID"],
+            screening["MovieTitle"],
+            screening["RoomName"],
+            screening["ScreeningDate"],
+            screening["ScreeningTime"],
+            f"{float(screening['OccupancyRate']):.2f}%"
+        )
+        
     def on_screening_select(self, event):
         selected_items = self.screening_tree.selection()
         if not selected_items:
@@ -141,7 +157,10 @@ class ScreeningManagementFrame(tk.Frame):
         screening_id = self.screening_tree.item(selected_items[0])["values"][0]
         
         # Get screening details
-        screening = self.screening_model.get_screening(screening_id)
+        get_tasks(self).submit("screenings.detail", lambda: self.screening_model.get_screening(screening_id),
+                               self.show_screening)
+    
+    def show_screening(self, screening):
         if screening:
             movie_title = self.get_movie_title_by_id(screening["MovieID"])
             room_name = self.get_room_name_by_id(screening["RoomID"])
@@ -217,28 +236,65 @@ class ScreeningManagementFrame(tk.Frame):
             messagebox.showerror("Validation Error", "Time must be in format HH:MM")
             return
             
-        # Save or update screening
-        if self.current_id:
-            self.screening_model.update_screening(
-                self.current_id, movie_id, room_id, 
-                screening_date, screening_time
-            )
-            messagebox.showinfo("Success", "Screening updated successfully")
-        else:
-            self.screening_model.add_screening(
-                movie_id, room_id, screening_date, screening_time
-            )
-            messagebox.showinfo("Success", "Screening added successfully")
-            
+        # Save or update screening on a worker thread
+        screening_id = self.current_id
+        
+        def save():
+            if screening_id:
+                self.screening_model.update_screening(
+                    screening_id, movie_id, room_id, 
+                    screening_date, screening_time
+                )
+            else:
+                self.screening_model.add_screening(
+                    movie_id, room_id, screening_date, screening_time
+                )
+        
+        message = "Screening updated successfully" if screening_id else "Screening added successfully"
+        get_tasks(self).submit("screenings.save", save, lambda result: self.on_screening_saved(message),
+                               lambda e: messagebox.showerror("Error", f"Failed to save screening: {e}"))
+    
+    def on_screening_saved(self, message):
+        messagebox.showinfo("Success", message)
+        
         # Refresh the data
         self.refresh_data()
         
+    def rebuild_occupancy(self):
+        # The rebuild scans every ticket, keep the window responsive meanwhile
+        self.rebuild_button["state"] = "disabled"
+        get_tasks(self).submit("screenings.rebuild", self.screening_model.rebuild_occupancy_counters,
+                               self.on_occupancy_rebuilt)
+        
+    def on_occupancy_rebuilt(self, success):
+        self.rebuild_button["state"] = "normal"
+        if success:
+            messagebox.showinfo("Success", "Occupancy counters and report rollups rebuilt from tickets")
+            self.refresh_data()
+        else:
+            messagebox.showerror("Error", "Failed to rebuild occupancy counters and rollups")
+        
     def delete_screening(self):
-        if not self.current_id:
+        # Every selected row is deleted in one batch
+        screening_ids = [self.screening_tree.item(item)["values"][0] 
+                         for item in self.screening_tree.selection()]
+        if not screening_ids and self.current_id:
+            screening_ids = [self.current_id]
+        if not screening_ids:
             messagebox.showinfo("Info", "Please select a screening to delete")
             return
             
-        if messagebox.askyesno("Confirm Delete", "Are you sure you want to delete this screening?"):
-            self.screening_model.delete_screening(self.current_id)
-            messagebox.showinfo("Success", "Screening deleted successfully")
-            self.refresh_data()
+        prompt = "Are you sure you want to delete this screening?" if len(screening_ids) == 1 \
+            else f"Are you sure you want to delete {len(screening_ids)} screenings?"
+        if messagebox.askyesno("Confirm Delete", prompt):
+            get_tasks(self).submit("screenings.delete",
+                                   lambda: self.screening_model.delete_screenings(screening_ids),
+                                   lambda success: self.on_screenings_deleted(success, len(screening_ids)))
+    
+    def on_screenings_deleted(self, success, count):
+        if not success:
+            messagebox.showerror("Error", "Failed to delete screenings")
+        else:
+            messagebox.showinfo("Success", "Screening deleted successfully" if count == 1 
+                                else f"{count} screenings deleted successfully")
+        self.refresh_data()
@@ -0,0 +1,148 @@
+import tkinter as tk
+
+class SeatCanvas(tk.Canvas):
+    """Seat map drawn on a single Canvas
+
+    The seats are drawn once per room geometry (set_layout) and kept; after
+    that set_occupied() and selection changes only recolour the seats whose
+    state changed. Clicking a free seat selects it (adds it to the selection
+    with multiple=True) and clicking it again deselects it. on_select(seats)
+    is called with the selected seat ids whenever a click changes them, or
+    when selected seats are taken by someone else.
+    """
+
+    COLOURS = {"free": "green", "occupied": "red", "held": "orange", "selected": "blue"}
+    SEAT_SIZE = 26
+    GAP = 4
+    AISLE = 14
+    MARGIN = 24
+
+    def __init__(self, parent, on_select=None, multiple=False, **kwargs):
+        super().__init__(parent, highlightthickness=0, **kwargs)
+        self.on_select = on_select
+        self.multiple = multiple
+        self.geometry = None
+        self.items = {}        # seat_id -> (rectangle, label) canvas items
+        self.seat_ids = {}     # canvas item -> seat_id
+        self.states = {}       # seat_id -> state last drawn
+        self.selected_seats = []  # in the order they were picked
+
+        self.tag_bind("seat", "<Button-1>", self.on_click)
+
+    def set_layout(self, rows, seats_per_row, aisles=(), last_row_seats=None):
+        """Draw the seats for a room; does nothing if the geometry is unchanged
+
+        aisles are the seat numbers after which a gap is left in every row;
+        the last row stops after last_row_seats seats (a full row by default).
+        """
+        last_row_seats = last_row_seats or seats_per_row
+        geometry = (tuple(rows), seats_per_row, tuple(aisles), last_row_seats)
+        if geometry == self.geometry:
+            return
+        self.clear()
+        self.geometry = geometry
+
+        step = self.SEAT_SIZE + self.GAP
+        # x offset of each seat, widened after every aisle
+        offsets = {}
+        x = self.MARGIN
+        for col in range(1, seats_per_row + 1):
+            offsets[col] = x
+            x += step + (self.AISLE if col in aisles else 0)
+        width = x
+        self.create_rectangle(self.MARGIN, 4, width, 20, fill="lightgray", outline="")
+        self.create_text((self.MARGIN + width) / 2, 12, text="SCREEN")
+
+        for r, row in enumerate(rows):
+            y = 30 + r * step
+            self.create_text(self.MARGIN / 2, y + self.SEAT_SIZE / 2, text=row)
+            seats_in_row = last_row_seats if r == len(rows) - 1 else seats_per_row
+            for col in range(1, seats_in_row + 1):
+                seat_id = f"{row}{col}"
+                x = offsets[col]
+                rect = self.create_rectangle(x, y, x + self.SEAT_SIZE, y + self.SEAT_SIZE,
+                                             fill=self.COLOURS["free"], outline="black",
+                                             tags=("seat",))
+                label = self.create_text(x + self.SEAT_SIZE / 2, y + self.SEAT_SIZE / 2,
+                                         text=seat_id, fill="white", font=("Helvetica", 7),
+                                         tags=("seat",))
+                self.items[seat_id] = (rect, label)
+                self.seat_ids[rect] = seat_id
+                self.seat_ids[label] = seat_id
+                self.states[seat_id] = "free"
+
+        self.configure(width=width + self.GAP, height=30 + len(rows) * step)
+
+    def clear(self):
+        """Remove every seat (no screening selected)"""
+        self.delete("all")
+        self.geometry = None
+        self.items = {}
+        self.seat_ids = {}
+        self.states = {}
+        self.selected_seats = []
+
+    def set_occupied(self, occupied_seats, held_seats=()):
+        """Mark exactly occupied_seats as sold and held_seats as held by another station
+
+        Both may be SeatMaps or seat ids. Only seats whose state changed are
+        recoloured; neither sold nor held seats can be selected.
+        """
+        occupied = set(occupied_seats) if isinstance(occupied_seats, (list, tuple)) else occupied_seats
+        held = set(held_seats) if isinstance(held_seats, (list, tuple)) else held_seats
+        kept = [seat_id for seat_id in self.selected_seats
+                if seat_id not in occupied and seat_id not in held]
+        lost_selection = len(kept) != len(self.selected_seats)
+        self.selected_seats = kept
+        selected = set(kept)
+
+        for seat_id in self.items:
+            if seat_id in occupied:
+                state = "occupied"
+            elif seat_id in held:
+                state = "held"
+            elif seat_id in selected:
+                state = "selected"
+            else:
+                state = "free"
+            self.set_state(seat_id, state)
+
+        if lost_selection and self.on_select:
+            self.on_select(list(self.selected_seats))
+
+    def set_state(self, seat_id, state):
+        if self.states.get(seat_id) == state:
+            return
+        self.states[seat_id] = state
+        self.itemconfigure(self.items[seat_id][0], fill=self.COLOURS[state])
+
+    def select(self, seat_ids):
+        """Make seat_ids (free seats only) the selection"""
+        wanted = [seat_id for seat_id in seat_ids if self.states.get(seat_id) in ("free", "selected")]
+        for seat_id in self.selected_seats:
+            if seat_id not in wanted:
+                self.set_state(seat_id, "free")
+        for seat_id in wanted:
+            self.set_state(seat_id, "selected")
+        self.selected_seats = wanted
+
+    def toggle(self, seat_id):
+        """Add a free seat to the selection, or take a selected one out"""
+        if seat_id in self.selected_seats:
+            self.select([s for s in self.selected_seats if s != seat_id])
+        elif self.multiple:
+            self.select(self.selected_seats + [seat_id])
+        else:
+            self.select([seat_id])
+
+    def clear_selection(self):
+        self.select([])
+
+    def on_click(self, event):
+        item = self.find_withtag("current")
+        seat_id = self.seat_ids.get(item[0]) if item else None
+        if seat_id is None or self.states.get(seat_id) in ("occupied", "held"):
+            return
+        self.toggle(seat_id)
+        if self.on_select:
+            self.on_select(list(self.selected_seats))
@@ -1,7 +1,7 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog
 import datetime
-from tkcalendar import DateEntry
+import time
 import sys
 import os
 
@@ -10,7 +10,16 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from models.movie_model import MovieModel
 from models.screening_model import ScreeningModel
 from models.customer_model import CustomerModel
-from models.ticket_model import TicketModel
+from models.ticket_model import TicketModel, new_request_id
+from models.cinema_room_model import CinemaRoomModel
+from models.seat_hold_model import SeatHoldModel, make_holder
+from config import SEAT_HOLD_SECONDS, SEAT_MAP_REFRESH_MS
+from gui.background import get_tasks
+from models.events import event_bus, TICKET_BOOKED, TICKET_CANCELLED
+from gui.tree_binding import TreeBinding
+from gui.lazy_imports import date_entry_class
+from gui.seat_map import SeatCanvas
+from models.seat_allocator import SeatAllocator
 
 class TicketBookingFrame(tk.Frame):
     def __init__(self, parent, controller):
@@ -20,19 +29,44 @@ class TicketBookingFrame(tk.Frame):
         self.screening_model = ScreeningModel()
         self.customer_model = CustomerModel()
         self.ticket_model = TicketModel()
+        self.room_model = CinemaRoomModel()
+        self.hold_model = SeatHoldModel(make_holder(getattr(controller, 'username', None)))
         
         # Initialize variables
         self.selected_screening_id = None
         self.selected_customer_id = None
-        self.seat_buttons = {}
+        self.seat_allocator = None
+        # Screening, layout, sold seats and other stations' holds of the seat map shown
+        self.seat_screening_id = None
+        self.seat_layout = None
+        self.sold_seats = None
+        self.others_held = None
+        self.occupied_seats = None
         self.phone_numbers = []  # Will store all phone numbers for auto-completion
         
+        # Seats this station holds while the clerk is selling
+        self.held_screening_id = None
+        self.held_seats = []
+        self.held_at = 0
+        self.hold_busy = False
+        self.swept_at = 0
+        
+        # (sale, request ID) of a booking that has not succeeded yet; retrying
+        # the same sale reuses the ID so it can never be booked twice
+        self.pending_request = None
+        
         # Create UI elements
         self.create_widgets()
         
         # Load initial data
         self.refresh_data()
         
+        # Keep the seat map (sales and other stations' holds) current
+        self.after(SEAT_MAP_REFRESH_MS, self.poll_seats)
+        
+        # Follow bookings and cancellations made here or at any other station
+        event_bus.subscribe(self.on_ticket_changes, (TICKET_BOOKED, TICKET_CANCELLED))
+        
     def create_widgets(self):
         # Main container
         main_frame = tk.Frame(self)
@@ -44,7 +78,7 @@ class TicketBookingFrame(tk.Frame):
         
         # Date selection
         tk.Label(left_frame, text="Select Date:").grid(row=0, column=0, padx=5, pady=5, sticky="w")
-        self.date_picker = DateEntry(left_frame, width=12, background='darkblue',
+        self.date_picker = date_entry_class()(left_frame, width=12, background='darkblue',
                                foreground='white', borderwidth=2, date_pattern='yyyy-mm-dd')
         self.date_picker.grid(row=0, column=1, padx=5, pady=5)
         self.date_picker.set_date(datetime.date.today())
@@ -76,13 +110,25 @@ class TicketBookingFrame(tk.Frame):
         screening_scroll.grid(row=1, column=3, sticky="ns")
         self.screenings_tree.configure(yscrollcommand=screening_scroll.set)
         
+        # Rows are keyed by ScreeningID so the selection survives refreshes
+        self.screening_rows = TreeBinding(self.screenings_tree, lambda s: s["ScreeningID"], self.screening_values)
+        
         # Middle panel - Seat selection
         middle_frame = tk.LabelFrame(main_frame, text="Seat Selection")
         middle_frame.grid(row=0, column=1, padx=10, pady=5, sticky="nsew")
         
-        # Seats layout will be created dynamically
-        self.seats_frame = tk.Frame(middle_frame)
-        self.seats_frame.pack(padx=10, pady=10, fill="both", expand=True)
+        # Seats are drawn once per room layout and then only recoloured
+        # Several seats can be picked for a group booking
+        self.seat_map = SeatCanvas(middle_frame, on_select=self.select_seat, multiple=True)
+        self.seat_map.pack(padx=10, pady=10)
+        
+        # Best available block of adjacent seats for a group
+        best_frame = tk.Frame(middle_frame)
+        best_frame.pack(pady=5)
+        tk.Label(best_frame, text="Group size:").pack(side="left", padx=5)
+        self.group_size_var = tk.IntVar(value=2)
+        tk.Spinbox(best_frame, from_=1, to=30, width=4, textvariable=self.group_size_var).pack(side="left")
+        tk.Button(best_frame, text="Best Seats", command=self.pick_best_seats).pack(side="left", padx=5)
         
         # Right panel - Customer and ticket info
         right_frame = tk.LabelFrame(main_frame, text="Customer Information")
@@ -107,13 +153,14 @@ class TicketBookingFrame(tk.Frame):
         self.name_entry.grid(row=1, column=1, columnspan=2, padx=5, pady=5, sticky="w")
         
         # Selected seat label
-        tk.Label(right_frame, text="Selected Seat:").grid(row=2, column=0, padx=5, pady=5, sticky="w")
+        tk.Label(right_frame, text="Selected Seats:").grid(row=2, column=0, padx=5, pady=5, sticky="w")
         self.selected_seat_var = tk.StringVar()
-        self.selected_seat_label = tk.Label(right_frame, textvariable=self.selected_seat_var, font=("Helvetica", 12, "bold"))
+        self.selected_seat_label = tk.Label(right_frame, textvariable=self.selected_seat_var, font=("Helvetica", 12, "bold"),
+                                            wraplength=200, justify="left")
         self.selected_seat_label.grid(row=2, column=1, columnspan=2, padx=5, pady=5, sticky="w")
         
         # Book button
-        self.book_button = tk.Button(right_frame, text="Book Ticket", command=self.book_ticket, state="disabled")
+        self.book_button = tk.Button(right_frame, text="Book Tickets", command=self.book_ticket, state="disabled")
         self.book_button.grid(row=3, column=0, columnspan=3, padx=5, pady=15)
         
         # Add a prominent manual refresh button
@@ -152,8 +199,10 @@ class TicketBookingFrame(tk.Frame):
         
     def load_phone_numbers(self):
         """Load all customer phone numbers for autocomplete functionality"""
-        customers = self.customer_model.get_all_customers()
+        get_tasks(self).submit("booking.phones", self.customer_model.get_all_customers,
+                               self.set_phone_numbers)
         
+    def set_phone_numbers(self, customers):
         if customers and len(customers) > 0:
             # Use PhoneNumber key which is what's defined in the CustomerModel SQL query
             self.phone_numbers = [customer["PhoneNumber"] for customer in customers]
@@ -182,7 +231,10 @@ class TicketBookingFrame(tk.Frame):
     
     def auto_fill_customer(self, phone_number):
         # Get customer by phone and fill details
-        customer = self.customer_model.get_customer_by_phone(phone_number)
+        get_tasks(self).submit("booking.customer", lambda: self.customer_model.get_customer_by_phone(phone_number),
+                               self.fill_customer)
+        
+    def fill_customer(self, customer):
         if customer:
             self.name_var.set(customer["CustomerName"])
             self.selected_customer_id = customer["CustomerID"]
@@ -193,27 +245,26 @@ class TicketBookingFrame(tk.Frame):
     
     def load_screenings(self):
         """Load all screenings for the selected date with fresh availability data"""
-        # Clear existing screenings
-        for i in self.screenings_tree.get_children():
-            self.screenings_tree.delete(i)
-        
         # Get selected date
         selected_date = self.date_picker.get_date()
         
-        # Force fresh data from database
-        screenings = self.screening_model.get_screenings_by_date(selected_date, force_fresh=True)
-        
-        for screening in screenings:
-            # Get FRESH seat availability data directly
-            availability = self.screening_model.get_seat_availability(screening["ScreeningID"], force_fresh=True)
-            
-            self.screenings_tree.insert("", "end", values=(
-                screening["ScreeningID"],
-                screening["MovieTitle"],
-                screening["RoomName"],
-                screening["ScreeningTime"],
-                f"{availability['AvailableSeats']} / {availability['Capacity']}" if availability else "N/A"
-            ))
+        # One set-based query returns every screening with its availability
+        get_tasks(self).submit("booking.screenings",
+                               lambda: self.screening_model.get_screenings_with_availability(selected_date),
+                               self.show_screenings)
+        
+    def show_screenings(self, screenings):
+        # Apply only the inserts, updates and deletes
+        self.screening_rows.sync(screenings or [])
+        
+    def screening_values(self, screening):
+        return (
+            screening["ScreeningID"],
+            screening["MovieTitle"],
+            screening["RoomName"],
+            screening["ScreeningTime"],
+            f"{screening['AvailableSeats']} / {screening['Capacity']}"
+        )
     
     def on_screening_select(self, event):
         selected_items = self.screenings_tree.selection()
@@ -224,72 +275,217 @@ class TicketBookingFrame(tk.Frame):
         screening_id = self.screenings_tree.item(selected_items[0])["values"][0]
         self.selected_screening_id = screening_id
         
-        # Clear selected seat
+        # Clear selected seat (and release the holds on the previous screening)
         self.selected_seat_var.set("")
         self.book_button["state"] = "disabled"
+        self.seat_map.clear_selection()
+        self.update_holds()
         
         # Get seat availability and create seat layout
         self.create_seat_layout(screening_id)
     
     def create_seat_layout(self, screening_id):
-        # Clear previous seat layout
-        for widget in self.seats_frame.winfo_children():
-            widget.destroy()
-        
-        self.seat_buttons = {}
+        # Seat data is read on a worker thread; a newer selection supersedes this one
+        get_tasks(self).submit("booking.seats", lambda: self.fetch_seats(screening_id),
+                               lambda seats: self.show_seat_layout(seats, screening_id))
         
-        # Get seat availability for the screening
+    def fetch_seats(self, screening_id):
+        """Load the room layout and occupied seats for a screening (runs off the Tk thread)"""
         availability = self.screening_model.get_seat_availability(screening_id)
         if not availability:
+            return None
+        # Layouts are cached per room, so this is a query only the first time
+        layout = self.room_model.get_room_layout(availability["RoomID"])
+        if layout is None:
+            return None
+        occupied = self.ticket_model.get_occupied_seat_map(screening_id, layout)
+        held = self.hold_model.get_held_seat_map(screening_id, layout)
+        return (layout,
+                occupied if occupied is not None else layout.seat_map(),
+                held if held is not None else layout.seat_map())
+        
+    def show_seat_layout(self, seats, screening_id=None):
+        if seats is None:
+            self.seat_map.clear()
+            self.seat_allocator = None
+            self.seat_screening_id = self.seat_layout = self.sold_seats = self.others_held = None
+            self.occupied_seats = None
             return
         
-        # Get already occupied seats
-        occupied_seats = self.ticket_model.get_occupied_seats(screening_id)
+        # The seats are only redrawn when the geometry changes; occupied and
+        # held seats are SeatMaps so every membership check is a bit test
+        layout, self.sold_seats, self.others_held = seats
+        self.seat_screening_id = screening_id
+        self.seat_layout = layout
+        self.seat_map.set_layout(layout.rows, layout.seats_per_row, layout.aisles, layout.last_row_seats)
         
-        # Create room layout with rows (letters) and columns (numbers)
-        rows = ["A", "B", "C", "D", "E", "F", "G", "H"]
-        columns = 10  # Assuming 10 seats per row
-        
-        # Screen label
-        screen_label = tk.Label(self.seats_frame, text="SCREEN", bg="lightgray", width=30)
-        screen_label.grid(row=0, column=0, columnspan=columns+1, padx=5, pady=10)
+        if self.seat_allocator is None or self.seat_allocator.layout is not layout:
+            self.seat_allocator = SeatAllocator(layout)
+        self.show_seat_states()
+    
+    def show_seat_states(self):
+        """Colour sold and held seats from sold_seats and others_held"""
+        self.seat_map.set_occupied(self.sold_seats, self.others_held)
+        # Seats held elsewhere are not available to the best-seat finder either
+        self.occupied_seats = self.sold_seats | self.others_held
+    
+    def pick_best_seats(self):
+        """Select the best block of adjacent free seats for the group size"""
+        if self.seat_allocator is None:
+            messagebox.showerror("Error", "Please select a screening")
+            return
+        try:
+            count = int(self.group_size_var.get())
+        except (tk.TclError, ValueError):
+            messagebox.showerror("Error", "Group size must be a number")
+            return
         
-        # Create seat grid
-        for r, row in enumerate(rows):
-            # Row label
-            tk.Label(self.seats_frame, text=row).grid(row=r+1, column=0, padx=2)
-            
-            for col in range(1, columns+1):
-                seat_id = f"{row}{col}"
-                
-                # Check if seat is occupied
-                is_occupied = seat_id in occupied_seats
-                
-                # Create seat button
-                btn = tk.Button(self.seats_frame, text=seat_id, width=3, height=1,
-                               bg="red" if is_occupied else "green",
-                               state="disabled" if is_occupied else "normal")
-                
-                if not is_occupied:
-                    btn.config(command=lambda s=seat_id, b=btn: self.select_seat(s, b))
-                
-                btn.grid(row=r+1, column=col, padx=2, pady=2)
-                self.seat_buttons[seat_id] = btn
+        block = self.seat_allocator.best_block(self.occupied_seats, count)
+        if not block:
+            messagebox.showinfo("No Seats", f"There are no {count} adjacent free seats for this screening.")
+            return
+        self.seat_map.select(block)
+        self.select_seat(block)
     
-    def select_seat(self, seat_id, button):
-        # Reset all unoccupied seats to green
-        for s, btn in self.seat_buttons.items():
-            if btn["state"] != "disabled":
-                btn.config(bg="green")
+    def select_seat(self, seats):
+        """Show the seats picked on the seat map (some may have been booked elsewhere)"""
+        self.show_selected_seats(seats)
+        
+        # Hold the picked seats so other stations see them as taken
+        self.update_holds()
         
-        # Highlight the selected seat
-        button.config(bg="blue")
-        self.selected_seat_var.set(seat_id)
+    def show_selected_seats(self, seats):
+        self.selected_seat_var.set(", ".join(seats))
+        if not seats:
+            self.book_button["state"] = "disabled"
+            return
         
         # Enable book button if customer is selected
         if self.selected_customer_id:
             self.book_button["state"] = "normal"
     
+    def update_holds(self, renew=False):
+        """Bring this station's seat holds in line with the seat selection
+        
+        Holds are taken and released on a worker thread, one request at a
+        time; changes made while one is running are applied when it ends.
+        With renew the holds still wanted are extended as well.
+        """
+        if self.hold_busy:
+            return
+        
+        screening_id = self.selected_screening_id
+        desired = list(self.seat_map.selected_seats) if screening_id else []
+        old_screening_id, held = self.held_screening_id, self.held_seats
+        if old_screening_id != screening_id:
+            removed, added = held, desired
+        else:
+            removed = [seat for seat in held if seat not in desired]
+            added = desired if renew else [seat for seat in desired if seat not in held]
+        if not removed and not added:
+            return
+        
+        def work():
+            if removed:
+                self.hold_model.release_seats(old_screening_id, removed)
+            return self.hold_model.hold_seats(screening_id, added) if added else True
+        
+        self.hold_busy = True
+        get_tasks(self).submit(
+            "booking.hold", work,
+            lambda ok: self.on_holds_updated(screening_id, desired, added, ok),
+            lambda error: self.on_holds_updated(screening_id, desired, added, False)
+        )
+    
+    def on_holds_updated(self, screening_id, desired, added, ok):
+        self.hold_busy = False
+        self.held_screening_id = screening_id
+        if ok:
+            self.held_seats = desired
+            self.held_at = time.monotonic()
+        else:
+            # Someone else sold or is holding one of the new seats
+            lost = set(added) - set(self.held_seats)
+            self.held_seats = [seat for seat in desired if seat not in added or seat in self.held_seats]
+            if screening_id == self.selected_screening_id and lost:
+                keep = [seat for seat in self.seat_map.selected_seats if seat not in lost]
+                self.seat_map.select(keep)
+                self.show_selected_seats(keep)
+                messagebox.showwarning("Seat Unavailable",
+                                       f"{', '.join(sorted(lost))} was just sold or is held by another station.")
+                self.load_seats()
+        
+        # Apply anything the clerk changed while this request was running
+        self.update_holds()
+    
+    def poll_seats(self):
+        """Periodically re-read holds, renew our holds and sweep expired ones
+
+        Sales and cancellations arrive through the change feed; holds are
+        not audited, so other stations' holds are still picked up here.
+        """
+        try:
+            if self.winfo_ismapped() and self.selected_screening_id:
+                self.load_holds()
+                if self.held_seats and time.monotonic() - self.held_at > SEAT_HOLD_SECONDS / 2:
+                    self.update_holds(renew=True)
+                # Expired holds are also removed by a database event; this
+                # covers servers where the event scheduler is off
+                if time.monotonic() - self.swept_at > SEAT_HOLD_SECONDS:
+                    self.swept_at = time.monotonic()
+                    get_tasks(self).submit("booking.sweep", self.hold_model.sweep_expired)
+        finally:
+            self.after(SEAT_MAP_REFRESH_MS, self.poll_seats)
+    
+    def load_holds(self):
+        """Re-read only the seats other stations hold for the screening shown"""
+        screening_id, layout = self.seat_screening_id, self.seat_layout
+        if layout is None or screening_id != self.selected_screening_id:
+            self.load_seats()
+            return
+        get_tasks(self).submit("booking.holds",
+                               lambda: self.hold_model.get_held_seat_map(screening_id, layout),
+                               lambda held: self.on_holds_loaded(screening_id, layout, held))
+    
+    def on_holds_loaded(self, screening_id, layout, held):
+        # Ignore a result for a screening (or layout) no longer shown
+        if held is None or screening_id != self.seat_screening_id or layout is not self.seat_layout:
+            return
+        if held != self.others_held:
+            self.others_held = held
+            self.show_seat_states()
+    
+    def on_ticket_changes(self, events):
+        """Update availability after sales or cancellations at any station
+        
+        The events name the seats sold or freed, so the seat map is updated
+        from them; it is only read again when an event does not say which
+        seats changed (e.g. a cancellation retried after it was applied).
+        """
+        if not self.winfo_ismapped():
+            return
+        self.load_screenings()
+        if self.sold_seats is None or self.seat_screening_id != self.selected_screening_id:
+            # No map shown yet, or the one for the selected screening is still loading
+            return
+        sold = self.sold_seats.copy()
+        for event in events:
+            screening_id = event.keys.get("screening_id")
+            if screening_id is not None and screening_id != self.seat_screening_id:
+                continue
+            seats = event.keys.get("seats")
+            if screening_id is None or not seats:
+                self.load_seats()
+                return
+            for seat in seats:
+                if event.kind == TICKET_BOOKED:
+                    sold.add(seat)
+                else:
+                    sold.discard(seat)
+        if sold != self.sold_seats:
+            self.sold_seats = sold
+            self.show_seat_states()
+    
     def find_customer(self):
         phone = self.phone_var.get().strip()
         if not phone:
@@ -297,8 +493,10 @@ class TicketBookingFrame(tk.Frame):
             return
         
         # Look up customer by phone
-        customer = self.customer_model.get_customer_by_phone(phone)
+        get_tasks(self).submit("booking.find", lambda: self.customer_model.get_customer_by_phone(phone),
+                               lambda customer: self.on_customer_found(phone, customer))
         
+    def on_customer_found(self, phone, customer):
         if customer:
             self.name_var.set(customer["CustomerName"])
             self.selected_customer_id = customer["CustomerID"]
@@ -315,21 +513,30 @@ class TicketBookingFrame(tk.Frame):
                     name = simpledialog.askstring("Customer Name", "Enter customer name:")
                 
                 if name:
-                    # Create new customer
-                    self.selected_customer_id = self.customer_model.add_customer(name, phone)
-                    messagebox.showinfo("Success", "New customer added successfully")
-                    
-                    # Refresh the phone number list
-                    self.load_phone_numbers()
-                    
-                    # Enable book button if seat is selected
-                    if self.selected_seat_var.get():
-                        self.book_button["state"] = "normal"
+                    # Create the new customer on a worker thread
+                    get_tasks(self).submit("booking.add_customer",
+                                           lambda: self.customer_model.add_customer(name, phone),
+                                           lambda customer_id: self.on_customer_added(name, customer_id))
                 else:
                     messagebox.showerror("Error", "Customer name is required")
     
+    def on_customer_added(self, name, customer_id):
+        if not customer_id:
+            messagebox.showerror("Error", "Failed to add the new customer")
+            return
+        self.name_var.set(name)
+        self.selected_customer_id = customer_id
+        messagebox.showinfo("Success", "New customer added successfully")
+        
+        # Refresh the phone number list
+        self.load_phone_numbers()
+        
+        # Enable book button if seat is selected
+        if self.selected_seat_var.get():
+            self.book_button["state"] = "normal"
+    
     def book_ticket(self):
-        """Book a ticket for the selected seat and customer"""
+        """Book the selected seats for the customer, all in one transaction"""
         if not self.selected_screening_id:
             messagebox.showerror("Error", "Please select a screening")
             return
@@ -338,48 +545,62 @@ class TicketBookingFrame(tk.Frame):
             messagebox.showerror("Error", "Please select or create a customer")
             return
             
-        seat = self.selected_seat_var.get()
-        if not seat:
+        seats = list(self.seat_map.selected_seats)
+        if not seats:
             messagebox.showerror("Error", "Please select a seat")
             return
         
         # Get IDs for booking
         customer_id = self.selected_customer_id
         screening_id = self.selected_screening_id
-        seat = self.selected_seat_var.get()
         
         # Pass the username from controller to ensure proper audit trail
-        success = self.ticket_model.book_ticket(
-            customer_id, 
-            screening_id, 
-            seat,
-            user_id=getattr(self.controller, 'user_id', None),
-            username=getattr(self.controller, 'username', None)  # Pass the username from the controller
+        user_id = getattr(self.controller, 'user_id', None)
+        username = getattr(self.controller, 'username', None)
+        
+        sale = (customer_id, screening_id, tuple(seats))
+        if self.pending_request is None or self.pending_request[0] != sale:
+            self.pending_request = (sale, new_request_id())
+        request_id = self.pending_request[1]
+        
+        def book():
+            success, results, error = self.ticket_model.book_seats(customer_id, screening_id, seats,
+                                                                   user_id=user_id, username=username,
+                                                                   holder=self.hold_model.holder,
+                                                                   request_id=request_id)
+            return success, error
+        
+        # Book on a worker thread; the button stays disabled until it finishes
+        self.book_button["state"] = "disabled"
+        get_tasks(self).submit(
+            "booking.book", book,
+            lambda result: self.on_ticket_booked(result, screening_id, seats)
         )
         
+    def on_ticket_booked(self, result, screening_id, seats):
+        success, error = result
         if success:
-            messagebox.showinfo("Success", "Ticket booked successfully!")
+            self.pending_request = None
             
-            # Force refresh of ticket history frame IMMEDIATELY
-            for frame_class, frame in self.controller.frames.items():
-                if frame.__class__.__name__ == "TicketHistoryFrame" and hasattr(frame, 'refresh_data'):
-                    print("Forcing refresh of TicketHistoryFrame after booking")
-                    frame.refresh_data()
+            if len(seats) == 1:
+                messagebox.showinfo("Success", "Ticket booked successfully!")
+            else:
+                messagebox.showinfo("Success", f"{len(seats)} tickets booked successfully!")
             
-            # Refresh the seat display
-            self.load_seats()
+            # Booking turned our holds on these seats into tickets
+            if screening_id == self.held_screening_id:
+                self.held_seats = [seat for seat in self.held_seats if seat not in seats]
             
-            # Update dashboard if available
-            if hasattr(self.controller, 'update_dashboard'):
-                self.controller.update_dashboard()
-                
-            # Force UI update
-            self.controller.update()
+            # The booking event marks the seats sold here and refreshes the
+            # other views that show tickets
             
             # Clear selection
             self.clear_form()
         else:
-            messagebox.showerror("Error", "Failed to book ticket. Seat might be already taken.")
+            # Let the clerk retry (or pick another seat) straight away
+            self.book_button["state"] = "normal"
+            messagebox.showerror("Error", "Failed to book tickets; nothing was booked.\n\n"
+                                          f"{error or 'One of the seats might be already taken.'}")
     
     def clear_form(self):
         """Clear all form selections and reset UI"""
@@ -389,10 +610,10 @@ class TicketBookingFrame(tk.Frame):
         self.selected_seat_var.set("")
         self.book_button["state"] = "disabled"
         
-        # Reset all seat buttons to green (if any exist)
-        for seat_id, button in self.seat_buttons.items():
-            if button["state"] != "disabled":
-                button.config(bg="green")
+        # Reset the selected seats to free (only those are recoloured) and
+        # release their holds
+        self.seat_map.clear_selection()
+        self.update_holds()
     
     def load_seats(self):
         """Reload seat layout for the selected screening"""
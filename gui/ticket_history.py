@@ -1,11 +1,16 @@
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
 import sys
 import os
 
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from models.ticket_model import TicketModel
+from models.ticket_model import (TicketModel, new_request_id, TICKET_SORT_KEYS, TICKET_DEFAULT_SORT,
+                                 AUDIT_SORT_KEYS)
+from models.row_source import RowSource
+from gui.virtual_tree import VirtualTreeview
+from gui.background import get_tasks
+from models.events import event_bus, TICKET_BOOKED, TICKET_CANCELLED
 
 class TicketHistoryFrame(tk.Frame):
     def __init__(self, parent, controller):
@@ -13,12 +18,18 @@ class TicketHistoryFrame(tk.Frame):
         self.controller = controller
         self.ticket_model = TicketModel()
         
+        # (ticket ID, request ID) of a cancellation that has not succeeded yet
+        self.pending_cancel = None
+        
         # Create UI elements
         self.create_widgets()
         
         # Load initial data
         self.refresh_data()
         
+        # Follow bookings and cancellations made here or at any other station
+        event_bus.subscribe(self.on_ticket_changes, (TICKET_BOOKED, TICKET_CANCELLED))
+        
     def create_widgets(self):
         # Title
         title_label = tk.Label(self, text="Ticket History", font=("Helvetica", 16))
@@ -43,29 +54,18 @@ class TicketHistoryFrame(tk.Frame):
         apply_button = ttk.Button(filter_frame, text="Apply Filters", command=self.refresh_data)
         apply_button.grid(row=0, column=2, padx=5, pady=5)
         
-        # Tickets List
-        self.ticket_tree = ttk.Treeview(self, columns=("ID", "Movie", "Date", "Time", "Seat", "Status"), 
-                                      show="headings", height=15)
-        self.ticket_tree.heading("ID", text="Ticket ID")
-        self.ticket_tree.heading("Movie", text="Movie")
-        self.ticket_tree.heading("Date", text="Date")
-        self.ticket_tree.heading("Time", text="Time")
-        self.ticket_tree.heading("Seat", text="Seat")
-        self.ticket_tree.heading("Status", text="Status")
-        
-        self.ticket_tree.column("ID", width=70, anchor="center")
-        self.ticket_tree.column("Movie", width=200)
-        self.ticket_tree.column("Date", width=100, anchor="center")
-        self.ticket_tree.column("Time", width=100, anchor="center")
-        self.ticket_tree.column("Seat", width=70, anchor="center")
-        self.ticket_tree.column("Status", width=100, anchor="center")
-        
-        self.ticket_tree.grid(row=2, column=0, padx=10, pady=10, sticky="nsew")
-        
-        # Add scrollbar to treeview
-        scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.ticket_tree.yview)
-        scrollbar.grid(row=2, column=1, sticky="ns")
-        self.ticket_tree.configure(yscrollcommand=scrollbar.set)
+        # Tickets List: only the visible rows exist in the tree, the rest
+        # are read from the database as the list is scrolled
+        self.ticket_status = "All"
+        self.ticket_list = VirtualTreeview(
+            self, self.ticket_source(self.ticket_status),
+            [("ID", "Ticket ID", 70, "center"), ("Movie", "Movie", 200, "w"),
+             ("Date", "Date", 100, "center"), ("Time", "Time", 100, "center"),
+             ("Seat", "Seat", 70, "center"), ("Status", "Status", 100, "center")],
+            lambda ticket: ticket["TicketID"], self.ticket_values,
+            sortable={"ID": "TicketID", "Movie": "MovieTitle", "Date": "ScreeningDate",
+                      "Time": "ScreeningTime", "Seat": "SeatNumber"})
+        self.ticket_list.grid(row=2, column=0, columnspan=2, padx=10, pady=10, sticky="nsew")
         
         # Actions Frame
         actions_frame = ttk.LabelFrame(self, text="Actions")
@@ -79,97 +79,96 @@ class TicketHistoryFrame(tk.Frame):
                                         command=self.refresh_data)
         self.refresh_button.pack(side="left", padx=5, pady=5)
         
+        self.export_button = ttk.Button(actions_frame, text="Export CSV", 
+                                       command=self.export_tickets)
+        self.export_button.pack(side="left", padx=5, pady=5)
+        
         # Audit Log Frame
         log_frame = ttk.LabelFrame(self, text="Ticket Audit Log")
         log_frame.grid(row=4, column=0, columnspan=2, padx=10, pady=5, sticky="nsew")
         
-        self.log_tree = ttk.Treeview(log_frame, columns=("ID", "Operation", "Screening", "Seat", "User", "Timestamp"), 
-                                    show="headings", height=5)
-        self.log_tree.heading("ID", text="ID")
-        self.log_tree.heading("Operation", text="Operation")
-        self.log_tree.heading("Screening", text="Screening ID")
-        self.log_tree.heading("Seat", text="Seat")
-        self.log_tree.heading("User", text="User")
-        self.log_tree.heading("Timestamp", text="Timestamp")
-        
-        self.log_tree.column("ID", width=50, anchor="center")
-        self.log_tree.column("Operation", width=100)
-        self.log_tree.column("Screening", width=100, anchor="center")
-        self.log_tree.column("Seat", width=70, anchor="center")
-        self.log_tree.column("User", width=150)
-        self.log_tree.column("Timestamp", width=150, anchor="center")
-        
-        self.log_tree.pack(fill="both", expand=True, padx=5, pady=5)
-        
-        log_scrollbar = ttk.Scrollbar(log_frame, orient="vertical", command=self.log_tree.yview)
-        log_scrollbar.pack(side="right", fill="y")
-        self.log_tree.configure(yscrollcommand=log_scrollbar.set)
+        self.log_list = VirtualTreeview(
+            log_frame, self.audit_source(),
+            [("ID", "ID", 50, "center"), ("Operation", "Operation", 100, "w"),
+             ("Screening", "Screening ID", 100, "center"), ("Seat", "Seat", 70, "center"),
+             ("User", "User", 150, "w"), ("Timestamp", "Timestamp", 150, "center")],
+            lambda log: log["AuditID"], self.audit_values,
+            sortable={"ID": "AuditID"}, height=5)
+        self.log_list.pack(fill="both", expand=True, padx=5, pady=5)
         
         # Configure grid weights
         self.grid_rowconfigure(2, weight=1)
         self.grid_rowconfigure(4, weight=1)
         self.grid_columnconfigure(0, weight=1)
         
-        # Bind treeview selection
-        self.ticket_tree.bind("<<TreeviewSelect>>", self.on_ticket_select)
+        # Bind ticket selection
+        self.ticket_list.bind("<<SelectionChanged>>", self.on_ticket_select)
         
     def refresh_data(self):
         """Refresh all data in the ticket history view"""
-        # Clear existing data
-        for i in self.ticket_tree.get_children():
-            self.ticket_tree.delete(i)
-        
-        # Get status filter
-        status_filter = self.status_var.get()
-        
-        # Fetch tickets
-        tickets = self.ticket_model.get_user_tickets(status_filter)
-        
-        # Populate treeview
-        if tickets:
-            for ticket in tickets:
-                ticket_id = ticket["TicketID"]
-                movie_title = ticket["MovieTitle"]
-                date = ticket["ScreeningDate"]
-                time = ticket["ScreeningTime"]
-                seat = ticket["SeatNumber"]
-                status = ticket["Status"]  # This now comes directly from the query
-                
-                self.ticket_tree.insert("", "end", values=(
-                    ticket_id, movie_title, date, time, seat, status
-                ))
+        status = self.status_var.get()
+        if status != self.ticket_status:
+            self.ticket_status = status
+            self.ticket_list.set_source(self.ticket_source(status))
+        else:
+            # Re-read the rows in view; only changed rows are touched in the tree
+            self.ticket_list.refresh()
         
         # Load audit log data
         self.refresh_audit_log()
+        self.stale = False
         
     def refresh_audit_log(self):
         """Refresh the audit log data"""
-        # Clear existing log data
-        for i in self.log_tree.get_children():
-            self.log_tree.delete(i)
-        
-        # Fetch audit log entries
-        logs = self.ticket_model.get_booking_audit()
+        self.log_list.refresh()
         
-        # Populate log treeview
-        if logs:
-            for log in logs:
-                self.log_tree.insert("", "end", values=(
-                    log["AuditID"],
-                    log["OperationType"],
-                    log["AffectedScreeningID"],
-                    log["AffectedSeat"],
-                    log["UserID"],  # Should show the username properly now
-                    log["Timestamp"]
-                ))
+    def on_ticket_changes(self, events):
+        # Re-read only the rows on screen; while hidden, reload when next shown
+        if self.winfo_ismapped():
+            self.ticket_list.refresh()
+            self.log_list.refresh()
+        else:
+            self.stale = True
+    
+    def ticket_source(self, status):
+        """Row source for one status filter (read here, rows load off the Tk thread)"""
+        return RowSource(
+            lambda limit, after=None, offset=0, sort=None: self.ticket_model.get_user_tickets(
+                status, limit=limit, after=after, offset=offset, sort=sort),
+            lambda: self.ticket_model.count_user_tickets(status),
+            TICKET_SORT_KEYS, TICKET_DEFAULT_SORT)
+        
+    def audit_source(self):
+        return RowSource(self.ticket_model.get_booking_audit, self.ticket_model.count_booking_audit,
+                         AUDIT_SORT_KEYS, ("AuditID", True))
+        
+    def ticket_values(self, ticket):
+        return (
+            ticket["TicketID"],
+            ticket["MovieTitle"],
+            ticket["ScreeningDate"],
+            ticket["ScreeningTime"],
+            ticket["SeatNumber"],
+            ticket.get("Status", "Active")
+        )
+        
+    def audit_values(self, log):
+        return (
+            log["AuditID"],
+            log["OperationType"],
+            log["AffectedScreeningID"],
+            log["AffectedSeat"],
+            log["UserID"],
+            log["Timestamp"]
+        )
         
     def on_ticket_select(self, event):
-        selected_items = self.ticket_tree.selection()
-        if not selected_items:
+        selected_rows = self.ticket_list.selected_rows()
+        if not selected_rows:
             return
         
         # Get the selected ticket status
-        status = self.ticket_tree.item(selected_items[0])["values"][5]
+        status = selected_rows[0].get("Status", "Active")
         
         # Disable cancel button if ticket is already cancelled
         if status == "Cancelled":
@@ -178,13 +177,13 @@ class TicketHistoryFrame(tk.Frame):
             self.cancel_button["state"] = "normal"
     
     def cancel_ticket(self):
-        selected_items = self.ticket_tree.selection()
-        if not selected_items:
+        selected_rows = self.ticket_list.selected_rows()
+        if not selected_rows:
             messagebox.showinfo("Select Ticket", "Please select a ticket to cancel.")
             return
             
-        ticket_id = self.ticket_tree.item(selected_items[0])["values"][0]
-        status = self.ticket_tree.item(selected_items[0])["values"][5]
+        ticket_id = selected_rows[0]["TicketID"]
+        status = selected_rows[0].get("Status", "Active")
         
         # Check if ticket is already cancelled
         if status == "Cancelled":
@@ -193,71 +192,55 @@ class TicketHistoryFrame(tk.Frame):
         
         # Confirm cancellation
         if messagebox.askyesno("Confirm Cancellation", "Are you sure you want to cancel this ticket?"):
-            # Pass user info to the cancel_ticket method
-            success = self.ticket_model.cancel_ticket(
-                ticket_id, 
-                user_id=getattr(self.controller, 'user_id', None),
-                username=getattr(self.controller, 'username', None)
-            )
-            if success:
-                messagebox.showinfo("Success", "Ticket cancelled successfully.")
-                
-                # DIRECT APPROACH: Force complete refresh of EVERYTHING
-                if hasattr(self.controller, 'force_refresh_all'):
-                    print("Forcing complete refresh after cancellation")
-                    self.controller.force_refresh_all()
-                else:
-                    # Fallback to manually refreshing current view
-                    self.refresh_data()
-            else:
-                messagebox.showerror("Error", "Failed to cancel ticket.")
+            user_id = getattr(self.controller, 'user_id', None)
+            username = getattr(self.controller, 'username', None)
+            
+            # Retrying the same cancellation reuses its request ID
+            if self.pending_cancel is None or self.pending_cancel[0] != ticket_id:
+                self.pending_cancel = (ticket_id, new_request_id())
+            request_id = self.pending_cancel[1]
+            
+            def cancel():
+                success, results, error = self.ticket_model.cancel_ticket(ticket_id, user_id=user_id,
+                                                                          username=username,
+                                                                          request_id=request_id)
+                return success, error
+            
+            # Cancel on a worker thread so the window stays responsive
+            self.cancel_button["state"] = "disabled"
+            get_tasks(self).submit("tickets.cancel", cancel, self.on_ticket_cancelled)
     
-    def force_refresh(self):
-        """Force refresh all data directly from database"""
-        print("Manual refresh triggered in TicketHistory")
-        
-        # Clear any existing data first
-        for i in self.ticket_tree.get_children():
-            self.ticket_tree.delete(i)
-        
-        for i in self.log_tree.get_children():
-            self.log_tree.delete(i)
-        
-        # Force fetch fresh data
-        status_filter = self.status_var.get()
-        tickets = self.ticket_model.get_user_tickets(status_filter)
-        logs = self.ticket_model.get_booking_audit()
-        
-        print(f"Retrieved {len(tickets)} tickets and {len(logs)} audit entries")
+    def on_ticket_cancelled(self, result):
+        success, error = result
+        self.cancel_button["state"] = "normal"
+        if success:
+            self.pending_cancel = None
+            # The cancellation event has already refreshed the views that show it
+            messagebox.showinfo("Success", "Ticket cancelled successfully.")
+        else:
+            messagebox.showerror("Error", f"Failed to cancel ticket.\n\n{error or ''}".strip())
+    
+    def export_tickets(self):
+        """Export the full ticket history for the current status filter"""
+        path = filedialog.asksaveasfilename(defaultextension=".csv", 
+                                            filetypes=[("CSV files", "*.csv")],
+                                            initialfile="ticket_history.csv")
+        if not path:
+            return
         
-        # Populate the trees
-        self.populate_ticket_tree(tickets)
-        self.populate_audit_tree(logs)
+        status = self.status_var.get()
+        self.export_button["state"] = "disabled"
+        get_tasks(self).submit("tickets.export", lambda: self.ticket_model.export_tickets_csv(path, status),
+                               lambda count: self.on_tickets_exported(path, count))
     
-    def populate_ticket_tree(self, tickets):
-        """Helper to populate the ticket tree with data"""
-        if tickets:
-            for ticket in tickets:
-                ticket_id = ticket["TicketID"]
-                movie_title = ticket["MovieTitle"]
-                date = ticket["ScreeningDate"]
-                time = ticket["ScreeningTime"]
-                seat = ticket["SeatNumber"]
-                status = ticket.get("Status", "Active")
-                
-                self.ticket_tree.insert("", "end", values=(
-                    ticket_id, movie_title, date, time, seat, status
-                ))
+    def on_tickets_exported(self, path, count):
+        self.export_button["state"] = "normal"
+        if count is None:
+            messagebox.showerror("Error", "Failed to export tickets.")
+        else:
+            messagebox.showinfo("Export Complete", f"Exported {count} tickets to {path}")
     
-    def populate_audit_tree(self, logs):
-        """Helper to populate the audit log tree with data"""
-        if logs:
-            for log in logs:
-                self.log_tree.insert("", "end", values=(
-                    log["AuditID"],
-                    log["OperationType"],
-                    log["AffectedScreeningID"],
-                    log["AffectedSeat"],
-                    log["UserID"],
-                    log["Timestamp"]
-                ))
+    def force_refresh(self):
+        """Force refresh all data directly from database"""
+        print("Manual refresh triggered in TicketHistory")
+        self.refresh_data()
@@ -0,0 +1,82 @@
+class TreeBinding:
+    """Keep a Treeview in step with a list of rows keyed by primary key
+
+    Each row is stored under its key as the item iid, so a refresh only
+    inserts new rows, updates rows whose values changed, deletes rows
+    that disappeared and moves rows that changed position. Selection,
+    focus and scroll position survive refreshes. The binding must be the
+    only thing that adds or removes items in the tree.
+    """
+
+    def __init__(self, tree, row_key, row_values):
+        self.tree = tree
+        self.row_key = row_key
+        self.row_values = row_values
+        self._values = {}  # iid -> values last written to the tree
+
+    def __len__(self):
+        return len(self._values)
+
+    def iid(self, row):
+        return str(self.row_key(row))
+
+    def sync(self, rows):
+        """Make the tree show exactly rows, in order; returns the number of items touched"""
+        desired = []
+        values = {}
+        for row in rows:
+            iid = self.iid(row)
+            if iid in values:
+                # Keep the first occurrence of a duplicate key
+                continue
+            desired.append(iid)
+            values[iid] = tuple(self.row_values(row))
+
+        # Deletes
+        gone = [iid for iid in self._values if iid not in values]
+        if gone:
+            self.tree.delete(*gone)
+            for iid in gone:
+                del self._values[iid]
+        changes = len(gone)
+
+        # Inserts and updates
+        for index, iid in enumerate(desired):
+            new = values[iid]
+            old = self._values.get(iid)
+            if old is None:
+                self.tree.insert("", index, iid=iid, values=new)
+                changes += 1
+            elif old != new:
+                self.tree.item(iid, values=new)
+                changes += 1
+            self._values[iid] = new
+
+        # Moves, only for the rows that are out of place
+        current = list(self.tree.get_children())
+        if current != desired:
+            for index, iid in enumerate(desired):
+                if current[index] != iid:
+                    self.tree.move(iid, "", index)
+                    current.remove(iid)
+                    current.insert(index, iid)
+                    changes += 1
+        return changes
+
+    def append(self, rows):
+        """Add rows after the existing ones, updating any that are already shown"""
+        for row in rows:
+            iid = self.iid(row)
+            new = tuple(self.row_values(row))
+            old = self._values.get(iid)
+            if old is None:
+                self.tree.insert("", "end", iid=iid, values=new)
+            elif old != new:
+                self.tree.item(iid, values=new)
+            self._values[iid] = new
+
+    def clear(self):
+        """Remove every row"""
+        if self._values:
+            self.tree.delete(*self._values)
+        self._values.clear()
@@ -0,0 +1,304 @@
+import tkinter as tk
+from tkinter import ttk
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from gui.background import get_tasks
+from gui.tree_binding import TreeBinding
+
+class VirtualTreeview(tk.Frame):
+    """A Treeview over a RowSource that only holds the visible rows as items
+
+    The scrollbar spans source.count() rows, but the tree itself contains
+    one item per visible line. Scrolling moves a window over the source and
+    the rows for it are read block by block on a worker thread; rows not
+    loaded yet show as placeholders. Clicking a sortable heading re-sorts
+    the whole dataset in the database. Selection is kept by row key, so it
+    survives scrolling rows out of view, sorting and refreshes.
+
+    columns is a list of (column, heading, width, anchor) tuples and
+    sortable maps a column to the source sort column it orders by. Bind
+    <<SelectionChanged>> on the widget to hear about selection changes.
+    """
+
+    PLACEHOLDER = "…"
+    # Rows scrolled per mouse wheel notch
+    WHEEL_ROWS = 3
+    # Pixels taken by the heading row when working out how many rows fit
+    HEADING_HEIGHT = 24
+
+    def __init__(self, parent, source, columns, row_key, row_values, sortable=None,
+                 height=15, selectmode="browse"):
+        super().__init__(parent)
+        self.source = source
+        self.row_key = row_key
+        self.row_values = row_values
+        self.sortable = sortable or {}
+        self.headings = {column: heading for column, heading, _, _ in columns}
+        self.rows = height
+        self.top = 0
+        self.known_count = 0   # Last count read, kept while a refresh recounts
+        self.selected = {}     # iid -> row, over the whole dataset
+        self.focus_index = None
+        self._select_index = None  # row to select once it has loaded
+        self._stale = {}       # index -> row still shown while a refresh loads
+        self.task_key = f"virtual.{id(self)}"
+
+        self.tree = ttk.Treeview(self, columns=[c[0] for c in columns], show="headings",
+                                 height=height, selectmode=selectmode)
+        for column, heading, width, anchor in columns:
+            if column in self.sortable:
+                self.tree.heading(column, text=heading, command=lambda c=column: self.sort_by(c))
+            else:
+                self.tree.heading(column, text=heading)
+            self.tree.column(column, width=width, anchor=anchor)
+        self.binding = TreeBinding(self.tree, self.iid, self.display_values)
+
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y")
+        self.tree.pack(side="left", fill="both", expand=True)
+
+        self.tree.bind("<Configure>", self.on_resize)
+        self.tree.bind("<<TreeviewSelect>>", self.on_tree_select)
+        self.tree.bind("<MouseWheel>", self.on_wheel)
+        self.tree.bind("<Button-4>", lambda e: self.scroll(-self.WHEEL_ROWS))
+        self.tree.bind("<Button-5>", lambda e: self.scroll(self.WHEEL_ROWS))
+        self.tree.bind("<Up>", lambda e: self.move_focus(-1))
+        self.tree.bind("<Down>", lambda e: self.move_focus(1))
+        self.tree.bind("<Prior>", lambda e: self.move_focus(-self.rows))
+        self.tree.bind("<Next>", lambda e: self.move_focus(self.rows))
+        self.tree.bind("<Home>", lambda e: self.move_focus(None, 0))
+        self.tree.bind("<End>", lambda e: self.move_focus(None, self.count() - 1))
+
+        self.update_headings()
+        self.render()
+
+    # Rows
+
+    def count(self):
+        count = self.source.cached_count()
+        if count is not None:
+            self.known_count = count
+        return self.known_count
+
+    def iid(self, row):
+        if "_placeholder" in row:
+            # Never collides with a key: keys are not prefixed with "~"
+            return f"~{row['_placeholder']}"
+        return str(self.row_key(row))
+
+    def display_values(self, row):
+        if "_placeholder" in row:
+            return (self.PLACEHOLDER,) + ("",) * (len(self.headings) - 1)
+        return self.row_values(row)
+
+    def row_at(self, index):
+        row = self.source.row(index)
+        if row is None:
+            row = self._stale.get(index)
+        return row
+
+    def visible_rows(self):
+        """(index, row) for each line in view, placeholders for rows not loaded"""
+        last = min(self.top + self.rows, self.count())
+        visible = []
+        for index in range(self.top, last):
+            row = self.row_at(index)
+            visible.append((index, row if row is not None else {"_placeholder": index}))
+        return visible
+
+    def render(self):
+        """Show the current window and request any rows it is missing"""
+        visible = self.visible_rows()
+        self.binding.sync([row for _, row in visible])
+
+        # Keep selected rows up to date and re-select the ones in view
+        wanted = []
+        for index, row in visible:
+            iid = self.iid(row)
+            if iid in self.selected:
+                self.selected[iid] = row
+                wanted.append(iid)
+            elif index == self._select_index and "_placeholder" not in row:
+                # A keyboard move landed on a row that was still loading
+                self._select_index = None
+                self.selected[iid] = row
+                wanted.append(iid)
+                self.event_generate("<<SelectionChanged>>")
+        if set(wanted) != set(self.tree.selection()):
+            self.tree.selection_set(wanted)
+        if self.focus_index is not None and self.top <= self.focus_index < self.top + len(visible):
+            self.tree.focus(self.iid(visible[self.focus_index - self.top][1]))
+
+        count = self.count()
+        if count:
+            self.scrollbar.set(self.top / count, min(1.0, (self.top + self.rows) / count))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+        if self.source.cached_count() is None or self.source.missing_blocks(self.top, self.top + len(visible) - 1):
+            self.request_rows()
+
+    def request_rows(self):
+        """Load the count and the blocks for the current window on a worker"""
+        source, top, rows = self.source, self.top, self.rows
+
+        def load():
+            count = source.count()
+            for block in source.missing_blocks(top, min(top + rows, count) - 1):
+                source.load_block(block)
+            return count
+
+        get_tasks(self).submit(self.task_key, load, self.on_rows_loaded, self.on_load_error)
+
+    def on_rows_loaded(self, count):
+        self._stale = {}
+        # The list may have shrunk under the current window
+        self.top = max(0, min(self.top, count - self.rows))
+        self.render()
+
+    def on_load_error(self, error):
+        print(f"Error loading rows: {error}")
+        self._stale = {}
+
+    def refresh(self):
+        """Re-read the rows and count, keeping the scroll position and selection"""
+        self._stale = {index: row for index, row in self.visible_rows() if "_placeholder" not in row}
+        self.source.invalidate()
+        self.request_rows()
+
+    def set_source(self, source):
+        """Show a different source (e.g. a new filter) in the current sort order"""
+        column, descending = self.source.sort
+        if column in source.sort_keys:
+            source.set_sort(column, descending)
+        self.source = source
+        self.top = 0
+        self.known_count = 0
+        self.focus_index = None
+        self._stale = {}
+        self.clear_selection()
+        self.update_headings()
+        self.render()
+
+    # Scrolling
+
+    def scroll_to(self, top):
+        top = max(0, min(top, self.count() - self.rows))
+        if top != self.top:
+            self.top = top
+            self.render()
+
+    def scroll(self, rows):
+        self.scroll_to(self.top + rows)
+        return "break"
+
+    def on_scrollbar(self, *args):
+        if args[0] == "moveto":
+            self.scroll_to(int(float(args[1]) * self.count()))
+        elif args[0] == "scroll":
+            step = int(args[1])
+            self.scroll(step * self.rows if args[2] == "pages" else step)
+
+    def on_wheel(self, event):
+        return self.scroll(-self.WHEEL_ROWS if event.delta > 0 else self.WHEEL_ROWS)
+
+    def on_resize(self, event):
+        style = ttk.Style(self)
+        row_height = int(style.lookup("Treeview", "rowheight") or 20)
+        rows = max(1, (event.height - self.HEADING_HEIGHT) // row_height)
+        if rows != self.rows:
+            self.rows = rows
+            self.top = max(0, min(self.top, self.count() - rows))
+            self.render()
+
+    def move_focus(self, step, index=None):
+        """Move the keyboard focus (and selection) to another row, scrolling to it"""
+        count = self.count()
+        if not count:
+            return "break"
+        if index is None:
+            current = self.focus_index if self.focus_index is not None else self.top
+            index = current + step
+        index = max(0, min(index, count - 1))
+
+        self.focus_index = index
+        if index < self.top:
+            self.top = index
+        elif index >= self.top + self.rows:
+            self.top = index - self.rows + 1
+        self.clear_selection(notify=False)
+        row = self.row_at(index)
+        if row is not None:
+            self.selected[self.iid(row)] = row
+        else:
+            self._select_index = index
+        self.render()
+        self.event_generate("<<SelectionChanged>>")
+        return "break"
+
+    # Sorting
+
+    def sort_by(self, column):
+        """Sort the whole dataset by a column, toggling direction on a second click"""
+        field = self.sortable[column]
+        current, descending = self.source.sort
+        descending = not descending if field == current else False
+        self.source.set_sort(field, descending)
+        self.top = 0
+        self.focus_index = None
+        self._stale = {}
+        self.update_headings()
+        self.render()
+
+    def update_headings(self):
+        field, descending = self.source.sort
+        for column, heading in self.headings.items():
+            if self.sortable.get(column) == field:
+                heading += " ▼" if descending else " ▲"
+            self.tree.heading(column, text=heading)
+
+    # Selection
+
+    def on_tree_select(self, event):
+        """Fold the tree's selection of the visible rows into the full selection"""
+        shown = set(self.tree.get_children())
+        chosen = [iid for iid in self.tree.selection() if not iid.startswith("~")]
+        if chosen and str(self.tree["selectmode"]) == "browse":
+            selected = {}
+        else:
+            # Rows out of view stay selected
+            selected = {iid: row for iid, row in self.selected.items() if iid not in shown}
+        for iid in chosen:
+            selected[iid] = self.binding_row(iid)
+        if selected.keys() != self.selected.keys():
+            self.selected = selected
+            self._select_index = None
+            focus = self.tree.focus()
+            if focus in shown:
+                self.focus_index = self.top + self.tree.index(focus)
+            self.event_generate("<<SelectionChanged>>")
+
+    def binding_row(self, iid):
+        for index, row in self.visible_rows():
+            if self.iid(row) == iid:
+                return row
+        return self.selected.get(iid)
+
+    def selection(self):
+        """Keys (as tree iids) of every selected row, in or out of view"""
+        return list(self.selected)
+
+    def selected_rows(self):
+        return list(self.selected.values())
+
+    def clear_selection(self, notify=True):
+        changed = bool(self.selected)
+        self.selected = {}
+        self._select_index = None
+        if self.tree.selection():
+            self.tree.selection_set([])
+        if changed and notify:
+            self.event_generate("<<SelectionChanged>>")
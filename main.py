@@ -1,16 +1,30 @@
+import time
 import tkinter as tk
-from gui.main_window import MainWindow
 from gui.login_window import LoginWindow
+from gui.lazy_imports import prewarm, import_report
+from database.db_connector import get_pool
 
 def main():
+    # Load the chart and calendar libraries while the user types their password
+    prewarm()
+    
     # Show login window first
     login_window = LoginWindow()
     authenticated, role, user_id, username = login_window.get_credentials()
     
     if authenticated:
+        # The main window (and every screen module) is only imported after login
+        started = time.perf_counter()
+        from gui.main_window import MainWindow
+        print(f"Imported main window in {(time.perf_counter() - started) * 1000:.0f} ms")
+        print("Heavy imports:\n" + "\n".join(import_report()))
+        
         # Start main application with the authenticated role and user info
         app = MainWindow(role=role, user_id=user_id, username=username)
         app.mainloop()
+        
+        # Report connection pool usage so pool_size can be tuned
+        print(f"Connection pool stats: {get_pool().stats()}")
 
 if __name__ == "__main__":
     main()
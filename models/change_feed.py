@@ -0,0 +1,55 @@
+from collections import namedtuple
+from database.db_connector import DatabaseConnector
+from models.events import TICKET_BOOKED, TICKET_CANCELLED
+
+# One committed change to ticket data, read from BookingAudit
+ChangeEvent = namedtuple("ChangeEvent", ["kind", "audit_id", "screening_id", "seat", "user", "timestamp"])
+
+# BookingAudit.OperationType -> event kind (failed bookings change nothing)
+EVENT_KINDS = {
+    "Booking": TICKET_BOOKED,
+    "Cancellation": TICKET_CANCELLED
+}
+
+class ChangeFeedModel:
+    def __init__(self):
+        self.db = DatabaseConnector()
+
+    def latest_audit_id(self):
+        """High-water mark to start following the feed from (None on error)"""
+        result = self.db.execute_query("SELECT COALESCE(MAX(AuditID), 0) AS AuditID FROM BookingAudit")
+        return int(result[0]["AuditID"]) if result else None
+
+    def read_changes(self, after, limit=500, missing=()):
+        """Changes recorded after AuditID after, plus the missing ids below it, oldest first
+
+        missing are AuditIDs skipped by earlier reads: their transactions may
+        not have committed yet. Returns (events, new high-water mark, AuditIDs
+        read). The query is a primary key range scan plus point lookups, so
+        polling it is cheap when nothing happened.
+        """
+        condition = "AuditID > %s"
+        params = [after]
+        if missing:
+            condition += " OR AuditID IN (" + ", ".join(["%s"] * len(missing)) + ")"
+            params.extend(missing)
+        query = f"""
+        SELECT AuditID, OperationType, AffectedScreeningID, AffectedSeat, UserID, Timestamp
+        FROM BookingAudit
+        WHERE {condition}
+        ORDER BY AuditID
+        LIMIT %s
+        """
+        params.append(limit)
+        rows = self.db.execute_query(query, params)
+        if rows is None:
+            raise RuntimeError("Could not read the booking audit log")
+
+        events = []
+        for row in rows:
+            kind = EVENT_KINDS.get(row["OperationType"])
+            if kind:
+                events.append(ChangeEvent(kind, row["AuditID"], row["AffectedScreeningID"],
+                                          row["AffectedSeat"], row["UserID"], row["Timestamp"]))
+        high_water = max(after, rows[-1]["AuditID"]) if rows else after
+        return events, high_water, [row["AuditID"] for row in rows]
@@ -1,6 +1,12 @@
+import threading
 from database.db_connector import DatabaseConnector
+from models.room_layout import RoomLayout, parse_aisles
 
 class CinemaRoomModel:
+    # Room layouts shared by every model instance in the process, keyed by RoomID
+    _layouts = {}
+    _layouts_lock = threading.Lock()
+    
     def __init__(self):
         self.db = DatabaseConnector()
         
@@ -22,13 +28,88 @@ class CinemaRoomModel:
         return self.db.execute_query(query, (room_name, capacity))
     
     def update_room(self, room_id, room_name, capacity):
-        query = """
-        UPDATE CinemaRooms 
-        SET RoomName = %s, Capacity = %s
-        WHERE RoomID = %s
+        """Rename a room and set its capacity, keeping the layout in step
+        
+        A stored layout with a different number of seats is removed in the
+        same transaction, so the room falls back to the default layout for
+        the new capacity (see RoomLayout.from_capacity).
         """
-        self.db.execute_query(query, (room_name, capacity, room_id))
+        try:
+            with self.db.transaction() as tx:
+                tx.execute("""
+                    UPDATE CinemaRooms 
+                    SET RoomName = %s, Capacity = %s
+                    WHERE RoomID = %s
+                """, (room_name, capacity, room_id))
+                tx.execute("DELETE FROM RoomLayouts WHERE RoomID = %s AND SeatRows * SeatsPerRow <> %s",
+                           (room_id, capacity))
+            return True
+        except Exception as e:
+            print(f"Error updating room: {e}")
+            return False
+        finally:
+            self.forget_layout(room_id)
     
     def delete_room(self, room_id):
         query = "DELETE FROM CinemaRooms WHERE RoomID = %s"
         self.db.execute_query(query, (room_id,))
+        self.forget_layout(room_id)
+    
+    def get_room_layout(self, room_id):
+        """Seat geometry of a room, read once and cached for the whole process
+        
+        Rooms without a RoomLayouts row get a default layout from Capacity.
+        Returns None if the room does not exist.
+        """
+        with self._layouts_lock:
+            layout = self._layouts.get(room_id)
+        if layout is not None:
+            return layout
+        
+        query = """
+        SELECT r.RoomID, r.Capacity, l.SeatRows, l.SeatsPerRow, l.Aisles
+        FROM CinemaRooms r
+        LEFT JOIN RoomLayouts l ON l.RoomID = r.RoomID
+        WHERE r.RoomID = %s
+        """
+        result = self.db.execute_query(query, (room_id,))
+        if not result:
+            return None
+        
+        row = result[0]
+        if row["SeatRows"]:
+            layout = RoomLayout(room_id, row["SeatRows"], row["SeatsPerRow"], parse_aisles(row["Aisles"]))
+        else:
+            layout = RoomLayout.from_capacity(room_id, row["Capacity"])
+        with self._layouts_lock:
+            self._layouts[room_id] = layout
+        return layout
+    
+    def save_room_layout(self, room_id, seat_rows, seats_per_row, aisles=()):
+        """Store a room's layout and set its capacity to match, in one transaction"""
+        aisles_text = ",".join(str(aisle) for aisle in sorted(set(aisles)))
+        try:
+            with self.db.transaction() as tx:
+                tx.execute("""
+                    INSERT INTO RoomLayouts (RoomID, SeatRows, SeatsPerRow, Aisles)
+                    VALUES (%s, %s, %s, %s)
+                    ON DUPLICATE KEY UPDATE SeatRows = VALUES(SeatRows),
+                        SeatsPerRow = VALUES(SeatsPerRow), Aisles = VALUES(Aisles)
+                """, (room_id, seat_rows, seats_per_row, aisles_text))
+                tx.execute("UPDATE CinemaRooms SET Capacity = %s WHERE RoomID = %s",
+                           (seat_rows * seats_per_row, room_id))
+            return True
+        except Exception as e:
+            print(f"Error saving room layout: {e}")
+            return False
+        finally:
+            self.forget_layout(room_id)
+    
+    @classmethod
+    def forget_layout(cls, room_id=None):
+        """Drop a cached layout (or all of them) so it is read again"""
+        with cls._layouts_lock:
+            if room_id is None:
+                cls._layouts.clear()
+            else:
+                cls._layouts.pop(room_id, None)
@@ -26,6 +26,15 @@ class CustomerModel:
         query = "INSERT INTO Customers (CustomerName, PhoneNumber) VALUES (%s, %s)"
         return self.db.execute_query(query, (name, phone_number))
     
+    def add_customers(self, customers):
+        """Add many (name, phone_number) customers in one transaction
+        
+        Returns the execute_many result with inserted_ids and per-row failures
+        (for example duplicate phone numbers).
+        """
+        query = "INSERT INTO Customers (CustomerName, PhoneNumber) VALUES (%s, %s)"
+        return self.db.execute_many(query, customers)
+    
     def update_customer(self, customer_id, name, phone_number):
         query = """
         UPDATE Customers 
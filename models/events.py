@@ -0,0 +1,94 @@
+from collections import namedtuple
+import queue
+import threading
+import time
+
+# Event kinds; keys carry the ids of what changed
+TICKET_BOOKED = "ticket_booked"        # screening_id, seats, customer_id
+TICKET_CANCELLED = "ticket_cancelled"  # screening_id, seats (and ticket_id when cancelled here)
+
+# How long a seat change announced by one source hides the same change from the other
+ECHO_SECONDS = 60
+
+# kind, a dict of entity keys, and where it came from ("local" or "feed")
+Event = namedtuple("Event", ["kind", "keys", "source"])
+
+class EventBus:
+    """Publish/subscribe for changes made inside the application
+
+    Models publish after a committed write, usually from a worker thread;
+    events are queued and delivered on the UI thread by drain(), which the
+    GUI calls whenever background results come in. Events published on the
+    main thread are delivered straight away. Each subscriber gets the events
+    of one drain as a list, filtered to the kinds it asked for.
+
+    A change made here is announced twice: by the model as it commits and
+    by the change feed when it reads the audit row. Whichever comes first
+    is delivered; the other one is dropped, seat by seat.
+    """
+
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._subscribers = []  # (callback, kinds or None for every kind)
+        self._announced = {}    # (kind, screening, seat) -> (source, time) awaiting its echo
+
+    def subscribe(self, callback, kinds=None):
+        self._subscribers.append((callback, frozenset(kinds) if kinds else None))
+
+    def unsubscribe(self, callback):
+        self._subscribers = [(c, k) for c, k in self._subscribers if c != callback]
+
+    def publish(self, kind, source="local", **keys):
+        self._queue.put(Event(kind, keys, source))
+        if threading.current_thread() is threading.main_thread():
+            self.drain()
+
+    def drain(self):
+        """Deliver queued events; call on the UI thread only"""
+        events = []
+        while True:
+            try:
+                events.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        events = self._drop_echoes(events)
+        if not events:
+            return
+        for callback, kinds in list(self._subscribers):
+            wanted = events if kinds is None else [e for e in events if e.kind in kinds]
+            if not wanted:
+                continue
+            try:
+                callback(wanted)
+            except Exception as e:
+                print(f"Error handling events: {e}")
+
+    def _drop_echoes(self, events):
+        """Remove seats already announced by the other source (runs on the UI thread)"""
+        now = time.monotonic()
+        self._announced = {key: seen for key, seen in self._announced.items()
+                           if now - seen[1] < ECHO_SECONDS}
+        delivered = []
+        for event in events:
+            screening_id = event.keys.get("screening_id")
+            seats = event.keys.get("seats")
+            if screening_id is None or not seats:
+                delivered.append(event)
+                continue
+            fresh = []
+            for seat in seats:
+                key = (event.kind, screening_id, seat)
+                seen = self._announced.get(key)
+                if seen is not None and seen[0] != event.source:
+                    # Second announcement of the same change
+                    del self._announced[key]
+                else:
+                    self._announced[key] = (event.source, now)
+                    fresh.append(seat)
+            if fresh:
+                delivered.append(event._replace(keys=dict(event.keys, seats=tuple(fresh))))
+        return delivered
+
+
+# One bus for the whole application
+event_bus = EventBus()
@@ -1,41 +1,94 @@
 from database.db_connector import DatabaseConnector
+from models.pagination import keyset_condition
 
-class FeedbackModel:
-    def __init__(self):
-        self.db = DatabaseConnector()
-        
-    def get_all_feedback(self):
-        query = """
+# Sort key used as the keyset pagination cursor (build cursors with page_cursor)
+FEEDBACK_PAGE_KEY = ("FeedbackDate", "FeedbackID")
+
+# Sortable feedback columns -> full sort key, ending in the unique FeedbackID
+FEEDBACK_SORT_KEYS = {
+    "FeedbackID": ("FeedbackID",),
+    "CustomerName": ("CustomerName", "FeedbackID"),
+    "MovieTitle": ("MovieTitle", "FeedbackID"),
+    "Rating": ("Rating", "FeedbackID"),
+    "FeedbackDate": FEEDBACK_PAGE_KEY
+}
+FEEDBACK_DEFAULT_SORT = ("FeedbackDate", True)
+FEEDBACK_COLUMNS = {
+    "FeedbackID": "f.FeedbackID",
+    "CustomerName": "c.CustomerName",
+    "MovieTitle": "m.MovieTitle",
+    "Rating": "f.Rating",
+    "FeedbackDate": "f.FeedbackDate"
+}
+
+FEEDBACK_QUERY = """
         SELECT f.FeedbackID, c.CustomerName, m.MovieTitle, 
                f.Rating, f.Comment, f.FeedbackDate
         FROM Feedback f
         JOIN Customers c ON f.CustomerID = c.CustomerID
         JOIN Movies m ON f.MovieID = m.MovieID
-        ORDER BY f.FeedbackDate DESC
         """
-        return self.db.execute_query(query)
+
+class FeedbackModel:
+    def __init__(self):
+        self.db = DatabaseConnector()
     
-    def get_feedback_by_movie(self, movie_id):
-        query = """
-        SELECT f.FeedbackID, c.CustomerName, f.Rating, 
-               f.Comment, f.FeedbackDate
-        FROM Feedback f
-        JOIN Customers c ON f.CustomerID = c.CustomerID
-        WHERE f.MovieID = %s
-        ORDER BY f.FeedbackDate DESC
+    def _get_feedback_page(self, query, params, limit, after, offset=0, sort=None):
+        """Append the sort and keyset page clauses to a feedback query
+        
+        sort is (column, descending) with column a key of FEEDBACK_SORT_KEYS,
+        newest first by default; after is a cursor on that column's sort key.
         """
-        return self.db.execute_query(query, (movie_id,))
+        column, descending = sort or FEEDBACK_DEFAULT_SORT
+        columns = [FEEDBACK_COLUMNS[key] for key in FEEDBACK_SORT_KEYS[column]]
+        direction = " DESC" if descending else ""
+        params = list(params)
+        query += " WHERE " if "WHERE" not in query else " AND "
+        if after:
+            condition, after_params = keyset_condition(columns, after, descending=descending)
+            query += condition
+            params.extend(after_params)
+        else:
+            query += "1=1"
+        query += " ORDER BY " + ", ".join(c + direction for c in columns)
+        if limit:
+            query += " LIMIT %s OFFSET %s"
+            params.extend([limit, offset])
+        return self.db.execute_query(query, params)
     
-    def get_feedback_by_customer(self, customer_id):
-        query = """
-        SELECT f.FeedbackID, m.MovieTitle, f.Rating, 
-               f.Comment, f.FeedbackDate
-        FROM Feedback f
-        JOIN Movies m ON f.MovieID = m.MovieID
-        WHERE f.CustomerID = %s
-        ORDER BY f.FeedbackDate DESC
-        """
-        return self.db.execute_query(query, (customer_id,))
+    def _filter(self, movie_id=None, customer_id=None):
+        """WHERE clause and params restricting feedback to a movie and/or customer"""
+        conditions, params = [], []
+        if movie_id is not None:
+            conditions.append("f.MovieID = %s")
+            params.append(movie_id)
+        if customer_id is not None:
+            conditions.append("f.CustomerID = %s")
+            params.append(customer_id)
+        return (" WHERE " + " AND ".join(conditions) if conditions else ""), params
+        
+    def get_all_feedback(self, limit=None, after=None, offset=0, sort=None):
+        """Get feedback newest first (or by sort); after is the cursor of the last loaded row"""
+        return self._get_feedback_page(FEEDBACK_QUERY, [], limit, after, offset, sort)
+    
+    def count_feedback(self, movie_id=None, customer_id=None):
+        """Number of feedback rows, optionally for one movie and/or customer"""
+        where, params = self._filter(movie_id, customer_id)
+        result = self.db.execute_query("SELECT COUNT(*) AS Total FROM Feedback f" + where, params)
+        return int(result[0]["Total"]) if result else 0
+    
+    def get_feedback(self, feedback_id):
+        query = FEEDBACK_QUERY + " WHERE f.FeedbackID = %s"
+        result = self.db.execute_query(query, (feedback_id,))
+        return result[0] if result else None
+    
+    def get_feedback_by_movie(self, movie_id, limit=None, after=None, offset=0, sort=None):
+        where, params = self._filter(movie_id=movie_id)
+        return self._get_feedback_page(FEEDBACK_QUERY + where, params, limit, after, offset, sort)
+    
+    def get_feedback_by_customer(self, customer_id, limit=None, after=None, offset=0, sort=None):
+        where, params = self._filter(customer_id=customer_id)
+        return self._get_feedback_page(FEEDBACK_QUERY + where, params, limit, after, offset, sort)
     
     def add_feedback(self, customer_id, movie_id, rating, comment):
         query = """
@@ -30,6 +30,17 @@ class MovieModel:
         """
         return self.db.execute_query(query, (title, genre_id, duration))
     
+    def add_movies(self, movies):
+        """Add many (title, genre_id, duration) movies in one transaction
+        
+        Returns the execute_many result with inserted_ids and per-row failures.
+        """
+        query = """
+        INSERT INTO Movies (MovieTitle, GenreID, DurationMinutes)
+        VALUES (%s, %s, %s)
+        """
+        return self.db.execute_many(query, movies)
+    
     def update_movie(self, movie_id, title, genre_id, duration):
         query = """
         UPDATE Movies 
@@ -0,0 +1,19 @@
+def keyset_condition(columns, after, descending=False):
+    """Build the WHERE fragment and params that resume a keyset page after a cursor
+    
+    columns are the SQL expressions of the sort key, after is the tuple of values
+    from the last row of the previous page. The condition is expanded into
+    nested OR/AND terms so MySQL can use an index range on the leading column.
+    """
+    op = "<" if descending else ">"
+    condition = f"{columns[-1]} {op} %s"
+    params = [after[-1]]
+    for column, value in zip(reversed(columns[:-1]), reversed(after[:-1])):
+        condition = f"{column} {op} %s OR ({column} = %s AND ({condition}))"
+        params = [value, value] + params
+    return f"({condition})", params
+
+
+def page_cursor(row, keys):
+    """Return the cursor (key tuple) for a row so the next page can start after it"""
+    return tuple(row[key] for key in keys)
@@ -1,5 +1,41 @@
+import csv
+import datetime
 from database.db_connector import DatabaseConnector
 
+# SQL expressions mapping a rollup date to the first day of its bucket
+REVENUE_BUCKETS = {
+    "day": "d.RevenueDate",
+    "week": "DATE_SUB(d.RevenueDate, INTERVAL WEEKDAY(d.RevenueDate) DAY)",
+    "month": "DATE_SUB(d.RevenueDate, INTERVAL DAYOFMONTH(d.RevenueDate) - 1 DAY)"
+}
+
+# Columns written by export_occupancy_csv
+OCCUPANCY_EXPORT_COLUMNS = ("ScreeningID", "MovieTitle", "RoomName", "ScreeningDate", "ScreeningTime", "OccupancyRate")
+
+# Revenue views offered in the UI: label -> (number of days, granularity)
+REVENUE_PERIODS = {
+    "Last 7 days": (7, "day"),
+    "Last 30 days": (30, "day"),
+    "Last 90 days": (90, "week"),
+    "Last 365 days": (365, "month")
+}
+
+def period_start(date, granularity):
+    """Return the first day of the bucket containing date"""
+    if granularity == "week":
+        return date - datetime.timedelta(days=date.weekday())
+    if granularity == "month":
+        return date.replace(day=1)
+    return date
+
+def next_period(date, granularity):
+    """Return the first day of the bucket after the one starting at date"""
+    if granularity == "week":
+        return date + datetime.timedelta(days=7)
+    if granularity == "month":
+        return (date + datetime.timedelta(days=32)).replace(day=1)
+    return date + datetime.timedelta(days=1)
+
 class ReportModel:
     def __init__(self):
         self.db = DatabaseConnector()
@@ -7,8 +43,8 @@ class ReportModel:
     def get_daily_revenue(self, date, force_refresh=False):
         """Get daily revenue for a specific date"""
         try:
-            # Force a direct query to ensure fresh data
-            query = "SELECT fn_total_revenue_by_date(%s) AS Revenue"
+            # One primary-key lookup in the daily rollup
+            query = "SELECT Revenue FROM DailyRevenue WHERE RevenueDate = %s"
             result = self.db.execute_query(query, [date])
             
             if result and len(result) > 0:
@@ -18,28 +54,97 @@ class ReportModel:
             print(f"Error getting daily revenue: {e}")
             return 0.0
             
-    def get_occupancy_rates(self):
-        query = """
+    def get_revenue_series(self, start, end, granularity="day"):
+        """Get revenue totals per day, week or month between start and end (inclusive)
+        
+        Returns one dict per bucket, oldest first, with PeriodStart and Revenue.
+        Buckets without sales are included with zero revenue.
+        """
+        if granularity not in REVENUE_BUCKETS:
+            raise ValueError(f"Unknown granularity: {granularity}")
+        
+        totals = {}
+        try:
+            # One grouped query over the daily rollup, one row per day at most
+            query = f"""
+                SELECT {REVENUE_BUCKETS[granularity]} AS PeriodStart,
+                       SUM(d.Revenue) AS Revenue
+                FROM DailyRevenue d
+                WHERE d.RevenueDate BETWEEN %s AND %s
+                GROUP BY PeriodStart
+            """
+            result = self.db.execute_query(query, [start, end])
+            for row in result or []:
+                totals[row["PeriodStart"]] = float(row["Revenue"] or 0)
+        except Exception as e:
+            print(f"Error getting revenue series: {e}")
+        
+        series = []
+        bucket = period_start(start, granularity)
+        while bucket <= end:
+            series.append({"PeriodStart": bucket, "Revenue": totals.get(bucket, 0.0)})
+            bucket = next_period(bucket, granularity)
+        return series
+    
+    OCCUPANCY_QUERY = """
         SELECT s.ScreeningID, m.MovieTitle, r.RoomName, s.ScreeningDate, s.ScreeningTime,
-              fn_occupancy_rate(s.ScreeningID) AS OccupancyRate
+              ROUND(s.SoldSeats * 100 / r.Capacity, 2) AS OccupancyRate
         FROM Screenings s
         JOIN Movies m ON s.MovieID = m.MovieID
         JOIN CinemaRooms r ON s.RoomID = r.RoomID
         ORDER BY s.ScreeningDate, s.ScreeningTime
         """
-        return self.db.execute_query(query)
+    
+    def get_occupancy_rates(self):
+        return self.db.execute_query(self.OCCUPANCY_QUERY)
+    
+    def iter_occupancy_rates(self, batch_size=500):
+        """Stream occupancy for every screening without loading it all into memory"""
+        return self.db.stream_query(self.OCCUPANCY_QUERY, batch_size=batch_size)
+    
+    def export_occupancy_csv(self, path):
+        """Write occupancy for every screening to a CSV file; returns the number of rows written"""
+        try:
+            with open(path, "w", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f)
+                writer.writerow(OCCUPANCY_EXPORT_COLUMNS)
+                count = 0
+                for row in self.iter_occupancy_rates():
+                    writer.writerow([row[column] for column in OCCUPANCY_EXPORT_COLUMNS])
+                    count += 1
+            return count
+        except Exception as e:
+            print(f"Error exporting occupancy: {e}")
+            return None
     
     def get_popular_movies(self):
+        # Sum the per-movie daily rollup instead of grouping every ticket
         query = """
-        SELECT m.MovieID, m.MovieTitle, COUNT(t.TicketID) AS TicketCount
-        FROM Movies m
-        JOIN Screenings s ON m.MovieID = s.MovieID
-        JOIN Tickets t ON s.ScreeningID = t.ScreeningID
+        SELECT m.MovieID, m.MovieTitle, CAST(SUM(d.TicketsSold) AS SIGNED) AS TicketCount
+        FROM MovieDailyTickets d
+        JOIN Movies m ON d.MovieID = m.MovieID
         GROUP BY m.MovieID, m.MovieTitle
+        HAVING TicketCount > 0
         ORDER BY TicketCount DESC
         """
         return self.db.execute_query(query)
     
+    def get_screening_revenue(self, date):
+        """Get tickets sold and revenue for each screening on a date"""
+        query = """
+            SELECT 
+                s.ScreeningID,
+                m.MovieTitle,
+                s.ScreeningTime,
+                s.SoldSeats AS TicketCount,
+                s.SoldSeats * 10.00 AS Revenue
+            FROM Screenings s
+            JOIN Movies m ON s.MovieID = m.MovieID
+            WHERE s.ScreeningDate = %s
+            ORDER BY s.ScreeningTime
+        """
+        return self.db.execute_query(query, [date]) or []
+    
     def get_screenings_by_date(self, date, force_refresh=False):
         """Get all screenings for a specific date with fresh occupancy data"""
         try:
@@ -51,7 +156,7 @@ class ReportModel:
                     r.RoomName,
                     s.ScreeningDate,
                     s.ScreeningTime,
-                    fn_occupancy_rate(s.ScreeningID) AS OccupancyRate
+                    ROUND(s.SoldSeats * 100 / r.Capacity, 2) AS OccupancyRate
                 FROM Screenings s
                 JOIN Movies m ON s.MovieID = m.MovieID
                 JOIN CinemaRooms r ON s.RoomID = r.RoomID
@@ -64,6 +169,10 @@ class ReportModel:
             print(f"Error getting screenings by date: {e}")
             return []
     
+    def rebuild_rollups(self):
+        """Rebuild the occupancy counters and reporting rollups from ticket history"""
+        return self.db.call_procedure("sp_rebuild_rollups") is not None
+    
     def clear_cache(self):
         """Clear any cached data to force fresh database reads"""
         # This is just a placeholder - implement if you have caching logic
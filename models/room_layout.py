@@ -0,0 +1,79 @@
+import math
+import sys
+import os
+
+# Add parent directory to path so we can import the seat map
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from models.seat_map import SeatMap, DEFAULT_SEATS_PER_ROW
+
+def row_label(index):
+    """Letter(s) naming a seat row: A..Z, then AA, AB, ..."""
+    label = ""
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        label = chr(ord("A") + remainder) + label
+    return label
+
+
+def parse_aisles(aisles):
+    """Seat numbers an aisle follows, from the RoomLayouts.Aisles text ("3,7")"""
+    if not aisles:
+        return ()
+    return tuple(sorted({int(part) for part in str(aisles).split(",") if part.strip()}))
+
+
+class RoomLayout:
+    """Seat geometry of a cinema room: rows of equal length, with aisles
+
+    aisles are the seat numbers after which an aisle runs (the same in every
+    row). The last row may be shorter (last_row_seats); the positions past
+    its end are not seats. Row labels, seat ids and capacity are worked out
+    once here, and every seat map for the room is built on this geometry.
+    """
+
+    def __init__(self, room_id, seat_rows, seats_per_row, aisles=(), last_row_seats=None):
+        self.room_id = room_id
+        self.seat_rows = seat_rows
+        self.seats_per_row = seats_per_row
+        self.aisles = tuple(aisles)
+        self.last_row_seats = min(last_row_seats or seats_per_row, seats_per_row)
+        self.rows = tuple(row_label(r) for r in range(seat_rows))
+        self.capacity = (seat_rows - 1) * seats_per_row + self.last_row_seats
+
+    @classmethod
+    def from_capacity(cls, room_id, capacity, seats_per_row=DEFAULT_SEATS_PER_ROW):
+        """Default layout for a room without a RoomLayouts row
+
+        Rows of seats_per_row seats, as many as the capacity needs; the last
+        one holds whatever is left, so there are exactly capacity seats.
+        """
+        capacity = max(1, capacity or 1)
+        seats_per_row = min(seats_per_row, capacity)
+        seat_rows = math.ceil(capacity / seats_per_row)
+        return cls(room_id, seat_rows, seats_per_row,
+                   last_row_seats=capacity - (seat_rows - 1) * seats_per_row)
+
+    def seats_in_row(self, index):
+        return self.last_row_seats if index == self.seat_rows - 1 else self.seats_per_row
+
+    def seat_ids(self):
+        return [f"{row}{number}" for r, row in enumerate(self.rows)
+                for number in range(1, self.seats_in_row(r) + 1)]
+
+    def seat_map(self, seats=()):
+        """A SeatMap with this room's geometry, holding seats"""
+        return SeatMap.from_seats(seats, self.rows, self.seats_per_row, self.last_row_seats)
+
+    def seat_map_from_bytes(self, data):
+        return SeatMap.from_bytes(data, self.rows, self.seats_per_row, self.last_row_seats)
+
+    def __eq__(self, other):
+        if not isinstance(other, RoomLayout):
+            return NotImplemented
+        return (self.seat_rows, self.seats_per_row, self.aisles, self.last_row_seats) == \
+               (other.seat_rows, other.seats_per_row, other.aisles, other.last_row_seats)
+
+    def __repr__(self):
+        return (f"RoomLayout(room {self.room_id}: {self.seat_rows} x {self.seats_per_row}, "
+                f"last row {self.last_row_seats}, aisles {self.aisles})")
@@ -0,0 +1,112 @@
+from collections import OrderedDict
+import threading
+import sys
+import os
+
+# Add parent directory to path so we can import config
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import LIST_PAGE_SIZE
+from models.pagination import page_cursor
+
+class RowSource:
+    """Random access to a large sorted result set, read in cached blocks
+
+    fetch_rows(limit, after=None, offset=0, sort=(column, descending)) must
+    return rows in sort order, resuming after a cursor on sort_keys[column]
+    or skipping offset rows. count_rows() returns the total number of rows.
+    A block that follows a cached block is read with a keyset cursor; a
+    jump into the middle of the list falls back to OFFSET. Only the most
+    recently used max_blocks blocks are kept in memory.
+
+    load_block() and count() query the database and are meant to run on a
+    worker thread; row() and the other accessors only read the cache.
+    """
+
+    def __init__(self, fetch_rows, count_rows, sort_keys, sort, block_size=LIST_PAGE_SIZE, max_blocks=20):
+        self.fetch_rows = fetch_rows
+        self.count_rows = count_rows
+        self.sort_keys = sort_keys
+        self.sort = sort
+        self.block_size = block_size
+        self.max_blocks = max_blocks
+
+        self._lock = threading.Lock()
+        self._blocks = OrderedDict()  # block index -> rows, least recently used first
+        self._count = None
+        self._version = 0             # Bumped whenever cached data is thrown away
+
+    def count(self):
+        """Total number of rows, counted once per invalidation"""
+        with self._lock:
+            if self._count is not None:
+                return self._count
+            version = self._version
+        count = self.count_rows() or 0
+        with self._lock:
+            if version == self._version:
+                self._count = count
+        return count
+
+    def cached_count(self):
+        """Row count if already known, else None"""
+        with self._lock:
+            return self._count
+
+    def row(self, index):
+        """Return the row at index if its block is cached, else None"""
+        block, offset = divmod(index, self.block_size)
+        with self._lock:
+            rows = self._blocks.get(block)
+            if rows is None:
+                return None
+            self._blocks.move_to_end(block)
+        return rows[offset] if offset < len(rows) else None
+
+    def missing_blocks(self, first, last):
+        """Indexes of the blocks covering rows first..last that are not cached"""
+        if last < first:
+            return []
+        with self._lock:
+            return [block for block in range(first // self.block_size, last // self.block_size + 1)
+                    if block not in self._blocks]
+
+    def load_block(self, block):
+        """Read one block from the database into the cache"""
+        with self._lock:
+            if block in self._blocks:
+                return self._blocks[block]
+            version = self._version
+            previous = self._blocks.get(block - 1) if block > 0 else None
+            sort = self.sort
+
+        if previous:
+            # Continue from the end of the block before: an index range scan
+            after = page_cursor(previous[-1], self.sort_keys[sort[0]])
+            rows = self.fetch_rows(self.block_size, after=after, sort=sort)
+        else:
+            rows = self.fetch_rows(self.block_size, offset=block * self.block_size, sort=sort)
+        rows = rows or []
+
+        with self._lock:
+            # Drop the result if the data was invalidated or re-sorted meanwhile
+            if version == self._version:
+                self._blocks[block] = rows
+                while len(self._blocks) > self.max_blocks:
+                    self._blocks.popitem(last=False)
+        return rows
+
+    def set_sort(self, column, descending=False):
+        """Change the sort order; every cached block is discarded"""
+        if column not in self.sort_keys:
+            raise ValueError(f"Cannot sort by {column}")
+        with self._lock:
+            self.sort = (column, descending)
+            self._blocks.clear()
+            self._version += 1
+
+    def invalidate(self):
+        """Forget cached rows and the count so they are read again"""
+        with self._lock:
+            self._blocks.clear()
+            self._count = None
+            self._version += 1
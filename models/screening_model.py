@@ -1,4 +1,5 @@
 from database.db_connector import DatabaseConnector
+from config import DB_BATCH_SIZE
 
 class ScreeningModel:
     def __init__(self):
@@ -8,7 +9,7 @@ class ScreeningModel:
         query = """
         SELECT s.ScreeningID, m.MovieTitle, r.RoomName, 
                s.ScreeningDate, s.ScreeningTime,
-               fn_occupancy_rate(s.ScreeningID) AS OccupancyRate
+               ROUND(s.SoldSeats * 100 / r.Capacity, 2) AS OccupancyRate
         FROM Screenings s
         JOIN Movies m ON s.MovieID = m.MovieID
         JOIN CinemaRooms r ON s.RoomID = r.RoomID
@@ -33,6 +34,18 @@ class ScreeningModel:
         """
         return self.db.execute_query(query, (movie_id, room_id, screening_date, screening_time))
     
+    def add_screenings(self, screenings):
+        """Add many screenings in one transaction
+        
+        screenings is an iterable of (movie_id, room_id, screening_date, screening_time).
+        Returns the execute_many result with inserted_ids and per-row failures.
+        """
+        query = """
+        INSERT INTO Screenings (MovieID, RoomID, ScreeningDate, ScreeningTime)
+        VALUES (%s, %s, %s, %s)
+        """
+        return self.db.execute_many(query, screenings)
+    
     def update_screening(self, screening_id, movie_id, room_id, screening_date, screening_time):
         query = """
         UPDATE Screenings 
@@ -45,19 +58,38 @@ class ScreeningModel:
         query = "DELETE FROM Screenings WHERE ScreeningID = %s"
         self.db.execute_query(query, (screening_id,))
     
+    def delete_screenings(self, screening_ids):
+        """Delete many screenings in one transaction: all of them or none
+        
+        Ids go DB_BATCH_SIZE at a time in DELETE ... WHERE ScreeningID IN (...)
+        statements, all sent in one round trip. Returns True on success.
+        """
+        screening_ids = list(screening_ids)
+        if not screening_ids:
+            return True
+        try:
+            with self.db.transaction() as tx:
+                for start in range(0, len(screening_ids), DB_BATCH_SIZE):
+                    chunk = screening_ids[start:start + DB_BATCH_SIZE]
+                    tx.execute("DELETE FROM Screenings WHERE ScreeningID IN ("
+                               + ", ".join(["%s"] * len(chunk)) + ")", chunk)
+            return True
+        except Exception as e:
+            print(f"Error deleting screenings: {e}")
+            return False
+    
     def get_seat_availability(self, screening_id, force_fresh=False):
         """Get seat availability for a screening, with option to force fresh data"""
         try:
-            # Use a direct query instead of the view to ensure we get fresh data
+            # Sold seats come from the maintained counter, no ticket scan needed
             query = """
                 SELECT
+                    s.RoomID,
                     r.Capacity,
-                    (r.Capacity - COUNT(t.TicketID)) AS AvailableSeats
+                    (r.Capacity - s.SoldSeats) AS AvailableSeats
                 FROM Screenings s
                 JOIN CinemaRooms r ON s.RoomID = r.RoomID
-                LEFT JOIN Tickets t ON s.ScreeningID = t.ScreeningID
                 WHERE s.ScreeningID = %s
-                GROUP BY r.Capacity
             """
             
             result = self.db.execute_query(query, [screening_id])
@@ -90,3 +122,36 @@ class ScreeningModel:
         except Exception as e:
             print(f"Error getting screenings by date: {e}")
             return []
+    
+    def get_screenings_with_availability(self, date):
+        """Get all screenings for a date with capacity and sold seats in one query"""
+        try:
+            query = """
+                SELECT 
+                    s.ScreeningID,
+                    m.MovieTitle,
+                    r.RoomName,
+                    s.ScreeningDate,
+                    s.ScreeningTime,
+                    r.Capacity,
+                    s.SoldSeats,
+                    (r.Capacity - s.SoldSeats) AS AvailableSeats
+                FROM Screenings s
+                JOIN Movies m ON s.MovieID = m.MovieID
+                JOIN CinemaRooms r ON s.RoomID = r.RoomID
+                WHERE s.ScreeningDate = %s
+                ORDER BY s.ScreeningTime
+            """
+            
+            return self.db.execute_query(query, [date]) or []
+        except Exception as e:
+            print(f"Error getting screenings with availability: {e}")
+            return []
+    
+    def rebuild_occupancy_counters(self):
+        """Recount Screenings.SoldSeats from Tickets (after bulk loads or drift)
+
+        The revenue and per-movie rollups are derived from the same counts, so
+        sp_rebuild_rollups rebuilds them together with the counters.
+        """
+        return self.db.call_procedure("sp_rebuild_rollups") is not None
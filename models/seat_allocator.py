@@ -0,0 +1,101 @@
+class SeatAllocator:
+    """Find the best block of adjacent free seats in a room
+
+    Works on the occupancy bitset (SeatMap) of a room layout one row at a
+    time: each row is an int with a bit per seat, so checking every start
+    position for a block of N seats is N shifts and ANDs per row. Seats on
+    either side of an aisle are not adjacent.
+
+    Blocks are ranked by distance from the preferred row (a little behind
+    the middle of the room) and from the centre of the row; the lowest
+    score wins, front rows first on a tie.
+    """
+
+    # Preferred row as a fraction of the room depth, from the screen
+    PREFERRED_ROW = 0.6
+    # Cost of one row away from the preferred row, in seats off centre
+    ROW_WEIGHT = 1.5
+
+    def __init__(self, layout):
+        self.layout = layout
+        self.seats_per_row = layout.seats_per_row
+        self.row_mask = (1 << layout.seats_per_row) - 1
+        # Bit j set when seat j and seat j + 1 (0-based) are side by side
+        self.links = self.row_mask >> 1
+        for aisle in layout.aisles:
+            if 1 <= aisle < layout.seats_per_row:
+                self.links &= ~(1 << (aisle - 1))
+        self.preferred_row = (layout.seat_rows - 1) * self.PREFERRED_ROW
+        self.row_centre = (layout.seats_per_row - 1) / 2
+
+    def free_rows(self, occupied):
+        """Free-seat mask of every row, front row first"""
+        bits = int.from_bytes(occupied.bits, "little") if occupied is not None else 0
+        rows = []
+        for r in range(self.layout.seat_rows):
+            taken = (bits >> (r * self.seats_per_row)) & self.row_mask
+            rows.append(~taken & self.row_mask)
+        # A short last row has no seats past its end
+        if rows:
+            rows[-1] &= (1 << self.layout.last_row_seats) - 1
+        return rows
+
+    def block_starts(self, free, count):
+        """Mask of the seats where a block of count adjacent free seats can start"""
+        starts = free
+        for k in range(1, count):
+            starts &= (self.links >> (k - 1)) & (free >> k)
+            if not starts:
+                break
+        return starts
+
+    def best_in_rows(self, rows, count):
+        """(row, start) of the best block over the given free-row masks, or None"""
+        if count < 1 or count > self.seats_per_row:
+            return None
+        best = None
+        best_score = None
+        offset = (count - 1) / 2
+        for r, free in enumerate(rows):
+            starts = self.block_starts(free, count)
+            row_cost = abs(r - self.preferred_row) * self.ROW_WEIGHT
+            if best_score is not None and row_cost >= best_score:
+                continue
+            while starts:
+                low = starts & -starts
+                start = low.bit_length() - 1
+                score = row_cost + abs(start + offset - self.row_centre)
+                if best_score is None or score < best_score:
+                    best, best_score = (r, start), score
+                starts ^= low
+        return best
+
+    def seat_ids(self, row, start, count):
+        label = self.layout.rows[row]
+        return [f"{label}{start + n + 1}" for n in range(count)]
+
+    def best_block(self, occupied, count):
+        """Seat ids of the best block of count adjacent free seats, or None"""
+        best = self.best_in_rows(self.free_rows(occupied), count)
+        if best is None:
+            return None
+        return self.seat_ids(best[0], best[1], count)
+
+    def allocate_groups(self, occupied, sizes):
+        """Place several groups against one occupancy snapshot
+
+        Larger groups are seated first so they are not squeezed out by small
+        ones. Returns a block of seat ids per group, in the order of sizes,
+        with None for a group that could not be seated together.
+        """
+        rows = self.free_rows(occupied)
+        blocks = [None] * len(sizes)
+        for index in sorted(range(len(sizes)), key=lambda i: -sizes[i]):
+            count = sizes[index]
+            best = self.best_in_rows(rows, count)
+            if best is None:
+                continue
+            row, start = best
+            rows[row] &= ~(((1 << count) - 1) << start)
+            blocks[index] = self.seat_ids(row, start, count)
+        return blocks
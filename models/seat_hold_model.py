@@ -0,0 +1,66 @@
+import os
+import socket
+import uuid
+from database.db_connector import DatabaseConnector
+from config import SEAT_HOLD_SECONDS
+
+def make_holder(username=None):
+    """Holder token for this running application (fits SeatHolds.HeldBy)"""
+    host = socket.gethostname()[:20]
+    return f"{(username or 'system')[:20]}@{host}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class SeatHoldModel:
+    def __init__(self, holder=None):
+        self.db = DatabaseConnector()
+        self.holder = holder or make_holder()
+
+    def hold_seats(self, screening_id, seats, seconds=SEAT_HOLD_SECONDS):
+        """Hold (or extend the hold on) seats for this holder: all of them or none
+
+        Fails if any seat is sold or held by another station.
+        """
+        seats = list(dict.fromkeys(seats))
+        if not seats:
+            return True
+        try:
+            with self.db.transaction() as tx:
+                for seat_number in seats:
+                    tx.execute("CALL sp_hold_seat(%s, %s, %s, %s)",
+                               [screening_id, seat_number, self.holder, seconds])
+            return True
+        except Exception as e:
+            print(f"Error holding seats {', '.join(seats)}: {e}")
+            return False
+
+    def release_seats(self, screening_id, seats=None):
+        """Drop this holder's holds on seats (all of its holds on the screening by default)"""
+        query = "DELETE FROM SeatHolds WHERE ScreeningID = %s AND HeldBy = %s"
+        params = [screening_id, self.holder]
+        if seats is not None:
+            seats = list(seats)
+            if not seats:
+                return 0
+            query += " AND SeatNumber IN (" + ", ".join(["%s"] * len(seats)) + ")"
+            params.extend(seats)
+        return self.db.execute_query(query, params)
+
+    def get_held_seats(self, screening_id):
+        """Active holds on a screening as rows of SeatNumber, HeldBy, ExpiresAt"""
+        query = """
+        SELECT SeatNumber, HeldBy, ExpiresAt
+        FROM SeatHolds
+        WHERE ScreeningID = %s AND ExpiresAt > NOW()
+        """
+        return self.db.execute_query(query, (screening_id,))
+
+    def get_held_seat_map(self, screening_id, layout):
+        """Seats held by other stations, as a SeatMap on the room layout (None on error)"""
+        holds = self.get_held_seats(screening_id)
+        if holds is None:
+            return None
+        return layout.seat_map(h["SeatNumber"] for h in holds if h["HeldBy"] != self.holder)
+
+    def sweep_expired(self):
+        """Delete expired holds; returns the number removed"""
+        return self.db.execute_query("DELETE FROM SeatHolds WHERE ExpiresAt <= NOW()")
@@ -0,0 +1,129 @@
+import re
+
+# Layout used until rooms carry their own geometry
+DEFAULT_ROWS = ("A", "B", "C", "D", "E", "F", "G", "H")
+DEFAULT_SEATS_PER_ROW = 10
+
+SEAT_PATTERN = re.compile(r"^([A-Za-z]+)(\d+)$")
+
+class SeatMap:
+    """Set of seats in one room, stored as a bitset (one bit per seat)
+
+    Seats are addressed by id ("C7") or by (row index, seat number). The
+    bit for a seat is row index * seats_per_row + seat number - 1, so a
+    room of 400 seats takes 50 bytes. The last row may be shorter
+    (last_row_seats). Seat ids outside the geometry are ignored.
+    """
+
+    def __init__(self, rows=DEFAULT_ROWS, seats_per_row=DEFAULT_SEATS_PER_ROW, data=None,
+                 last_row_seats=None):
+        self.rows = tuple(rows)
+        self.seats_per_row = seats_per_row
+        self.last_row_seats = min(last_row_seats or seats_per_row, seats_per_row)
+        self._row_index = {row: r for r, row in enumerate(self.rows)}
+        size = (len(self.rows) * seats_per_row + 7) // 8
+        if data is None:
+            self.bits = bytearray(size)
+        elif len(data) != size:
+            raise ValueError(f"Seat map data is {len(data)} bytes, expected {size}")
+        else:
+            self.bits = bytearray(data)
+
+    @classmethod
+    def from_seats(cls, seats, rows=DEFAULT_ROWS, seats_per_row=DEFAULT_SEATS_PER_ROW,
+                   last_row_seats=None):
+        seat_map = cls(rows, seats_per_row, last_row_seats=last_row_seats)
+        for seat in seats:
+            seat_map.add(seat)
+        return seat_map
+
+    @classmethod
+    def from_bytes(cls, data, rows=DEFAULT_ROWS, seats_per_row=DEFAULT_SEATS_PER_ROW,
+                   last_row_seats=None):
+        """Rebuild a map from to_bytes() output for the same geometry"""
+        return cls(rows, seats_per_row, data, last_row_seats)
+
+    def to_bytes(self):
+        """Compact serialised form: the raw bitset"""
+        return bytes(self.bits)
+
+    @property
+    def capacity(self):
+        return (len(self.rows) - 1) * self.seats_per_row + self.last_row_seats
+
+    @property
+    def geometry(self):
+        return self.rows, self.seats_per_row, self.last_row_seats
+
+    def position(self, seat):
+        """Bit position of a seat id or (row index, seat number), or None if outside the room"""
+        if isinstance(seat, str):
+            match = SEAT_PATTERN.match(seat.strip())
+            if not match:
+                return None
+            row = self._row_index.get(match.group(1).upper())
+            number = int(match.group(2))
+        else:
+            row, number = seat
+        if row is None or not 0 <= row < len(self.rows):
+            return None
+        seats_in_row = self.last_row_seats if row == len(self.rows) - 1 else self.seats_per_row
+        if not 1 <= number <= seats_in_row:
+            return None
+        return row * self.seats_per_row + number - 1
+
+    def seat_id(self, position):
+        row, column = divmod(position, self.seats_per_row)
+        return f"{self.rows[row]}{column + 1}"
+
+    def add(self, seat):
+        position = self.position(seat)
+        if position is not None:
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def discard(self, seat):
+        position = self.position(seat)
+        if position is not None:
+            self.bits[position >> 3] &= ~(1 << (position & 7)) & 0xFF
+
+    def __contains__(self, seat):
+        position = self.position(seat)
+        return position is not None and bool(self.bits[position >> 3] & (1 << (position & 7)))
+
+    def _as_int(self):
+        return int.from_bytes(self.bits, "little")
+
+    def __len__(self):
+        return bin(self._as_int()).count("1")
+
+    def _seats_in(self, value):
+        # Walk the set bits of an int built from a bitset
+        while value:
+            low = value & -value
+            yield self.seat_id(low.bit_length() - 1)
+            value ^= low
+
+    def __iter__(self):
+        return self._seats_in(self._as_int())
+
+    def __eq__(self, other):
+        if not isinstance(other, SeatMap):
+            return NotImplemented
+        return (self.geometry, self.bits) == (other.geometry, other.bits)
+
+    def __or__(self, other):
+        """Seats in either map (same geometry)"""
+        if self.geometry != other.geometry:
+            raise ValueError("Cannot combine seat maps of different rooms")
+        return SeatMap(self.rows, self.seats_per_row, bytes(a | b for a, b in zip(self.bits, other.bits)),
+                       self.last_row_seats)
+
+    def copy(self):
+        return SeatMap(self.rows, self.seats_per_row, self.bits, self.last_row_seats)
+
+    def diff(self, newer):
+        """Seats (added, removed) going from this snapshot to a newer one"""
+        if self.geometry != newer.geometry:
+            raise ValueError("Cannot compare seat maps of different rooms")
+        old, new = self._as_int(), newer._as_int()
+        return set(self._seats_in(new & ~old)), set(self._seats_in(old & ~new))
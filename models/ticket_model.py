@@ -1,10 +1,54 @@
-from database.db_connector import DatabaseConnector
+import csv
+import time
+import uuid
+from database.db_connector import DatabaseConnector, is_transient_error, is_duplicate_key
+from config import BOOKING_RETRY_ATTEMPTS, BOOKING_RETRY_BACKOFF
+from models.seat_map import SeatMap
+from models.seat_allocator import SeatAllocator
+from models.pagination import keyset_condition
+from models.events import event_bus, TICKET_BOOKED, TICKET_CANCELLED
+
+# Sort keys used as keyset pagination cursors (build cursors with page_cursor)
+TICKET_PAGE_KEY = ("ScreeningDate", "ScreeningTime", "TicketID")
+AUDIT_PAGE_KEY = ("AuditID",)
+
+# Sortable ticket history columns -> full sort key, ending in the unique TicketID
+TICKET_SORT_KEYS = {
+    "TicketID": ("TicketID",),
+    "MovieTitle": ("MovieTitle", "TicketID"),
+    "ScreeningDate": TICKET_PAGE_KEY,
+    "ScreeningTime": ("ScreeningTime", "TicketID"),
+    "SeatNumber": ("SeatNumber", "TicketID")
+}
+TICKET_DEFAULT_SORT = ("ScreeningDate", True)
+
+# Column expressions in each ticket history branch ({} is the ticket table alias)
+TICKET_COLUMNS = {
+    "TicketID": "{}.TicketID",
+    "MovieTitle": "m.MovieTitle",
+    "ScreeningDate": "s.ScreeningDate",
+    "ScreeningTime": "s.ScreeningTime",
+    "SeatNumber": "{}.SeatNumber"
+}
+AUDIT_SORT_KEYS = {"AuditID": AUDIT_PAGE_KEY}
+
+# Columns written by export_tickets_csv
+TICKET_EXPORT_COLUMNS = ("TicketID", "MovieTitle", "ScreeningDate", "ScreeningTime", "SeatNumber", "Status")
+
+def new_request_id():
+    """Client-generated ID for one booking or cancellation (reuse it on retry)"""
+    return uuid.uuid4().hex
+
 
 class TicketModel:
     def __init__(self):
         self.db = DatabaseConnector()
         
-    def get_all_tickets(self):
+    def get_all_tickets(self, limit=None, after=None):
+        """Get active tickets oldest first, one keyset page at a time
+        
+        after is the TICKET_PAGE_KEY cursor of the last row already loaded.
+        """
         query = """
         SELECT t.TicketID, c.CustomerName, m.MovieTitle, 
                s.ScreeningDate, s.ScreeningTime, t.SeatNumber
@@ -12,9 +56,16 @@ class TicketModel:
         JOIN Customers c ON t.CustomerID = c.CustomerID
         JOIN Screenings s ON t.ScreeningID = s.ScreeningID
         JOIN Movies m ON s.MovieID = m.MovieID
-        ORDER BY s.ScreeningDate, s.ScreeningTime
         """
-        return self.db.execute_query(query)
+        params = []
+        if after:
+            condition, params = keyset_condition(["s.ScreeningDate", "s.ScreeningTime", "t.TicketID"], after)
+            query += f" WHERE {condition}"
+        query += " ORDER BY s.ScreeningDate, s.ScreeningTime, t.TicketID"
+        if limit:
+            query += " LIMIT %s"
+            params.append(limit)
+        return self.db.execute_query(query, params)
     
     def get_tickets_by_screening(self, screening_id):
         query = """
@@ -26,69 +77,110 @@ class TicketModel:
         """
         return self.db.execute_query(query, (screening_id,))
     
-    def book_ticket(self, customer_id, screening_id, seat_number, user_id=None, username=None):
-        """Book a ticket and record who performed the action"""
-        try:
-            print(f"Booking ticket with username: {username}")
-            # Always set the current user context before any operation
-            if username:
-                # Set the current_user session variable - this is what the trigger uses
-                self.db.execute_query("SET @current_user = %s", [username])
-                print(f"Set @current_user to {username}")
-            else:
-                # Default to system if no username provided
-                self.db.execute_query("SET @current_user = 'system'")
-            
-            # Execute the booking procedure
-            result = self.db.execute_query(
-                "CALL sp_book_ticket(%s, %s, %s)",
-                [customer_id, screening_id, seat_number]
-            )
-            
-            # Reset the user context
-            self.db.execute_query("SET @current_user = NULL")
-            
-            # Force commit to ensure data is written immediately
-            if hasattr(self.db, 'connection'):
-                self.db.connection.commit()
-                
-            return True
-        except Exception as e:
-            print(f"Error booking ticket: {e}")
-            return False
+    def book_ticket(self, customer_id, screening_id, seat_number, user_id=None, username=None,
+                    holder=None, request_id=None):
+        """Book a ticket and record who performed the action; see book_seats"""
+        return self.book_seats(customer_id, screening_id, [seat_number], user_id=user_id,
+                               username=username, holder=holder, request_id=request_id)
     
-    def cancel_ticket(self, ticket_id, user_id=None, username=None):
-        """Cancel a ticket by ticket ID"""
-        try:
-            # Always set the current user context first
-            if username:
-                print(f"Setting user context to: {username}")
-                self.db.execute_query("SET @current_user = %s", [username])
-            else:
-                # Default to system if no username provided
-                self.db.execute_query("SET @current_user = 'system'")
-            
-            # Call the procedure with the username
-            self.db.execute_query(
-                "CALL sp_cancel_ticket(%s, %s)", 
-                [ticket_id, username]
-            )
-            
-            # Force explicit commit
-            if hasattr(self.db, 'connection'):
-                self.db.connection.commit()
-                print(f"Ticket cancelled by {username if username else 'system'}")
-            
-            return True
-        except Exception as e:
-            print(f"Error cancelling ticket: {e}")
-            return False
-        finally:
-            # Always reset the user context
+    def book_seats(self, customer_id, screening_id, seats, user_id=None, username=None,
+                   holder=None, request_id=None):
+        """Book several seats for one customer atomically: all of them or none
+        
+        Every booking call goes out in one transaction and one round trip; if
+        any seat is taken (or the screening fills up) the whole booking is
+        rolled back. Returns (ok, results, error). With a holder (see SeatHoldModel)
+        seats held by other stations are refused and the holder's own holds
+        are turned into the tickets. Pass the same request_id when retrying
+        a booking whose outcome is unknown: it is applied at most once.
+        """
+        # Keep the order the seats were picked in, without duplicates
+        seats = list(dict.fromkeys(seats))
+        if not seats:
+            return False, [], "No seats selected"
+        
+        print(f"Booking {len(seats)} seat(s) with username: {username}")
+        if holder:
+            statements = [("CALL sp_book_held_seat(%s, %s, %s, %s)",
+                           [customer_id, screening_id, seat_number, holder]) for seat_number in seats]
+        else:
+            statements = [("CALL sp_book_ticket(%s, %s, %s)",
+                           [customer_id, screening_id, seat_number]) for seat_number in seats]
+        ok, results, error = self._run_request(request_id or new_request_id(), "Booking", username, statements)
+        if ok:
+            event_bus.publish(TICKET_BOOKED, screening_id=screening_id, seats=tuple(seats),
+                              customer_id=customer_id)
+        return ok, results, error
+    
+    def cancel_ticket(self, ticket_id, user_id=None, username=None, request_id=None):
+        """Cancel a ticket by ticket ID; returns (ok, results, error)"""
+        statements = [
+            # Which seat is freed, read in the same transaction for the event
+            ("SELECT ScreeningID, SeatNumber FROM Tickets WHERE TicketID = %s", [ticket_id]),
+            ("CALL sp_cancel_ticket(%s, %s)", [ticket_id, username])
+        ]
+        ok, results, error = self._run_request(request_id or new_request_id(), "Cancellation", username,
+                                               statements)
+        if not ok:
+            return ok, results, error
+        print(f"Ticket cancelled by {username if username else 'system'}")
+        rows = results[0] if results else []
+        if rows:
+            event_bus.publish(TICKET_CANCELLED, ticket_id=ticket_id, screening_id=rows[0]["ScreeningID"],
+                              seats=(rows[0]["SeatNumber"],))
+        else:
+            # Applied by an earlier attempt; the seat is not known here
+            event_bus.publish(TICKET_CANCELLED, ticket_id=ticket_id)
+        return ok, results, error
+    
+    def _run_request(self, request_id, operation, username, statements):
+        """Apply a booking or cancellation exactly once for its request ID
+        
+        The request ID is recorded in BookingRequests inside the same
+        transaction, with the user context and a single commit. After a
+        transient error (lost connection, deadlock) the ID is looked up: if
+        it is there the earlier attempt committed, otherwise the work is
+        retried with backoff, up to BOOKING_RETRY_ATTEMPTS times.
+        
+        Returns (ok, results, error): the rows of each statement's result
+        sets (empty when an earlier attempt applied it) and the error message.
+        """
+        error = None
+        delay = BOOKING_RETRY_BACKOFF
+        for attempt in range(1, BOOKING_RETRY_ATTEMPTS + 1):
             try:
-                self.db.execute_query("SET @current_user = NULL")
-            except:
-                pass
+                # The audit trigger reads @current_user; pooled sessions carry
+                # the logged-in user already, anyone else is set and reset in
+                # the same round trip as the work
+                with self.db.transaction({"current_user": username or "system"}) as tx:
+                    tx.execute(
+                        "INSERT INTO BookingRequests (RequestID, Operation, RequestedBy) VALUES (%s, %s, %s)",
+                        [request_id, operation, username or "system"]
+                    )
+                    for statement, params in statements:
+                        tx.execute(statement, params)
+                return True, tx.results, None
+            except Exception as e:
+                error = str(e)
+                transient = is_transient_error(e)
+                if transient or is_duplicate_key(e):
+                    # The commit may have gone through before the error reached us
+                    if self.request_recorded(request_id):
+                        print(f"{operation} request {request_id} was already applied")
+                        return True, [], None
+                if not transient or attempt == BOOKING_RETRY_ATTEMPTS:
+                    print(f"Error in {operation.lower()} request {request_id}: {e}")
+                    return False, [], error
+                print(f"Retrying {operation.lower()} request {request_id} after: {e}")
+                time.sleep(delay)
+                delay *= 2
+        return False, [], error
+    
+    def request_recorded(self, request_id):
+        """True if a booking or cancellation with this request ID was committed"""
+        result = self.db.execute_query("SELECT 1 AS Found FROM BookingRequests WHERE RequestID = %s",
+                                       (request_id,))
+        return bool(result)
     
     def get_occupied_seats(self, screening_id):
         query = """
@@ -97,67 +189,159 @@ class TicketModel:
         results = self.db.execute_query(query, (screening_id,))
         return [r['SeatNumber'] for r in results]
     
-    def get_user_tickets(self, status="All"):
+    def get_occupied_seat_map(self, screening_id, layout=None):
+        """Occupied seats of a screening as a SeatMap on the room's layout, or None on error"""
+        query = "SELECT SeatNumber FROM Tickets WHERE ScreeningID = %s"
+        results = self.db.execute_query(query, (screening_id,))
+        if results is None:
+            return None
+        seats = (r['SeatNumber'] for r in results)
+        if layout is None:
+            return SeatMap.from_seats(seats)
+        return layout.seat_map(seats)
+    
+    def allocate_group_seats(self, screening_id, layout, group_sizes):
+        """Best adjacent seats for several groups against one screening's occupancy
+        
+        Returns a list of seat id blocks in the order of group_sizes (None for a
+        group that cannot sit together), or None if occupancy could not be read.
+        Nothing is booked; pass each block to book_seats.
+        """
+        occupied = self.get_occupied_seat_map(screening_id, layout)
+        if occupied is None:
+            return None
+        return SeatAllocator(layout).allocate_groups(occupied, list(group_sizes))
+    
+    def _user_tickets_query(self, status="All", limit=None, after=None, offset=0, sort=None):
+        """Build the active/cancelled ticket history query and its params
+        
+        sort is (column, descending) with column a key of TICKET_SORT_KEYS;
+        after is a cursor on that column's sort key, offset skips rows.
+        """
+        column, descending = sort or TICKET_DEFAULT_SORT
+        keys = TICKET_SORT_KEYS[column]
+        direction = " DESC" if descending else ""
+        
+        # Query for active tickets
+        active_query = """
+            SELECT 
+                t.TicketID, 
+                m.MovieTitle, 
+                s.ScreeningDate, 
+                s.ScreeningTime, 
+                t.SeatNumber, 
+                'Active' AS Status
+            FROM Tickets t
+            JOIN Screenings s ON t.ScreeningID = s.ScreeningID
+            JOIN Movies m ON s.MovieID = m.MovieID
+        """
+        
+        # Query for cancelled tickets
+        cancelled_query = """
+            SELECT 
+                c.TicketID, 
+                m.MovieTitle, 
+                s.ScreeningDate, 
+                s.ScreeningTime, 
+                c.SeatNumber, 
+                'Cancelled' AS Status
+            FROM CancelledTickets c
+            JOIN Screenings s ON c.ScreeningID = s.ScreeningID
+            JOIN Movies m ON s.MovieID = m.MovieID
+        """
+        
+        order_by = " ORDER BY " + ", ".join(key + direction for key in keys)
+        
+        def page(branch_query, alias):
+            # Push the cursor and limit into each branch so neither side
+            # materialises more than the rows the outer query can return
+            columns = [TICKET_COLUMNS[key].format(alias) for key in keys]
+            branch_params = []
+            if after:
+                condition, branch_params = keyset_condition(columns, after, descending=descending)
+                branch_query += f" WHERE {condition}"
+            if limit:
+                branch_query += " ORDER BY " + ", ".join(c + direction for c in columns) + " LIMIT %s"
+                branch_params = branch_params + [offset + limit]
+            return branch_query, branch_params
+        
+        active_query, active_params = page(active_query, "t")
+        cancelled_query, cancelled_params = page(cancelled_query, "c")
+        
+        # Apply status filter or combine both queries
+        if status == "Active":
+            query, params = f"SELECT * FROM ({active_query}) AS h", active_params
+        elif status == "Cancelled":
+            query, params = f"SELECT * FROM ({cancelled_query}) AS h", cancelled_params
+        else:  # "All"
+            query = f"({active_query}) UNION ALL ({cancelled_query})"
+            params = active_params + cancelled_params
+        
+        query += order_by
+        if limit:
+            query += " LIMIT %s OFFSET %s"
+            params = params + [limit, offset]
+        return query, params
+    
+    def get_user_tickets(self, status="All", limit=None, after=None, offset=0, sort=None):
         """
         Get tickets filtered by status using UNION to combine active and cancelled
+        
+        Rows are ordered newest screening first unless sort is given. Pass limit
+        to fetch one page and after (the cursor of the last loaded row, see
+        TICKET_SORT_KEYS) or offset for the next one.
         """
         try:
             print(f"Fetching tickets with status: {status}")
-            # Force a database commit before querying to ensure we get fresh data
-            if hasattr(self.db, 'connection'):
-                try:
-                    self.db.connection.commit()
-                except:
-                    pass
             
-            # Query for active tickets
-            active_query = """
-                SELECT 
-                    t.TicketID, 
-                    m.MovieTitle, 
-                    s.ScreeningDate, 
-                    s.ScreeningTime, 
-                    t.SeatNumber, 
-                    'Active' AS Status
-                FROM Tickets t
-                JOIN Screenings s ON t.ScreeningID = s.ScreeningID
-                JOIN Movies m ON s.MovieID = m.MovieID
-            """
-            
-            # Query for cancelled tickets
-            cancelled_query = """
-                SELECT 
-                    c.TicketID, 
-                    m.MovieTitle, 
-                    s.ScreeningDate, 
-                    s.ScreeningTime, 
-                    c.SeatNumber, 
-                    'Cancelled' AS Status
-                FROM CancelledTickets c
-                JOIN Screenings s ON c.ScreeningID = s.ScreeningID
-                JOIN Movies m ON s.MovieID = m.MovieID
-            """
-            
-            # Apply status filter or combine both queries
-            if status == "Active":
-                query = active_query + " ORDER BY ScreeningDate DESC, ScreeningTime DESC"
-            elif status == "Cancelled":
-                query = cancelled_query + " ORDER BY ScreeningDate DESC, ScreeningTime DESC"
-            else:  # "All"
-                query = f"{active_query} UNION {cancelled_query} ORDER BY ScreeningDate DESC, ScreeningTime DESC"
-            
-            tickets = self.db.execute_query(query)
+            query, params = self._user_tickets_query(status, limit, after, offset, sort)
+            tickets = self.db.execute_query(query, params)
             print(f"Retrieved {len(tickets) if tickets else 0} tickets")
             return tickets
         except Exception as e:
             print(f"Error getting tickets: {e}")
             return []
+    
+    def count_user_tickets(self, status="All"):
+        """Number of tickets get_user_tickets would return for a status"""
+        counts = {
+            "Active": "SELECT COUNT(*) AS Total FROM Tickets",
+            "Cancelled": "SELECT COUNT(*) AS Total FROM CancelledTickets"
+        }
+        query = counts.get(status, "SELECT (SELECT COUNT(*) FROM Tickets) + "
+                                   "(SELECT COUNT(*) FROM CancelledTickets) AS Total")
+        result = self.db.execute_query(query)
+        return int(result[0]["Total"]) if result else 0
+    
+    def iter_user_tickets(self, status="All", batch_size=500):
+        """Stream the whole ticket history for a status without loading it into memory"""
+        query, params = self._user_tickets_query(status)
+        return self.db.stream_query(query, params, batch_size)
+    
+    def export_tickets_csv(self, path, status="All"):
+        """Write the ticket history to a CSV file; returns the number of rows written"""
+        try:
+            with open(path, "w", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f)
+                writer.writerow(TICKET_EXPORT_COLUMNS)
+                count = 0
+                for ticket in self.iter_user_tickets(status):
+                    writer.writerow([ticket[column] for column in TICKET_EXPORT_COLUMNS])
+                    count += 1
+            return count
+        except Exception as e:
+            print(f"Error exporting tickets: {e}")
+            return None
             
-    def get_booking_audit(self):
+    def get_booking_audit(self, limit=100, after=None, offset=0, sort=None):
         """
-        Get all booking audit entries.
+        Get booking audit entries, newest first (sort may flip it to oldest first).
+        
+        after is the AuditID (or AUDIT_PAGE_KEY cursor) of the last entry already
+        loaded; offset skips entries instead.
         """
         try:
+            _, descending = sort or ("AuditID", True)
             query = """
                 SELECT 
                     ba.AuditID, 
@@ -167,11 +351,21 @@ class TicketModel:
                     COALESCE(ba.UserID, 'system') AS UserID, 
                     ba.Timestamp
                 FROM BookingAudit ba
-                ORDER BY ba.Timestamp DESC
-                LIMIT 100
             """
+            params = []
+            if after:
+                query += " WHERE ba.AuditID < %s" if descending else " WHERE ba.AuditID > %s"
+                params.append(after[0] if isinstance(after, (tuple, list)) else after)
+            query += " ORDER BY ba.AuditID DESC" if descending else " ORDER BY ba.AuditID"
+            if limit:
+                query += " LIMIT %s OFFSET %s"
+                params.extend([limit, offset])
             
-            return self.db.execute_query(query)
+            return self.db.execute_query(query, params)
         except Exception as e:
             print(f"Error getting audit log: {e}")
             return []
+    
+    def count_booking_audit(self):
+        result = self.db.execute_query("SELECT COUNT(*) AS Total FROM BookingAudit")
+        return int(result[0]["Total"]) if result else 0